@@ -78,7 +78,7 @@ from src.providers.account_manager import (
     AllocationStrategy,
     AllocationRule,
     AccountMetrics,
-    account_manager
+    get_account_manager
 )
 
 # --- UI Imports ---
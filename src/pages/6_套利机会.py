@@ -7,13 +7,11 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import random
-import sys
-import os
 from typing import Dict, List, Tuple, Optional
 
-# 添加src目录到路径
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+# 添加src目录到路径（幂等，Streamlit重复执行页面时不会重复追加）
+from path_setup import setup_src_path
+setup_src_path()
 from components.execution_monitor import render_execution_monitor, render_risk_dashboard
 from components.network_monitor import render_network_monitor
 from components.main_console import render_main_console
@@ -61,6 +59,37 @@ QUICK_FILTERS = {
     "简单操作": {"difficulty": "简单", "liquidity": "高", "executable_only": True}
 }
 
+# 展示用字符串列，缓存前转换为 Arrow 字符串类型以加速 st.cache_data 的序列化
+DISPLAY_STRING_COLUMNS = [
+    "币种", "买入平台", "卖出平台", "买入价格", "卖出价格", "价格差",
+    "提现网络", "充值网络", "充提合一", "执行难度", "成功率", "网络延迟",
+    "预估时间", "流动性", "风险等级", "手续费等级"
+]
+
+# 安装了 pyarrow 时使用 Arrow 字符串类型，否则退回 pandas 自带的字符串类型
+try:
+    import pyarrow  # noqa: F401
+    DISPLAY_STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    DISPLAY_STRING_DTYPE = "string"
+
+# 模块级随机数生成器 (PCG64)，替代 random / np.random 全局状态
+_RNG = np.random.default_rng()
+
+# 加权抽样的标签及权重，按列一次性抽样
+DIFFICULTY_LEVELS = np.array(["🟢 简单", "🟡 中等", "🔴 困难"], dtype=object)
+DIFFICULTY_WEIGHTS = np.array([0.4, 0.4, 0.2])
+LIQUIDITY_LEVELS = np.array(["🟢 高", "🟡 中", "🔴 低"], dtype=object)
+LIQUIDITY_WEIGHTS = np.array([0.3, 0.5, 0.2])
+RISK_LEVELS = np.array(["🟢 低风险", "🟡 中风险", "🔴 高风险"], dtype=object)
+RISK_WEIGHTS = np.array([0.3, 0.5, 0.2])
+
+# 网络特征按列展开，便于按索引批量查表
+_NETWORK_NAMES = np.array(list(NETWORK_FEATURES.keys()), dtype=object)
+_NETWORK_LATENCY = np.array([f['avg_latency'] for f in NETWORK_FEATURES.values()], dtype=float)
+_NETWORK_SUCCESS = np.array([f['success_rate'] for f in NETWORK_FEATURES.values()], dtype=float)
+_NETWORK_FEE_LEVEL = np.array([f['fee_level'] for f in NETWORK_FEATURES.values()], dtype=object)
+
 
 def setup_page_config():
     """设置页面配置"""
@@ -72,86 +101,52 @@ def setup_page_config():
     )
 
 
-def generate_arbitrage_opportunity(currency: str, buy_exchange: str, sell_exchange: str) -> Dict:
-    """生成单个套利机会数据"""
-    # 基础价格和价差
-    base_price = random.uniform(0.1, 50000)
-    price_diff = random.uniform(0.1, 4.0)
-
-    # 网络选择
-    networks = list(NETWORK_FEATURES.keys())
-    withdraw_network = random.choice(networks)
-    deposit_network = random.choice(networks)
-    unified_network = withdraw_network if withdraw_network == deposit_network else "-"
-
-    # 计算专业指标
-    network_info = NETWORK_FEATURES.get(withdraw_network, NETWORK_FEATURES['ETH'])
-
-    execution_difficulty = random.choices(
-        ["🟢 简单", "🟡 中等", "🔴 困难"],
-        weights=[0.4, 0.4, 0.2]
-    )[0]
-
-    success_rate = max(70, network_info['success_rate'] + random.gauss(0, 5))
-    network_latency = max(1, network_info['avg_latency'] + random.gauss(0, 10))
-    estimated_time = network_latency + random.uniform(30, 180)
-
-    liquidity = random.choices(
-        ["🟢 高", "🟡 中", "🔴 低"],
-        weights=[0.3, 0.5, 0.2]
-    )[0]
-
-    risk_level = random.choices(
-        ["🟢 低风险", "🟡 中风险", "🔴 高风险"],
-        weights=[0.3, 0.5, 0.2]
-    )[0]
-
-    return {
-        "币种": currency,
-        "买入平台": buy_exchange,
-        "卖出平台": sell_exchange,
-        "买入价格": f"${base_price:.4f}",
-        "卖出价格": f"${base_price * (1 + price_diff/100):.4f}",
-        "价格差": f"{price_diff:.2f}%",
-        "提现网络": withdraw_network,
-        "充值网络": deposit_network,
-        "充提合一": unified_network,
-        "执行难度": execution_difficulty,
-        "成功率": f"{success_rate:.1f}%",
-        "网络延迟": f"{network_latency:.0f}秒",
-        "预估时间": f"{estimated_time:.0f}秒",
-        "流动性": liquidity,
-        "风险等级": risk_level,
-        "手续费等级": network_info['fee_level']
-    }
-
-
 @st.cache_data(ttl=60)
 def generate_arbitrage_data() -> pd.DataFrame:
     """生成完整的套利数据 - 优化版本"""
     try:
-        # 批量生成套利机会 - 避免大循环
+        # 批量生成套利机会 - 按列向量化抽样，避免逐行循环
         num_opportunities = 200
 
-        # 向量化生成随机选择
-        currencies = np.random.choice(CURRENCIES, num_opportunities)
-        buy_exchanges = np.random.choice(EXCHANGES, num_opportunities)
-
-        # 生成不同的卖出交易所
-        sell_exchanges = []
-        for buy_ex in buy_exchanges:
-            available_exchanges = [ex for ex in EXCHANGES if ex != buy_ex]
-            sell_exchanges.append(np.random.choice(available_exchanges))
-
-        # 批量生成机会数据
-        data = []
-        for i in range(num_opportunities):
-            opportunity = generate_arbitrage_opportunity(
-                currencies[i],
-                buy_exchanges[i],
-                sell_exchanges[i]
-            )
-            data.append(opportunity)
+        currencies = _RNG.choice(CURRENCIES, num_opportunities)
+
+        # 卖出交易所通过非零偏移保证与买入交易所不同，且在其余交易所中均匀分布
+        num_exchanges = len(EXCHANGES)
+        exchanges = np.array(EXCHANGES, dtype=object)
+        buy_idx = _RNG.integers(0, num_exchanges, num_opportunities)
+        sell_idx = (buy_idx + _RNG.integers(1, num_exchanges, num_opportunities)) % num_exchanges
+
+        base_prices = _RNG.uniform(0.1, 50000, num_opportunities)
+        price_diffs = _RNG.uniform(0.1, 4.0, num_opportunities)
+        sell_prices = base_prices * (1 + price_diffs / 100)
+
+        withdraw_idx = _RNG.integers(0, len(_NETWORK_NAMES), num_opportunities)
+        deposit_idx = _RNG.integers(0, len(_NETWORK_NAMES), num_opportunities)
+        withdraw_networks = _NETWORK_NAMES[withdraw_idx]
+        unified_networks = np.where(withdraw_idx == deposit_idx, withdraw_networks, "-")
+
+        success_rates = np.maximum(70, _NETWORK_SUCCESS[withdraw_idx] + _RNG.normal(0, 5, num_opportunities))
+        latencies = np.maximum(1, _NETWORK_LATENCY[withdraw_idx] + _RNG.normal(0, 10, num_opportunities))
+        estimated_times = latencies + _RNG.uniform(30, 180, num_opportunities)
+
+        data = {
+            "币种": currencies,
+            "买入平台": exchanges[buy_idx],
+            "卖出平台": exchanges[sell_idx],
+            "买入价格": [f"${p:.4f}" for p in base_prices],
+            "卖出价格": [f"${p:.4f}" for p in sell_prices],
+            "价格差": [f"{d:.2f}%" for d in price_diffs],
+            "提现网络": withdraw_networks,
+            "充值网络": _NETWORK_NAMES[deposit_idx],
+            "充提合一": unified_networks,
+            "执行难度": _RNG.choice(DIFFICULTY_LEVELS, size=num_opportunities, p=DIFFICULTY_WEIGHTS),
+            "成功率": [f"{r:.1f}%" for r in success_rates],
+            "网络延迟": [f"{t:.0f}秒" for t in latencies],
+            "预估时间": [f"{t:.0f}秒" for t in estimated_times],
+            "流动性": _RNG.choice(LIQUIDITY_LEVELS, size=num_opportunities, p=LIQUIDITY_WEIGHTS),
+            "风险等级": _RNG.choice(RISK_LEVELS, size=num_opportunities, p=RISK_WEIGHTS),
+            "手续费等级": _NETWORK_FEE_LEVEL[withdraw_idx]
+        }
 
         df = pd.DataFrame(data)
 
@@ -160,6 +155,9 @@ def generate_arbitrage_data() -> pd.DataFrame:
             st.error("数据生成失败，请刷新页面重试")
             return pd.DataFrame()
 
+        # Arrow 字符串列在缓存序列化时走零拷贝路径，避免逐个重建 Python 字符串对象
+        df = df.astype({col: DISPLAY_STRING_DTYPE for col in DISPLAY_STRING_COLUMNS})
+
         return df
 
     except Exception as e:
@@ -4,32 +4,46 @@
 """
 
 import sys
-import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Tuple
 
 
-def setup_project_path():
+@lru_cache(maxsize=None)
+def _resolve_paths() -> Tuple[str, str]:
     """
-    设置项目路径，确保可以正确导入src模块
+    解析并缓存 (项目根目录, src目录)
 
-    这个函数会自动检测当前文件的位置，并将项目根目录添加到Python路径中
-    支持从不同层级的文件调用（如src/、src/pages/、tests/等）
+    路径只在首次调用时解析一次，之后直接返回缓存结果，避免重复的文件系统探测
     """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
+    here = Path(__file__).resolve()
+
+    # 沿父目录向上查找src目录，找到第一个即停止
+    for parent in here.parents:
+        if parent.name == 'src':
+            return str(parent.parent), str(parent)
+        potential_src = parent / 'src'
+        if potential_src.is_dir():
+            return str(parent), str(potential_src)
+
+    raise ImportError("无法找到src目录，请检查项目结构")
+
 
-    # 从src目录调用时，需要添加父目录（项目根目录）
-    if current_dir.endswith('src'):
-        project_root = os.path.dirname(current_dir)
-    # 从src的子目录调用时，需要添加祖父目录（项目根目录）
-    elif os.path.basename(os.path.dirname(current_dir)) == 'src':
-        project_root = os.path.dirname(os.path.dirname(current_dir))
-    # 从项目根目录调用时，添加当前目录
-    else:
-        project_root = current_dir
+def _ensure_in_sys_path(path: str) -> str:
+    """将路径加入sys.path（幂等）"""
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return path
 
-    if project_root not in sys.path:
-        sys.path.insert(0, project_root)
 
-    return project_root
+def setup_project_path():
+    """
+    设置项目路径，确保可以正确导入src模块
+
+    将项目根目录添加到Python路径中，支持从不同层级的文件调用（如src/、src/pages/、tests/等）
+    """
+    project_root, _ = _resolve_paths()
+    return _ensure_in_sys_path(project_root)
 
 
 def setup_src_path():
@@ -38,33 +52,8 @@ def setup_src_path():
 
     这个函数专门用于页面文件，将src目录添加到Python路径中
     """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-
-    # 从pages目录调用时，src目录是父目录
-    if current_dir.endswith('pages'):
-        src_dir = os.path.dirname(current_dir)
-    # 从src目录调用时，src目录就是当前目录
-    elif current_dir.endswith('src'):
-        src_dir = current_dir
-    # 从其他位置调用时，尝试找到src目录
-    else:
-        # 向上查找src目录
-        search_dir = current_dir
-        src_dir = None
-        for _ in range(3):  # 最多向上查找3级
-            potential_src = os.path.join(search_dir, 'src')
-            if os.path.exists(potential_src) and os.path.isdir(potential_src):
-                src_dir = potential_src
-                break
-            search_dir = os.path.dirname(search_dir)
-
-        if src_dir is None:
-            raise ImportError("无法找到src目录，请检查项目结构")
-
-    if src_dir not in sys.path:
-        sys.path.insert(0, src_dir)
-
-    return src_dir
+    _, src_dir = _resolve_paths()
+    return _ensure_in_sys_path(src_dir)
 
 
 # 为了向后兼容，提供一个通用的设置函数
@@ -5,16 +5,110 @@
 
 import logging
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+import random
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 import json
+import numpy as np
 import pandas as pd
 from decimal import Decimal
 
+from src.utils.numba_utils import njit, prange
+
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 模拟数据使用的模块级随机数生成器（标量用 _rng，批量抽样用 _np_rng）
+_rng = random.Random()
+_np_rng = np.random.default_rng()
+
+# 每个交易所允许的最大并发API请求数，避免并发扇出触发限频
+MAX_CONCURRENT_REQUESTS_PER_EXCHANGE = 8
+
+# 账户指标/风险指标缓存有效期（秒）
+METRICS_CACHE_TTL = 300.0
+
+# 投资组合摘要缓存有效期（秒）
+SUMMARY_CACHE_TTL = 1.0
+
+# 币种USD价格表（模拟价格），估值用的索引表与价格向量在导入时由其一次性生成
+_USD_PRICE: Dict[str, Decimal] = {
+    'USDT': Decimal('1'),
+    'BTC': Decimal('43000'),
+    'ETH': Decimal('2500'),
+    'BNB': Decimal('300'),
+}
+_CURRENCY_INDEX: Dict[str, int] = {currency: i for i, currency in enumerate(_USD_PRICE)}
+_PRICE_VEC = np.array([float(price) for price in _USD_PRICE.values()])
+
+# 当前估值事务内共享的价格快照（与 _CURRENCY_INDEX 对齐的float64价格向量）
+_PRICES: ContextVar[Optional[np.ndarray]] = ContextVar("prices", default=None)
+
+# 指标计算使用的日收益率历史长度及年化交易日数
+_RETURN_HISTORY_DAYS = 30
+_TRADING_DAYS_PER_YEAR = 252
+
+# float -> Decimal 统一量化到 8 位小数，避免经由 str() 的浮点格式化开销
+_Q8 = Decimal('1E-8')
+
+# 常用Decimal常量，避免在热路径中重复解析构造
+_DEC_ZERO = Decimal('0')
+_DEC_SEVEN = Decimal('7')
+_DEC_THIRTY = Decimal('30')
+_DEC_MAX_ALLOC = Decimal('1000000')
+
+
+def _dec(x: float) -> Decimal:
+    """将浮点数转换为量化到 8 位小数的 Decimal"""
+    return Decimal(x).quantize(_Q8)
+
+
+@njit(cache=True)
+def _alloc_equal(n: int, total: float, mn: float, mx: float) -> np.ndarray:
+    """平均分配内核"""
+    return np.maximum(np.minimum(np.full(n, total / n), mx), mn)
+
+
+@njit(cache=True)
+def _alloc_weighted(weights: np.ndarray, total: float, mn: float, mx: float) -> np.ndarray:
+    """权重分配内核"""
+    return np.maximum(np.minimum(total * (weights / weights.sum()), mx), mn)
+
+
+@njit(cache=True)
+def _alloc_risk(risk: np.ndarray, total: float, mn: float, mx: float) -> np.ndarray:
+    """风险分配内核：风险越低，分配越多"""
+    risk_factor = 1.0 - risk / risk.sum()
+    return np.maximum(np.minimum(total * (risk_factor / risk.shape[0]), mx), mn)
+
+
+@njit(cache=True, parallel=True)
+def _max_drawdowns(returns: np.ndarray) -> np.ndarray:
+    """按行计算累计收益曲线的最大回撤，returns 形状为 (账户数, 天数)"""
+    n, t = returns.shape
+    drawdowns = np.zeros(n)
+    for i in prange(n):
+        cum = 0.0
+        peak = 0.0
+        worst = 0.0
+        for j in range(t):
+            cum += returns[i, j]
+            if cum > peak:
+                peak = cum
+            if peak - cum > worst:
+                worst = peak - cum
+        drawdowns[i] = worst
+    return drawdowns
+
 class AccountType(Enum):
     """账户类型"""
     SPOT = "spot"
@@ -39,6 +133,8 @@ class AllocationStrategy(Enum):
 @dataclass
 class AccountBalance:
     """账户余额"""
+    __slots__ = ('total', 'available', 'frozen', 'currency', 'timestamp')
+
     total: Decimal
     available: Decimal
     frozen: Decimal
@@ -68,11 +164,16 @@ class AllocationRule:
     strategy: AllocationStrategy
     target_accounts: List[str]
     weights: Dict[str, float] = field(default_factory=dict)
-    min_allocation: Decimal = Decimal('0')
-    max_allocation: Decimal = Decimal('1000000')
+    min_allocation: Decimal = _DEC_ZERO
+    max_allocation: Decimal = _DEC_MAX_ALLOC
     rebalance_threshold: float = 0.05  # 5%
     enabled: bool = True
 
+def _rule_signature(rule: AllocationRule) -> tuple:
+    """分配规则中影响分配结果的参数，作为分配函数与偏差缓存的校验键"""
+    return (rule.strategy, tuple(rule.target_accounts), tuple(rule.weights.items()),
+            rule.min_allocation, rule.max_allocation)
+
 @dataclass
 class AccountMetrics:
     """账户指标"""
@@ -92,6 +193,9 @@ class AccountMetrics:
 @dataclass
 class RiskMetrics:
     """风险指标"""
+    __slots__ = ('account_id', 'var_95', 'var_99', 'volatility', 'beta', 'correlation_btc',
+                 'max_position_size', 'leverage_ratio', 'margin_ratio')
+
     account_id: str
     var_95: Decimal  # 95% VaR
     var_99: Decimal  # 99% VaR
@@ -108,10 +212,37 @@ class AccountManager:
     def __init__(self):
         self.accounts: Dict[str, AccountInfo] = {}
         self.allocation_rules: Dict[str, AllocationRule] = {}
-        self.metrics_cache: Dict[str, AccountMetrics] = {}
-        self.risk_cache: Dict[str, RiskMetrics] = {}
+        # 缓存值为 (写入时的 time.monotonic(), 指标)
+        self.metrics_cache: Dict[str, Tuple[float, AccountMetrics]] = {}
+        self.risk_cache: Dict[str, Tuple[float, RiskMetrics]] = {}
         self.monitoring_enabled = True
 
+        # 估值用的币种索引与USD价格向量（模拟价格），估值在float64上向量化计算
+        self._currency_index: Dict[str, int] = _CURRENCY_INDEX
+        self._price_vec = _PRICE_VEC
+
+        # 每个交易所一个信号量，限制对同一交易所的并发请求；信号量与事件循环绑定，切换循环时重建
+        self._exchange_sems: Dict[str, asyncio.Semaphore] = {}
+        self._exchange_sems_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # 余额热字段的SoA视图: account_id -> (float64 余额数组, 币种索引数组)
+        self._balance_soa: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+        # 账户ID索引，仅在账户增删或状态变化时增量维护
+        self._all_account_ids: Tuple[str, ...] = ()
+        self._active_account_ids: set = set()
+
+        # 各分配规则最近一次计算的最大分配偏差: 规则ID -> (规则参数签名, 偏差)，
+        # 余额或账户变化时整体失效，规则参数变化时签名不匹配而重新计算
+        self._deviation_cache: Dict[str, Tuple[tuple, float]] = {}
+
+        # 特化分配函数缓存: 规则ID -> ((规则参数签名, 账户元组), total -> 分配数组)，
+        # 账户增删时整体失效，规则参数或账户集合变化时键不匹配而重新构建
+        self._alloc_plan_cache: Dict[str, Tuple[tuple, Callable[[float], np.ndarray]]] = {}
+
+        # 投资组合摘要缓存 (写入时的 time.monotonic(), 摘要)，账户变动时失效
+        self._summary_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
         # 初始化默认分配规则
         self._init_default_rules()
 
@@ -149,14 +280,22 @@ class AccountManager:
 
             # 测试API连接
             if not self._test_api_connection(account_info):
-                logger.warning(f"API connection test failed for account {account_info.account_id}")
+                logger.warning("API connection test failed for account %s", account_info.account_id)
 
             self.accounts[account_info.account_id] = account_info
-            logger.info(f"Added account: {account_info.account_id} on {account_info.exchange}")
+            self._all_account_ids = tuple(self.accounts)
+            if account_info.status == AccountStatus.ACTIVE:
+                self._active_account_ids.add(account_info.account_id)
+            else:
+                self._active_account_ids.discard(account_info.account_id)
+            self._summary_cache = None
+            self._alloc_plan_cache.clear()
+            self._deviation_cache.clear()
+            logger.info("Added account: %s on %s", account_info.account_id, account_info.exchange)
             return True
 
         except Exception as e:
-            logger.error(f"Failed to add account: {e}")
+            logger.error("Failed to add account: %s", e)
             return False
 
     def remove_account(self, account_id: str) -> bool:
@@ -164,19 +303,25 @@ class AccountManager:
         try:
             if account_id in self.accounts:
                 del self.accounts[account_id]
+                self._all_account_ids = tuple(self.accounts)
+                self._active_account_ids.discard(account_id)
 
                 # 清理相关数据
                 if account_id in self.metrics_cache:
                     del self.metrics_cache[account_id]
                 if account_id in self.risk_cache:
                     del self.risk_cache[account_id]
+                self._balance_soa.pop(account_id, None)
+                self._summary_cache = None
+                self._alloc_plan_cache.clear()
+                self._deviation_cache.clear()
 
-                logger.info(f"Removed account: {account_id}")
+                logger.info("Removed account: %s", account_id)
                 return True
             return False
 
         except Exception as e:
-            logger.error(f"Failed to remove account: {e}")
+            logger.error("Failed to remove account: %s", e)
             return False
 
     def update_account_status(self, account_id: str, status: AccountStatus) -> bool:
@@ -185,15 +330,33 @@ class AccountManager:
             if account_id in self.accounts:
                 self.accounts[account_id].status = status
                 self.accounts[account_id].last_updated = datetime.now()
-                logger.info(f"Updated account {account_id} status to {status.value}")
+                if status == AccountStatus.ACTIVE:
+                    self._active_account_ids.add(account_id)
+                else:
+                    self._active_account_ids.discard(account_id)
+                self._summary_cache = None
+                self._deviation_cache.clear()
+                logger.info("Updated account %s status to %s", account_id, status.value)
                 return True
             return False
 
         except Exception as e:
-            logger.error(f"Failed to update account status: {e}")
+            logger.error("Failed to update account status: %s", e)
             return False
 
-    def get_account_balances(self, account_id: str) -> Optional[Dict[str, AccountBalance]]:
+    def _get_exchange_semaphore(self, exchange: str) -> asyncio.Semaphore:
+        """获取当前事件循环下交易所对应的并发信号量（懒创建）"""
+        loop = asyncio.get_running_loop()
+        if self._exchange_sems_loop is not loop:
+            self._exchange_sems = {}
+            self._exchange_sems_loop = loop
+        sem = self._exchange_sems.get(exchange)
+        if sem is None:
+            sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS_PER_EXCHANGE)
+            self._exchange_sems[exchange] = sem
+        return sem
+
+    async def get_account_balances(self, account_id: str) -> Optional[Dict[str, AccountBalance]]:
         """获取账户余额"""
         try:
             if account_id not in self.accounts:
@@ -203,62 +366,101 @@ class AccountManager:
 
             # 这里应该调用实际的交易所API获取余额
             # 现在返回模拟数据
-            balances = self._fetch_account_balances(account)
+            balances = await self._fetch_account_balances(account)
 
             # 更新账户余额
             account.balances = balances
             account.last_updated = datetime.now()
+            self._deviation_cache.clear()
 
             return balances
 
         except Exception as e:
-            logger.error(f"Failed to get account balances: {e}")
+            logger.error("Failed to get account balances: %s", e)
             return None
 
-    def _fetch_account_balances(self, account: AccountInfo) -> Dict[str, AccountBalance]:
+    async def _fetch_account_balances(self, account: AccountInfo) -> Dict[str, AccountBalance]:
         """获取账户余额（模拟实现）"""
-        # 模拟余额数据
-        import random
-
-        currencies = ['USDT', 'BTC', 'ETH', 'BNB']
-        balances = {}
-
-        for currency in currencies:
-            total = Decimal(str(random.uniform(100, 10000)))
-            frozen = total * Decimal(str(random.uniform(0, 0.2)))
-            available = total - frozen
-
-            balances[currency] = AccountBalance(
-                total=total,
-                available=available,
-                frozen=frozen,
-                currency=currency,
-                timestamp=datetime.now()
+        async with self._get_exchange_semaphore(account.exchange):
+            # 模拟余额数据
+            currencies = list(_USD_PRICE)
+            totals = _np_rng.uniform(100, 10000, size=len(currencies))
+            frozen_fracs = _np_rng.uniform(0, 0.2, size=len(currencies))
+
+            # 估值用的SoA视图直接保存float64余额
+            self._balance_soa[account.account_id] = (
+                totals,
+                np.asarray([self._currency_index[c] for c in currencies], dtype=np.int32)
             )
 
-        return balances
+            balances = {}
+            timestamp = datetime.now()
+            for currency, total_f, frozen_frac in zip(currencies, totals, frozen_fracs):
+                total = _dec(total_f)
+                frozen = _dec(total_f * frozen_frac)
+
+                balances[currency] = AccountBalance(
+                    total=total,
+                    available=total - frozen,
+                    frozen=frozen,
+                    currency=currency,
+                    timestamp=timestamp
+                )
 
-    def calculate_total_portfolio_value(self) -> Decimal:
+            return balances
+
+    async def calculate_total_portfolio_value(self) -> Decimal:
         """计算总投资组合价值"""
-        total_value = Decimal('0')
-
-        for account_id in self.accounts:
-            balances = self.get_account_balances(account_id)
-            if balances:
-                for balance in balances.values():
-                    # 这里应该使用实际汇率转换为USD
-                    if balance.currency == 'USDT':
-                        total_value += balance.total
-                    elif balance.currency == 'BTC':
-                        total_value += balance.total * Decimal('43000')  # 模拟BTC价格
-                    elif balance.currency == 'ETH':
-                        total_value += balance.total * Decimal('2500')   # 模拟ETH价格
-                    elif balance.currency == 'BNB':
-                        total_value += balance.total * Decimal('300')    # 模拟BNB价格
+        total_value = _DEC_ZERO
+
+        async with self._price_snapshot():
+            # 并发获取所有账户余额，总耗时约为单次往返而非 N 次往返之和
+            account_ids = self._all_account_ids
+            all_balances = await asyncio.gather(
+                *(self.get_account_balances(account_id) for account_id in account_ids)
+            )
+
+            valued_ids = [account_id for account_id, balances in zip(account_ids, all_balances) if balances]
+            if valued_ids:
+                total_value = _dec(self._value_accounts(valued_ids).sum())
 
         return total_value
 
-    def allocate_funds(self, rule_id: str, total_amount: Decimal) -> Dict[str, Decimal]:
+    async def _fetch_prices(self) -> np.ndarray:
+        """获取与 _CURRENCY_INDEX 对齐的USD价格向量（模拟实现）"""
+        # 这里应该使用实际汇率
+        return self._price_vec
+
+    @asynccontextmanager
+    async def _price_snapshot(self):
+        """在当前上下文中固定一份价格快照，期间的所有估值共用同一份价格"""
+        if _PRICES.get() is not None:
+            # 已处于外层估值事务中，复用其快照
+            yield
+            return
+
+        token = _PRICES.set(await self._fetch_prices())
+        try:
+            yield
+        finally:
+            _PRICES.reset(token)
+
+    def _value_accounts(self, account_ids: List[str]) -> np.ndarray:
+        """基于余额SoA视图按账户计算USD估值，返回与输入顺序一致的float64数组"""
+        prices = _PRICES.get()
+        if prices is None:
+            prices = self._price_vec
+
+        values = np.zeros(len(account_ids))
+        for row, account_id in enumerate(account_ids):
+            soa = self._balance_soa.get(account_id)
+            if soa is not None:
+                totals, indices = soa
+                values[row] = np.dot(totals, prices[indices])
+
+        return values
+
+    async def allocate_funds(self, rule_id: str, total_amount: Decimal) -> Dict[str, Decimal]:
         """资金分配"""
         try:
             if rule_id not in self.allocation_rules:
@@ -269,73 +471,54 @@ class AccountManager:
                 raise ValueError(f"Allocation rule {rule_id} is disabled")
 
             # 获取目标账户
-            target_accounts = rule.target_accounts or list(self.accounts.keys())
-            active_accounts = [
-                acc_id for acc_id in target_accounts
-                if acc_id in self.accounts and self.accounts[acc_id].status == AccountStatus.ACTIVE
-            ]
+            target_accounts = rule.target_accounts or self._all_account_ids
+            active_ids = self._active_account_ids
+            active_accounts = [acc_id for acc_id in target_accounts if acc_id in active_ids]
 
             if not active_accounts:
                 raise ValueError("No active target accounts found")
 
             # 根据策略分配资金
-            allocation = self._calculate_allocation(rule, active_accounts, total_amount)
+            allocation = await self._calculate_allocation(rule, active_accounts, total_amount)
 
-            logger.info(f"Allocated {total_amount} using rule {rule.name}")
+            logger.info("Allocated %s using rule %s", total_amount, rule.name)
             return allocation
 
         except Exception as e:
-            logger.error(f"Failed to allocate funds: {e}")
+            logger.error("Failed to allocate funds: %s", e)
             return {}
 
-    def _calculate_allocation(self, rule: AllocationRule, accounts: List[str],
+    async def _calculate_allocation(self, rule: AllocationRule, accounts: List[str],
                             total_amount: Decimal) -> Dict[str, Decimal]:
         """计算资金分配"""
         allocation = {}
 
-        if rule.strategy == AllocationStrategy.EQUAL:
-            # 平均分配
-            amount_per_account = total_amount / len(accounts)
-            for account_id in accounts:
-                allocation[account_id] = max(
-                    min(amount_per_account, rule.max_allocation),
-                    rule.min_allocation
-                )
+        # 数值计算在float64内核中完成，仅在输出时转换为Decimal
+        total = float(total_amount)
+        mn = float(rule.min_allocation)
+        mx = float(rule.max_allocation)
+        amounts = None
 
-        elif rule.strategy == AllocationStrategy.WEIGHTED:
-            # 权重分配
-            total_weight = sum(rule.weights.get(acc_id, 1.0) for acc_id in accounts)
-            for account_id in accounts:
-                weight = rule.weights.get(account_id, 1.0)
-                amount = total_amount * Decimal(str(weight / total_weight))
-                allocation[account_id] = max(
-                    min(amount, rule.max_allocation),
-                    rule.min_allocation
-                )
+        plan = self._get_allocation_plan(rule, accounts)
+        if plan is not None:
+            # 平均分配 / 权重分配：使用已特化的分配函数
+            amounts = plan(total)
 
         elif rule.strategy == AllocationStrategy.RISK_BASED:
             # 基于风险分配
             risk_scores = self._calculate_risk_scores(accounts)
-            total_risk_score = sum(risk_scores.values())
-
-            for account_id in accounts:
-                # 风险越低，分配越多
-                risk_factor = 1.0 - (risk_scores.get(account_id, 0.5) / total_risk_score)
-                amount = total_amount * Decimal(str(risk_factor / len(accounts)))
-                allocation[account_id] = max(
-                    min(amount, rule.max_allocation),
-                    rule.min_allocation
-                )
+            risk = np.asarray([risk_scores.get(acc_id, 0.5) for acc_id in accounts], dtype=np.float64)
+            amounts = _alloc_risk(risk, total, mn, mx)
 
         elif rule.strategy == AllocationStrategy.PERFORMANCE_BASED:
             # 基于表现分配
-            performance_scores = self._calculate_performance_scores(accounts)
+            performance_scores = await self._calculate_performance_scores(accounts)
             total_performance = sum(performance_scores.values())
 
             if total_performance > 0:
                 for account_id in accounts:
                     performance_factor = performance_scores.get(account_id, 0) / total_performance
-                    amount = total_amount * Decimal(str(performance_factor))
+                    amount = _dec(float(total_amount) * performance_factor)
                     allocation[account_id] = max(
                         min(amount, rule.max_allocation),
                         rule.min_allocation
@@ -346,25 +529,84 @@ class AccountManager:
                 for account_id in accounts:
                     allocation[account_id] = amount_per_account
 
+        if amounts is not None:
+            for account_id, amount in zip(accounts, amounts):
+                allocation[account_id] = _dec(amount)
+
         return allocation
 
+    def _get_allocation_plan(self, rule: AllocationRule,
+                             accounts: List[str]) -> Optional[Callable[[float], np.ndarray]]:
+        """
+        获取针对 (规则, 账户集合) 特化的分配函数
+
+        仅适用于结果只依赖分配总额的策略（平均/权重），权重等参数在首次构建时预先计算；
+        其余策略返回None
+        """
+        key = (_rule_signature(rule), tuple(accounts))
+        cached = self._alloc_plan_cache.get(rule.id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        mn = float(rule.min_allocation)
+        mx = float(rule.max_allocation)
+
+        if rule.strategy == AllocationStrategy.EQUAL:
+            n = len(accounts)
+
+            def plan(total: float) -> np.ndarray:
+                return _alloc_equal(n, total, mn, mx)
+
+        elif rule.strategy == AllocationStrategy.WEIGHTED:
+            weights = np.asarray([rule.weights.get(acc_id, 1.0) for acc_id in accounts], dtype=np.float64)
+
+            def plan(total: float) -> np.ndarray:
+                return _alloc_weighted(weights, total, mn, mx)
+
+        else:
+            return None
+
+        self._alloc_plan_cache[rule.id] = (key, plan)
+        return plan
+
     def _calculate_risk_scores(self, accounts: List[str]) -> Dict[str, float]:
         """计算风险评分"""
         risk_scores = {}
 
-        for account_id in accounts:
-            # 模拟风险评分计算
-            import random
-            risk_scores[account_id] = random.uniform(0.1, 0.9)
+        # 模拟风险评分计算
+        for account_id, score in zip(accounts, _np_rng.uniform(0.1, 0.9, size=len(accounts)).tolist()):
+            risk_scores[account_id] = score
 
         return risk_scores
 
-    def _calculate_performance_scores(self, accounts: List[str]) -> Dict[str, float]:
+    async def _calculate_performance_scores(self, accounts: List[str]) -> Dict[str, float]:
         """计算表现评分"""
         performance_scores = {}
 
+        # 未命中缓存的账户一次性批量计算指标
+        all_metrics = {account_id: self._get_cached_metrics(account_id) for account_id in accounts}
+        missing = [
+            account_id for account_id, metrics in all_metrics.items()
+            if metrics is None and account_id in self.accounts
+        ]
+        if missing:
+            # 按交易所分组，每组在对应交易所的信号量内批量计算
+            by_exchange: Dict[str, List[str]] = {}
+            for account_id in missing:
+                by_exchange.setdefault(self.accounts[account_id].exchange, []).append(account_id)
+            computed = {}
+            for group in await asyncio.gather(*(
+                self._calculate_exchange_metrics(exchange, account_ids)
+                for exchange, account_ids in by_exchange.items()
+            )):
+                computed.update(group)
+            now = time.monotonic()
+            for account_id, metrics in computed.items():
+                self.metrics_cache[account_id] = (now, metrics)
+            all_metrics.update(computed)
+
         for account_id in accounts:
-            metrics = self.get_account_metrics(account_id)
+            metrics = all_metrics.get(account_id)
             if metrics:
                 # 基于夏普比率和收益率计算表现评分
                 score = max(0, metrics.sharpe_ratio * 0.5 + metrics.daily_pnl_percentage * 0.5)
@@ -374,55 +616,85 @@ class AccountManager:
 
         return performance_scores
 
-    def get_account_metrics(self, account_id: str) -> Optional[AccountMetrics]:
+    async def get_account_metrics(self, account_id: str) -> Optional[AccountMetrics]:
         """获取账户指标"""
         try:
             if account_id not in self.accounts:
                 return None
 
             # 检查缓存
-            if account_id in self.metrics_cache:
-                cached_metrics = self.metrics_cache[account_id]
-                # 如果缓存时间不超过5分钟，直接返回
-                if datetime.now() - cached_metrics.last_trade_time < timedelta(minutes=5):
-                    return cached_metrics
+            cached_metrics = self._get_cached_metrics(account_id)
+            if cached_metrics is not None:
+                return cached_metrics
 
             # 计算新的指标
-            metrics = self._calculate_account_metrics(account_id)
+            metrics = await self._calculate_account_metrics(account_id)
 
             # 更新缓存
             if metrics:
-                self.metrics_cache[account_id] = metrics
+                self.metrics_cache[account_id] = (time.monotonic(), metrics)
 
             return metrics
 
         except Exception as e:
-            logger.error(f"Failed to get account metrics: {e}")
+            logger.error("Failed to get account metrics: %s", e)
             return None
 
-    def _calculate_account_metrics(self, account_id: str) -> Optional[AccountMetrics]:
-        """计算账户指标（模拟实现）"""
-        import random
-
-        # 模拟指标数据
-        total_value = Decimal(str(random.uniform(10000, 100000)))
-        daily_pnl = Decimal(str(random.uniform(-1000, 1000)))
-        daily_pnl_pct = float(daily_pnl / total_value * 100)
-
-        metrics = AccountMetrics(
-            account_id=account_id,
-            total_value_usd=total_value,
-            daily_pnl=daily_pnl,
-            daily_pnl_percentage=daily_pnl_pct,
-            weekly_pnl=daily_pnl * Decimal('7'),
-            monthly_pnl=daily_pnl * Decimal('30'),
-            max_drawdown=random.uniform(0.05, 0.25),
-            sharpe_ratio=random.uniform(-1.0, 3.0),
-            win_rate=random.uniform(0.4, 0.8),
-            total_trades=random.randint(50, 500),
-            avg_trade_size=Decimal(str(random.uniform(100, 5000))),
-            last_trade_time=datetime.now()
-        )
+    def _get_cached_metrics(self, account_id: str) -> Optional[AccountMetrics]:
+        """返回未过期的缓存指标（缓存时间不超过5分钟），否则返回None"""
+        cached = self.metrics_cache.get(account_id)
+        if cached is not None:
+            cached_at, cached_metrics = cached
+            if time.monotonic() - cached_at < METRICS_CACHE_TTL:
+                return cached_metrics
+        return None
+
+    async def _calculate_account_metrics(self, account_id: str) -> Optional[AccountMetrics]:
+        """计算账户指标"""
+        metrics = await self._calculate_exchange_metrics(self.accounts[account_id].exchange, [account_id])
+        return metrics.get(account_id)
+
+    async def _calculate_exchange_metrics(self, exchange: str, account_ids: List[str]) -> Dict[str, AccountMetrics]:
+        """在交易所信号量内批量计算同一交易所下账户的指标"""
+        async with self._get_exchange_semaphore(exchange):
+            return await self._calculate_account_metrics_batch(account_ids)
+
+    async def _calculate_account_metrics_batch(self, account_ids: List[str]) -> Dict[str, AccountMetrics]:
+        """批量计算账户指标（模拟实现），统计量在 (账户数, 天数) 收益率矩阵上向量化计算"""
+        n = len(account_ids)
+        if n == 0:
+            return {}
+
+        # 模拟交易历史：日收益率矩阵及账户规模
+        returns = _np_rng.normal(0.0005, 0.02, size=(n, _RETURN_HISTORY_DAYS))
+        total_values = _np_rng.uniform(10000, 100000, size=n)
+        win_rates = _np_rng.uniform(0.4, 0.8, size=n)
+        avg_trade_sizes = _np_rng.uniform(100, 5000, size=n)
+        total_trades = _np_rng.integers(50, 501, size=n)
+
+        sharpe_ratios = returns.mean(axis=1) / returns.std(axis=1, ddof=1) * np.sqrt(_TRADING_DAYS_PER_YEAR)
+        max_drawdowns = _max_drawdowns(returns)
+        daily_pnls = total_values * returns[:, -1]
+        daily_pnl_pcts = returns[:, -1] * 100
+
+        now = datetime.now()
+        metrics = {}
+        for i, account_id in enumerate(account_ids):
+            daily_pnl = _dec(daily_pnls[i])
+            metrics[account_id] = AccountMetrics(
+                account_id=account_id,
+                total_value_usd=_dec(total_values[i]),
+                daily_pnl=daily_pnl,
+                daily_pnl_percentage=float(daily_pnl_pcts[i]),
+                weekly_pnl=daily_pnl * _DEC_SEVEN,
+                monthly_pnl=daily_pnl * _DEC_THIRTY,
+                max_drawdown=float(max_drawdowns[i]),
+                sharpe_ratio=float(sharpe_ratios[i]),
+                win_rate=float(win_rates[i]),
+                total_trades=int(total_trades[i]),
+                avg_trade_size=_dec(avg_trade_sizes[i]),
+                last_trade_time=now
+            )
 
         return metrics
 
@@ -432,29 +704,34 @@ class AccountManager:
             if account_id not in self.accounts:
                 return None
 
-            # 模拟风险指标
-            import random
+            # 检查缓存
+            cached = self.risk_cache.get(account_id)
+            if cached is not None:
+                cached_at, cached_risk = cached
+                if time.monotonic() - cached_at < METRICS_CACHE_TTL:
+                    return cached_risk
 
+            # 模拟风险指标
             risk_metrics = RiskMetrics(
                 account_id=account_id,
-                var_95=Decimal(str(random.uniform(500, 2000))),
-                var_99=Decimal(str(random.uniform(1000, 3000))),
-                volatility=random.uniform(0.1, 0.5),
-                beta=random.uniform(0.5, 1.5),
-                correlation_btc=random.uniform(-0.5, 0.9),
-                max_position_size=Decimal(str(random.uniform(5000, 20000))),
-                leverage_ratio=random.uniform(1.0, 5.0),
-                margin_ratio=random.uniform(0.1, 0.8)
+                var_95=_dec(_rng.uniform(500, 2000)),
+                var_99=_dec(_rng.uniform(1000, 3000)),
+                volatility=_rng.uniform(0.1, 0.5),
+                beta=_rng.uniform(0.5, 1.5),
+                correlation_btc=_rng.uniform(-0.5, 0.9),
+                max_position_size=_dec(_rng.uniform(5000, 20000)),
+                leverage_ratio=_rng.uniform(1.0, 5.0),
+                margin_ratio=_rng.uniform(0.1, 0.8)
             )
 
-            self.risk_cache[account_id] = risk_metrics
+            self.risk_cache[account_id] = (time.monotonic(), risk_metrics)
             return risk_metrics
 
         except Exception as e:
-            logger.error(f"Failed to get risk metrics: {e}")
+            logger.error("Failed to get risk metrics: %s", e)
             return None
 
-    def check_rebalancing_needed(self, rule_id: str) -> bool:
+    async def check_rebalancing_needed(self, rule_id: str) -> bool:
         """检查是否需要重新平衡"""
         try:
             if rule_id not in self.allocation_rules:
@@ -464,50 +741,51 @@ class AccountManager:
             if not rule.enabled:
                 return False
 
+            # 余额、账户与规则参数均未变化时直接使用缓存的最大偏差
+            signature = _rule_signature(rule)
+            cached = self._deviation_cache.get(rule_id)
+            if cached is not None and cached[0] == signature:
+                return cached[1] > rule.rebalance_threshold
+
             # 获取当前分配
-            current_allocation = self._get_current_allocation(rule.target_accounts)
+            current_allocation = await self._get_current_allocation(rule.target_accounts)
 
             # 计算理想分配
             total_value = sum(current_allocation.values())
-            ideal_allocation = self._calculate_allocation(rule, list(current_allocation.keys()), total_value)
+            if total_value <= 0:
+                return False
+            ideal_allocation = await self._calculate_allocation(rule, list(current_allocation.keys()), total_value)
 
             # 检查偏差
-            for account_id in current_allocation:
-                current_pct = float(current_allocation[account_id] / total_value)
-                ideal_pct = float(ideal_allocation.get(account_id, Decimal('0')) / total_value)
-
-                if abs(current_pct - ideal_pct) > rule.rebalance_threshold:
-                    return True
+            current = np.array([float(value) for value in current_allocation.values()])
+            ideal = np.array([
+                float(ideal_allocation.get(account_id, _DEC_ZERO)) for account_id in current_allocation
+            ])
+            max_deviation = float(np.abs(current - ideal).max() / float(total_value))
 
-            return False
+            self._deviation_cache[rule_id] = (signature, max_deviation)
+            return max_deviation > rule.rebalance_threshold
 
         except Exception as e:
-            logger.error(f"Failed to check rebalancing: {e}")
+            logger.error("Failed to check rebalancing: %s", e)
             return False
 
-    def _get_current_allocation(self, target_accounts: List[str]) -> Dict[str, Decimal]:
+    async def _get_current_allocation(self, target_accounts: List[str]) -> Dict[str, Decimal]:
         """获取当前资金分配"""
         allocation = {}
 
-        accounts_to_check = target_accounts or list(self.accounts.keys())
+        accounts_to_check = [
+            account_id for account_id in (target_accounts or self._all_account_ids)
+            if account_id in self.accounts
+        ]
+        async with self._price_snapshot():
+            all_balances = await asyncio.gather(
+                *(self.get_account_balances(account_id) for account_id in accounts_to_check)
+            )
 
-        for account_id in accounts_to_check:
-            if account_id in self.accounts:
-                balances = self.get_account_balances(account_id)
-                if balances:
-                    total_value = Decimal('0')
-                    for balance in balances.values():
-                        # 转换为USD价值
-                        if balance.currency == 'USDT':
-                            total_value += balance.total
-                        elif balance.currency == 'BTC':
-                            total_value += balance.total * Decimal('43000')
-                        elif balance.currency == 'ETH':
-                            total_value += balance.total * Decimal('2500')
-                        elif balance.currency == 'BNB':
-                            total_value += balance.total * Decimal('300')
-
-                    allocation[account_id] = total_value
+            valued_ids = [account_id for account_id, balances in zip(accounts_to_check, all_balances) if balances]
+            for account_id, value in zip(valued_ids, self._value_accounts(valued_ids)):
+                allocation[account_id] = _dec(value)
 
         return allocation
 
@@ -536,37 +814,57 @@ class AccountManager:
         try:
             # 这里应该实际测试API连接
             # 现在返回模拟结果
-            import random
-            return random.choice([True, False])
+            return _rng.choice([True, False])
 
         except Exception as e:
-            logger.error(f"API connection test failed: {e}")
+            logger.error("API connection test failed: %s", e)
             return False
 
-    def get_portfolio_summary(self) -> Dict[str, Any]:
+    async def _snapshot_account(
+        self, account_id: str
+    ) -> Tuple[Optional[Dict[str, AccountBalance]], Optional[AccountMetrics]]:
+        """并发获取单个账户的余额与指标"""
+        balances, metrics = await asyncio.gather(
+            self.get_account_balances(account_id),
+            self.get_account_metrics(account_id)
+        )
+        return balances, metrics
+
+    async def get_portfolio_summary(self) -> Dict[str, Any]:
         """获取投资组合摘要"""
         try:
+            if self._summary_cache is not None:
+                cached_at, cached_summary = self._summary_cache
+                if time.monotonic() - cached_at < SUMMARY_CACHE_TTL:
+                    return cached_summary
+
             total_accounts = len(self.accounts)
-            active_accounts = len([
-                acc for acc in self.accounts.values()
-                if acc.status == AccountStatus.ACTIVE
-            ])
+            active_accounts = len(self._active_account_ids)
 
-            total_value = self.calculate_total_portfolio_value()
+            async with self._price_snapshot():
+                # 单次遍历并发获取所有账户的余额与指标
+                account_ids = self._all_account_ids
+                snapshots = await asyncio.gather(
+                    *(self._snapshot_account(account_id) for account_id in account_ids)
+                )
+
+                total_value = _DEC_ZERO
+                valued_ids = [account_id for account_id, (balances, _) in zip(account_ids, snapshots) if balances]
+                if valued_ids:
+                    total_value = _dec(self._value_accounts(valued_ids).sum())
 
             # 计算总体指标
-            total_daily_pnl = Decimal('0')
+            total_daily_pnl = _DEC_ZERO
             total_trades = 0
 
-            for account_id in self.accounts:
-                metrics = self.get_account_metrics(account_id)
+            for _, metrics in snapshots:
                 if metrics:
                     total_daily_pnl += metrics.daily_pnl
                     total_trades += metrics.total_trades
 
             daily_pnl_pct = float(total_daily_pnl / total_value * 100) if total_value > 0 else 0
 
-            return {
+            summary = {
                 "total_accounts": total_accounts,
                 "active_accounts": active_accounts,
                 "total_value_usd": float(total_value),
@@ -577,9 +875,34 @@ class AccountManager:
                 "last_updated": datetime.now().isoformat()
             }
 
+            self._summary_cache = (time.monotonic(), summary)
+            return summary
+
         except Exception as e:
-            logger.error(f"Failed to get portfolio summary: {e}")
+            logger.error("Failed to get portfolio summary: %s", e)
             return {}
 
-# 全局账户管理器实例
-account_manager = AccountManager()
+    async def get_portfolio_summary_json(self) -> bytes:
+        """获取投资组合摘要的JSON字节串，供HTTP接口直接返回"""
+        summary = await self.get_portfolio_summary()
+        if orjson is not None:
+            return orjson.dumps(summary, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(summary, ensure_ascii=False).encode("utf-8")
+
+# 全局账户管理器实例（首次使用时创建，避免导入模块即初始化）
+_account_manager: Optional[AccountManager] = None
+
+
+def get_account_manager() -> AccountManager:
+    """获取全局账户管理器实例"""
+    global _account_manager
+    if _account_manager is None:
+        _account_manager = AccountManager()
+    return _account_manager
+
+
+def __getattr__(name: str):
+    """兼容旧的 `account_manager` 模块属性，访问时才创建实例"""
+    if name == "account_manager":
+        return get_account_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
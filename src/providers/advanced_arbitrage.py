@@ -3,23 +3,135 @@
 实现三角套利、跨链套利、期现套利等专业策略
 """
 
+import heapq
 import logging
-import asyncio
-from typing import Dict, List, Optional, Tuple, Any
+import math
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
-from itertools import combinations, permutations
+
+from src.utils.numba_utils import njit, prange
 
 logger = logging.getLogger(__name__)
 
-@dataclass
-class TriangularArbitrageOpportunity:
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# 三角套利测算的初始资金(USDT)、返回的机会数量及预计执行时间(秒)
+_TRIANGULAR_INITIAL_CAPITAL = 1000.0
+_TRIANGULAR_TOP_K = 10
+# float32粗筛后进入float64复核的候选上限，以及粗筛阈值的相对放宽量（覆盖float32舍入误差）
+_TRIANGULAR_SHORTLIST = 100
+_FLOAT32_SCREEN_MARGIN = 1e-5
+# 按行情版本号复用三角套利结果的有效期(秒)
+_TRIANGULAR_CACHE_TTL = 1.0
+_TRIANGULAR_EXECUTION_TIME = 30
+
+# 负权环判定的松弛容差，避免浮点误差产生伪环
+_CYCLE_EPSILON = 1e-12
+
+# 跨链套利、期现套利返回的机会数量
+_CROSS_CHAIN_TOP_K = 5
+_FUTURES_SPOT_TOP_K = 5
+
+# 未配置链对的默认跨链手续费与跨链时间(分钟)
+_DEFAULT_BRIDGE_FEE = 0.002
+_DEFAULT_BRIDGE_TIME = 20
+
+
+@njit(cache=True)
+def _triangle_metrics(a: float, b: float, c: float, initial: float) -> Tuple[float, float, float]:
+    """
+    单个三角的利润率、风险评分与信心度
+
+    任一腿价格无效(<=0)时三项结果均为NaN
+    """
+    if not (a > 0.0 and b > 0.0 and c > 0.0):
+        return np.nan, np.nan, np.nan
+
+    # USDT -> curr1 -> curr2 -> USDT
+    rate = (initial / a * b * c - initial) / initial
+
+    # 三个价格的变异系数作为波动性
+    m = (a + b + c) / 3.0
+    d1 = a - m
+    d2 = b - m
+    d3 = c - m
+    cv = math.sqrt((d1 * d1 + d2 * d2 + d3 * d3) / 3.0) / m
+
+    r = min(cv * 10.0, 1.0)
+    return rate, r, min(max(min(rate * 20.0, 1.0) - r * 0.5, 0.1), 1.0)
+
+
+@njit(cache=True, parallel=True)
+def _scan_triangles(p1: np.ndarray, p2: np.ndarray, p3: np.ndarray,
+                    initial: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """三角套利扫描内核：逐三角计算利润率、风险评分与信心度"""
+    n = p1.shape[0]
+    profit_rate = np.empty(n)
+    risk = np.empty(n)
+    confidence = np.empty(n)
+    for i in prange(n):
+        rate, r, conf = _triangle_metrics(p1[i], p2[i], p3[i], initial)
+        profit_rate[i] = rate
+        risk[i] = r
+        confidence[i] = conf
+    return profit_rate, risk, confidence
+
+
+@njit(cache=True, parallel=True)
+def _screen_triangles_into(prices: np.ndarray, triangle_idx: np.ndarray, triangle_ids: np.ndarray,
+                           profit_rate: np.ndarray):
+    """
+    增量三角套利粗筛内核
+
+    直接按三角索引表从价格向量读取腿价格，以float32计算利润率并原地写回预分配的float32数组；
+    仅用于筛选候选，入选者再以float64精确复核。任一腿价格无效(<=0)时记为NaN
+    """
+    one = np.float32(1.0)
+    for k in prange(triangle_ids.shape[0]):
+        i = triangle_ids[k]
+        a = np.float32(prices[triangle_idx[i, 0]])
+        b = np.float32(prices[triangle_idx[i, 1]])
+        c = np.float32(prices[triangle_idx[i, 2]])
+        if a > 0.0 and b > 0.0 and c > 0.0:
+            profit_rate[i] = b * c / a - one
+        else:
+            profit_rate[i] = np.nan
+
+
+class _FrozenSlots:
+    """
+    手写 __slots__ 的冻结数据类的序列化支持
+
+    Python 3.10 之前 copy/pickle 通过 setattr 恢复槽位状态，冻结数据类会拒绝，
+    因此按槽位顺序导出状态并以 object.__setattr__ 恢复
+    """
+    __slots__ = ()
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
+@dataclass(frozen=True)
+class TriangularArbitrageOpportunity(_FrozenSlots):
     """三角套利机会"""
-    path: List[str]  # 交易路径，如 ['BTC/USDT', 'ETH/BTC', 'ETH/USDT']
-    exchanges: List[str]  # 对应的交易所
-    prices: List[float]  # 对应的价格
+    __slots__ = ('path', 'exchanges', 'prices', 'profit_rate', 'required_capital',
+                 'expected_profit', 'execution_time', 'risk_score', 'confidence')
+
+    path: Tuple[str, ...]  # 交易路径，如 ('BTC/USDT', 'ETH/BTC', 'ETH/USDT')
+    exchanges: Tuple[str, ...]  # 对应的交易所
+    prices: Tuple[float, ...]  # 对应的价格
     profit_rate: float  # 利润率
     required_capital: float  # 所需资金
     expected_profit: float  # 预期利润
@@ -27,9 +139,12 @@ class TriangularArbitrageOpportunity:
     risk_score: float  # 风险评分(0-1)
     confidence: float  # 信心度(0-1)
 
-@dataclass
-class CrossChainOpportunity:
+@dataclass(frozen=True)
+class CrossChainOpportunity(_FrozenSlots):
     """跨链套利机会"""
+    __slots__ = ('token', 'source_chain', 'target_chain', 'source_price', 'target_price',
+                 'price_diff', 'bridge_fee', 'bridge_time', 'net_profit_rate', 'liquidity_score')
+
     token: str  # 代币名称
     source_chain: str  # 源链
     target_chain: str  # 目标链
@@ -41,9 +156,12 @@ class CrossChainOpportunity:
     net_profit_rate: float  # 净利润率
     liquidity_score: float  # 流动性评分
 
-@dataclass
-class FuturesSpotOpportunity:
+@dataclass(frozen=True)
+class FuturesSpotOpportunity(_FrozenSlots):
     """期现套利机会"""
+    __slots__ = ('symbol', 'spot_price', 'futures_price', 'spread', 'funding_rate',
+                 'time_to_expiry', 'annual_return', 'strategy_type')
+
     symbol: str  # 交易对
     spot_price: float  # 现货价格
     futures_price: float  # 期货价格
@@ -54,7 +172,12 @@ class FuturesSpotOpportunity:
     strategy_type: str  # 策略类型: 'contango' 或 'backwardation'
 
 class AdvancedArbitrageEngine:
-    """高级套利策略引擎"""
+    """
+    高级套利策略引擎
+
+    各扫描方法均为纯CPU计算、不涉及I/O，因此是同步方法；
+    异步调用方可通过 loop.run_in_executor 在线程池/进程池中执行
+    """
 
     def __init__(self):
         self.supported_chains = ['ETH', 'BSC', 'POLYGON', 'ARBITRUM', 'OPTIMISM']
@@ -64,124 +187,273 @@ class AdvancedArbitrageEngine:
             ('BSC', 'POLYGON'): 0.0008,
             # 更多跨链费用配置
         }
+        self.bridge_times = {
+            ('ETH', 'BSC'): 15,
+            ('ETH', 'POLYGON'): 30,
+            ('BSC', 'POLYGON'): 10,
+        }
         self.min_profit_threshold = 0.005  # 最小利润阈值 0.5%
 
-    async def find_triangular_arbitrage(
+        # 跨链费用/时间矩阵：按链编号索引且双向对称；最后一行/列对应未配置的链，取默认值
+        self._chain_id = {chain: i for i, chain in enumerate(self.supported_chains)}
+        self._fee_mtx, self._time_mtx = self._build_bridge_matrices()
+
+        # 按机会类型分派的仓位计算与执行计划生成函数
+        self._sizers: Dict[type, Callable[[Any, float, float], float]] = {
+            TriangularArbitrageOpportunity: self._size_triangular,
+            CrossChainOpportunity: self._size_cross_chain,
+            FuturesSpotOpportunity: self._size_futures_spot,
+        }
+        self._planners: Dict[type, Callable[[Any], Dict[str, Any]]] = {
+            TriangularArbitrageOpportunity: self._plan_triangular,
+            CrossChainOpportunity: self._plan_cross_chain,
+            FuturesSpotOpportunity: self._plan_futures_spot,
+        }
+
+        # 三角套利增量扫描状态：参与三角的交易对及其编号、(M, 3) 三角索引表、
+        # 交易对编号 -> 所在三角的索引、上次的价格向量以及各三角最新的float32粗筛利润率
+        self._triangle_base: Optional[str] = None
+        self._market_symbols: frozenset = frozenset()
+        self._symbols: List[str] = []
+        self._symbol_to_id: Dict[str, int] = {}
+        self._triangle_idx = np.empty((0, 3), dtype=np.int32)
+        self._triangles_by_edge: List[np.ndarray] = []
+        self._last_prices = np.empty(0, dtype=np.float64)
+        self._changed_mask = np.empty(0, dtype=bool)
+        self._triangle_profit = np.empty(0, dtype=np.float32)
+
+        # 最近一次三角套利结果: (计算时间, (base_currency, min_profit), 行情版本号, 机会列表)
+        self._triangular_cache: Optional[
+            Tuple[float, Tuple[str, float], Optional[int], List[TriangularArbitrageOpportunity]]
+        ] = None
+
+    def find_triangular_arbitrage(
         self,
         market_data: Dict[str, Dict[str, float]],
         base_currency: str = 'USDT',
-        min_profit: float = 0.01
+        min_profit: float = 0.01,
+        version: Optional[int] = None
     ) -> List[TriangularArbitrageOpportunity]:
-        """寻找三角套利机会"""
-        opportunities = []
+        """
+        寻找三角套利机会
 
+        三角索引表只在交易对集合变化时通过 prepare 重建；否则仅重新计算价格发生变化的交易对所在的三角。
+        上游可传入行情快照的版本号 version：同一版本在有效期内直接复用上次结果；
+        未传入时，若三角涉及的价格均未变化同样复用上次结果
+        """
         try:
-            # 获取所有可用的交易对
-            symbols = list(market_data.keys())
-
-            # 构建货币图
-            currencies = set()
-            for symbol in symbols:
-                if '/' in symbol:
-                    base, quote = symbol.split('/')
-                    currencies.add(base)
-                    currencies.add(quote)
-
-            currencies = list(currencies)
-
-            # 寻找三角套利路径
-            for curr1 in currencies:
-                if curr1 == base_currency:
-                    continue
-
-                for curr2 in currencies:
-                    if curr2 in [curr1, base_currency]:
-                        continue
-
-                    # 构建三角路径: base_currency -> curr1 -> curr2 -> base_currency
-                    path1 = f"{curr1}/{base_currency}"  # 买入curr1
-                    path2 = f"{curr2}/{curr1}"         # 用curr1买curr2
-                    path3 = f"{curr2}/{base_currency}"  # 卖出curr2
-
-                    if all(p in market_data for p in [path1, path2, path3]):
-                        opportunity = await self._calculate_triangular_profit(
-                            path1, path2, path3, market_data, min_profit
-                        )
-                        if opportunity:
-                            opportunities.append(opportunity)
-
-            # 按利润率排序
-            opportunities.sort(key=lambda x: x.profit_rate, reverse=True)
-            return opportunities[:10]  # 返回前10个机会
+            cache_key = (base_currency, min_profit)
+            cached = self._triangular_cache
+            if (version is not None and cached is not None and cached[1] == cache_key
+                    and cached[2] == version and time.monotonic() - cached[0] < _TRIANGULAR_CACHE_TTL):
+                return list(cached[3])
+
+            # 交易对集合未变时无需任何枚举工作（键视图与集合直接比较，不产生新对象）
+            rebuilt = base_currency != self._triangle_base or market_data.keys() != self._market_symbols
+            if rebuilt:
+                self.prepare(market_data, base_currency)
+
+            # 按交易对编号读取一次价格，与上次的价格向量对比找出发生变化的交易对
+            symbols = self._symbols
+            prices = np.fromiter(
+                (market_data[symbol].get('price', 0) for symbol in symbols),
+                dtype=np.float64, count=len(symbols)
+            )
+            if rebuilt:
+                dirty = np.arange(len(self._triangle_idx))
+            else:
+                changed = np.flatnonzero(np.not_equal(prices, self._last_prices, out=self._changed_mask))
+                if changed.size:
+                    by_edge = self._triangles_by_edge
+                    dirty = np.unique(np.concatenate([by_edge[j] for j in changed]))
+                else:
+                    dirty = changed
+            self._last_prices = prices
+
+            if dirty.size:
+                self._evaluate_triangles(dirty, prices)
+            elif not rebuilt and cached is not None and cached[1] == cache_key:
+                # 价格未变化，结果与上次相同
+                self._triangular_cache = (time.monotonic(), cache_key, version, cached[3])
+                return list(cached[3])
+
+            # float32粗筛：阈值略微放宽，只保留最多 _TRIANGULAR_SHORTLIST 个候选
+            screen = self._triangle_profit
+            threshold = min_profit - _FLOAT32_SCREEN_MARGIN * (1.0 + abs(min_profit))
+            hits = np.flatnonzero(screen >= threshold)
+            if hits.size > _TRIANGULAR_SHORTLIST:
+                hits = np.sort(hits[np.argpartition(screen[hits], -_TRIANGULAR_SHORTLIST)[-_TRIANGULAR_SHORTLIST:]])
+
+            # float64复核候选的利润率、风险评分与信心度，再选出前K个
+            legs = self._triangle_idx[hits]
+            profit_rate, risk_scores, confidences = _scan_triangles(
+                prices[legs[:, 0]], prices[legs[:, 1]], prices[legs[:, 2]], _TRIANGULAR_INITIAL_CAPITAL
+            )
+            keep = np.flatnonzero(profit_rate >= min_profit)
+            top = keep[np.argsort(-profit_rate[keep], kind='stable')][:_TRIANGULAR_TOP_K]
+
+            # 仅为入选机会构造数据类
+            opportunities = [
+                TriangularArbitrageOpportunity(
+                    path=tuple([symbols[j] for j in leg_ids]),
+                    exchanges=('Exchange1', 'Exchange2', 'Exchange3'),  # 实际应用中从数据获取
+                    prices=tuple(prices[leg_ids].tolist()),
+                    profit_rate=float(profit_rate[i]),
+                    required_capital=_TRIANGULAR_INITIAL_CAPITAL,
+                    expected_profit=float(profit_rate[i] * _TRIANGULAR_INITIAL_CAPITAL),
+                    execution_time=_TRIANGULAR_EXECUTION_TIME,
+                    risk_score=float(risk),
+                    confidence=float(confidence)
+                )
+                for i, leg_ids, risk, confidence in zip(top, legs[top], risk_scores[top], confidences[top])
+            ]
+            self._triangular_cache = (time.monotonic(), cache_key, version, opportunities)
+            return list(opportunities)
 
         except Exception as e:
             logger.error(f"三角套利计算失败: {e}")
             return []
 
-    async def _calculate_triangular_profit(
-        self,
-        path1: str, path2: str, path3: str,
-        market_data: Dict[str, Dict[str, float]],
-        min_profit: float
-    ) -> Optional[TriangularArbitrageOpportunity]:
-        """计算三角套利利润"""
-        try:
-            # 获取价格数据
-            price1 = market_data[path1].get('price', 0)
-            price2 = market_data[path2].get('price', 0)
-            price3 = market_data[path3].get('price', 0)
+    def prepare(self, symbols: Iterable[str], base_currency: str = 'USDT'):
+        """
+        根据交易对集合预先构建三角索引表
+
+        构建交易对编号、(M, 3) 三角索引表及交易对到三角的反向索引；交易对集合稳定时
+        后续的 find_triangular_arbitrage 只做价格读取与批量计算
+        """
+        ordered_symbols = list(dict.fromkeys(symbols))
+        market_symbols = frozenset(ordered_symbols)
+
+        # 构建以计价货币为索引的邻接表: {quote: [base]}，只扫描一次交易对（保持输入顺序）
+        graph: Dict[str, List[str]] = {}
+        for symbol in ordered_symbols:
+            base, sep, quote = symbol.partition('/')
+            if sep:
+                graph.setdefault(sys.intern(quote), []).append(sys.intern(base))
+
+        # 只枚举能够闭合的三角路径: base_currency -> curr1 -> curr2 -> base_currency
+        symbol_to_id: Dict[str, int] = {}
+        triangles: List[Tuple[int, int, int]] = []
+        for curr1 in graph.get(base_currency, ()):
+            for curr2 in graph.get(curr1, ()):
+                if curr2 == base_currency:
+                    continue
 
-            if not all([price1, price2, price3]):
-                return None
+                path3 = f"{curr2}/{base_currency}"  # 卖出curr2
+                if path3 not in market_symbols:
+                    continue
 
-            # 计算套利路径
-            # 假设初始资金为1000 USDT
-            initial_amount = 1000
+                path1 = f"{curr1}/{base_currency}"  # 买入curr1
+                path2 = f"{curr2}/{curr1}"         # 用curr1买curr2
 
-            # 第一步: USDT -> curr1
-            amount1 = initial_amount / price1
+                triangles.append(tuple(
+                    symbol_to_id.setdefault(leg, len(symbol_to_id)) for leg in (path1, path2, path3)
+                ))
 
-            # 第二步: curr1 -> curr2
-            amount2 = amount1 * price2
+        n_triangles = len(triangles)
+        triangle_idx = np.array(triangles, dtype=np.int32).reshape(n_triangles, 3)
 
-            # 第三步: curr2 -> USDT
-            final_amount = amount2 * price3
+        # 反向索引：按交易对编号分组的三角索引
+        flat = triangle_idx.ravel()
+        order = np.argsort(flat, kind='stable')
+        bounds = np.searchsorted(flat[order], np.arange(len(symbol_to_id) + 1))
+        owners = order // 3
 
-            # 计算利润率
-            profit_rate = (final_amount - initial_amount) / initial_amount
+        self._triangle_base = base_currency
+        self._market_symbols = market_symbols
+        self._symbols = list(symbol_to_id)
+        self._symbol_to_id = symbol_to_id
+        self._triangle_idx = triangle_idx
+        self._triangles_by_edge = [owners[bounds[j]:bounds[j + 1]] for j in range(len(symbol_to_id))]
+        self._triangle_profit = np.full(n_triangles, np.nan, dtype=np.float32)
+        self._changed_mask = np.empty(len(symbol_to_id), dtype=bool)
 
-            if profit_rate < min_profit:
-                return None
+    def _evaluate_triangles(self, triangle_ids: np.ndarray, prices: np.ndarray):
+        """以float32批量重新计算指定三角的粗筛利润率（原地写入结果数组），无效价格的三角记为NaN"""
+        _screen_triangles_into(prices, self._triangle_idx, triangle_ids, self._triangle_profit)
 
-            # 计算风险评分和信心度
-            risk_score = self._calculate_triangular_risk(price1, price2, price3)
-            confidence = self._calculate_confidence(profit_rate, risk_score)
-
-            return TriangularArbitrageOpportunity(
-                path=[path1, path2, path3],
-                exchanges=['Exchange1', 'Exchange2', 'Exchange3'],  # 实际应用中从数据获取
-                prices=[price1, price2, price3],
-                profit_rate=profit_rate,
-                required_capital=initial_amount,
-                expected_profit=final_amount - initial_amount,
-                execution_time=30,  # 预计30秒执行
-                risk_score=risk_score,
-                confidence=confidence
-            )
+    def find_triangular_arbitrage_polars(
+        self,
+        lf: "pl.LazyFrame",
+        base_currency: str = 'USDT',
+        min_profit: float = 0.01
+    ) -> List[TriangularArbitrageOpportunity]:
+        """
+        基于 Polars LazyFrame 寻找三角套利机会
+
+        lf 为列式行情 {symbol, base, quote, price}；三角枚举通过两次自连接完成，
+        利润率以 Polars 表达式计算，由查询优化器统一执行
+        """
+        if pl is None:
+            logger.error("polars 不可用，无法使用列式三角套利扫描")
+            return []
 
-        except Exception as e:
-            logger.error(f"三角套利计算错误: {e}")
-            return None
+        try:
+            legs = lf.select('symbol', 'base', 'quote', 'price')
+            to_base = legs.filter(pl.col('quote') == base_currency)
+
+            # base_currency -> curr1 -> curr2 -> base_currency
+            triangles = (
+                to_base.select(
+                    pl.col('symbol').alias('symbol_1'),
+                    pl.col('base').alias('curr1'),
+                    pl.col('price').alias('price_1'),
+                )
+                .join(
+                    legs.select(
+                        pl.col('symbol').alias('symbol_2'),
+                        pl.col('quote').alias('curr1'),
+                        pl.col('base').alias('curr2'),
+                        pl.col('price').alias('price_2'),
+                    ),
+                    on='curr1',
+                )
+                .filter(pl.col('curr2') != base_currency)
+                .join(
+                    to_base.select(
+                        pl.col('symbol').alias('symbol_3'),
+                        pl.col('base').alias('curr2'),
+                        pl.col('price').alias('price_3'),
+                    ),
+                    on='curr2',
+                )
+                .filter((pl.col('price_1') > 0) & (pl.col('price_2') > 0) & (pl.col('price_3') > 0))
+                .with_columns(
+                    (pl.col('price_2') * pl.col('price_3') / pl.col('price_1') - 1).alias('profit_rate')
+                )
+                .filter(pl.col('profit_rate') >= min_profit)
+                .top_k(_TRIANGULAR_TOP_K, by='profit_rate')
+                .sort('profit_rate', descending=True)
+                .collect(engine='streaming')
+            )
 
-    def _calculate_triangular_risk(self, price1: float, price2: float, price3: float) -> float:
-        """计算三角套利风险评分"""
-        # 基于价格波动性计算风险
-        prices = [price1, price2, price3]
-        volatility = np.std(prices) / np.mean(prices)
+            if triangles.height == 0:
+                return []
+
+            # 入选机会的利润率、风险评分与信心度复用扫描内核计算
+            p1 = triangles['price_1'].to_numpy().astype(np.float64)
+            p2 = triangles['price_2'].to_numpy().astype(np.float64)
+            p3 = triangles['price_3'].to_numpy().astype(np.float64)
+            profit_rate, risk, confidence = _scan_triangles(p1, p2, p3, _TRIANGULAR_INITIAL_CAPITAL)
+
+            return [
+                TriangularArbitrageOpportunity(
+                    path=(row['symbol_1'], row['symbol_2'], row['symbol_3']),
+                    exchanges=('Exchange1', 'Exchange2', 'Exchange3'),  # 实际应用中从数据获取
+                    prices=(row['price_1'], row['price_2'], row['price_3']),
+                    profit_rate=float(profit_rate[i]),
+                    required_capital=_TRIANGULAR_INITIAL_CAPITAL,
+                    expected_profit=float(profit_rate[i] * _TRIANGULAR_INITIAL_CAPITAL),
+                    execution_time=_TRIANGULAR_EXECUTION_TIME,
+                    risk_score=float(risk[i]),
+                    confidence=float(confidence[i])
+                )
+                for i, row in enumerate(triangles.iter_rows(named=True))
+            ]
 
-        # 风险评分: 0-1, 1为最高风险
-        risk_score = min(volatility * 10, 1.0)
-        return risk_score
+        except Exception as e:
+            logger.error(f"三角套利计算失败: {e}")
+            return []
 
     def _calculate_confidence(self, profit_rate: float, risk_score: float) -> float:
         """计算信心度"""
@@ -192,131 +464,308 @@ class AdvancedArbitrageEngine:
         confidence = max(base_confidence - risk_penalty, 0.1)
         return min(confidence, 1.0)
 
-    async def find_cross_chain_arbitrage(
+    def find_cyclic_arbitrage(
+        self,
+        market_data: Dict[str, Dict[str, float]],
+        base_currency: str = 'USDT',
+        max_len: int = 5,
+        min_profit: float = 0.01
+    ) -> List[TriangularArbitrageOpportunity]:
+        """
+        基于负权环检测寻找任意长度(不超过max_len)的循环套利机会
+
+        每个交易对 base/quote 对应两条有向边: quote -> base 权重 log(price)，
+        base -> quote 权重 -log(price)；汇率乘积大于1的环即为对数空间中的负权环，
+        以 base_currency 为源点运行 Bellman-Ford 检测；
+        每次只能发现前驱图上可达的负权环，不保证枚举全部套利环
+        """
+        try:
+            # 构建货币索引与边表
+            currency_id: Dict[str, int] = {}
+            symbols: List[str] = []
+            symbol_prices: List[float] = []
+            base_ids: List[int] = []
+            quote_ids: List[int] = []
+            for symbol, data in market_data.items():
+                base, sep, quote = symbol.partition('/')
+                if not sep:
+                    continue
+                price = data.get('price', 0)
+                if not price or price <= 0:
+                    continue
+                base_ids.append(currency_id.setdefault(base, len(currency_id)))
+                quote_ids.append(currency_id.setdefault(quote, len(currency_id)))
+                symbols.append(symbol)
+                symbol_prices.append(price)
+
+            if base_currency not in currency_id:
+                return []
+
+            currencies = list(currency_id)
+            pair_prices = np.array(symbol_prices, dtype=np.float64)
+            log_prices = np.log(pair_prices)
+            bases = np.array(base_ids, dtype=np.intp)
+            quotes = np.array(quote_ids, dtype=np.intp)
+
+            # 边 e < m: quote -> base (买入)；边 e >= m: base -> quote (卖出)
+            m = len(symbols)
+            src = np.concatenate([quotes, bases])
+            dst = np.concatenate([bases, quotes])
+            weight = np.concatenate([log_prices, -log_prices])
+
+            n = len(currencies)
+            dist = np.full(n, np.inf)
+            dist[currency_id[base_currency]] = 0.0
+            pred = np.full(n, -1, dtype=np.intp)
+
+            # V-1 轮批量松弛
+            for _ in range(n - 1):
+                candidate = dist[src] + weight
+                new_dist = dist.copy()
+                np.minimum.at(new_dist, dst, candidate)
+                improved = np.flatnonzero((candidate < dist[dst]) & (candidate == new_dist[dst]))
+                if improved.size == 0:
+                    break
+                pred[dst[improved]] = improved
+                dist = new_dist
+
+            # 第V轮仍可松弛的边必然指向负权环
+            candidate = dist[src] + weight
+            relaxable = np.flatnonzero(candidate < dist[dst] - _CYCLE_EPSILON)
+
+            seen_cycles = set()
+            opportunities = []
+            for edge in relaxable:
+                cycle_edges = self._extract_cycle(int(edge), pred, src, dst, n)
+                if not cycle_edges or len(cycle_edges) > max_len:
+                    continue
+
+                cycle_key = frozenset(cycle_edges)
+                if cycle_key in seen_cycles:
+                    continue
+                seen_cycles.add(cycle_key)
+
+                # 环的起点尽量旋转到 base_currency
+                base_id = currency_id[base_currency]
+                for offset, e in enumerate(cycle_edges):
+                    if src[e] == base_id:
+                        cycle_edges = cycle_edges[offset:] + cycle_edges[:offset]
+                        break
+
+                edges = np.array(cycle_edges, dtype=np.intp)
+                profit_rate = float(np.expm1(-weight[edges].sum()))
+                if profit_rate < min_profit:
+                    continue
+
+                leg_prices = pair_prices[edges % m]
+                risk_score = min(float(leg_prices.std() / leg_prices.mean()) * 10, 1.0)
+                opportunities.append(TriangularArbitrageOpportunity(
+                    path=tuple([symbols[e % m] for e in cycle_edges]),
+                    exchanges=('Exchange',) * len(cycle_edges),  # 实际应用中从数据获取
+                    prices=tuple(leg_prices.tolist()),
+                    profit_rate=profit_rate,
+                    required_capital=_TRIANGULAR_INITIAL_CAPITAL,
+                    expected_profit=profit_rate * _TRIANGULAR_INITIAL_CAPITAL,
+                    execution_time=_TRIANGULAR_EXECUTION_TIME / 3 * len(cycle_edges),
+                    risk_score=risk_score,
+                    confidence=self._calculate_confidence(profit_rate, risk_score)
+                ))
+
+            return heapq.nlargest(_TRIANGULAR_TOP_K, opportunities, key=lambda x: x.profit_rate)
+
+        except Exception as e:
+            logger.error(f"循环套利计算失败: {e}")
+            return []
+
+    @staticmethod
+    def _extract_cycle(edge: int, pred: np.ndarray, src: np.ndarray,
+                       dst: np.ndarray, n: int) -> Optional[List[int]]:
+        """沿前驱边回溯，提取可松弛边所在的负权环，按交易顺序返回边索引"""
+        pred = pred.copy()
+        pred[dst[edge]] = edge
+
+        # 回溯n步以确保落在环上
+        node = dst[edge]
+        for _ in range(n):
+            if pred[node] < 0:
+                return None
+            node = src[pred[node]]
+
+        cycle = []
+        current = node
+        while True:
+            e = pred[current]
+            if e < 0:
+                return None
+            cycle.append(int(e))
+            current = src[e]
+            if current == node:
+                break
+            if len(cycle) > n:
+                return None
+
+        cycle.reverse()
+        return cycle
+
+    def find_cross_chain_arbitrage(
         self,
         token_prices: Dict[str, Dict[str, float]]  # {chain: {token: price}}
     ) -> List[CrossChainOpportunity]:
-        """寻找跨链套利机会"""
-        opportunities = []
+        """
+        寻找跨链套利机会
 
+        将价格整理为 (链, 代币) 矩阵(缺失为NaN)，每个代币取最低价链买入、最高价链卖出，
+        所有代币在一次向量化计算中完成
+        """
         try:
-            # 获取所有代币
-            all_tokens = set()
-            for chain_data in token_prices.values():
-                all_tokens.update(chain_data.keys())
-
-            # 对每个代币寻找跨链套利机会
-            for token in all_tokens:
-                chain_prices = {}
-                for chain, prices in token_prices.items():
-                    if token in prices:
-                        chain_prices[chain] = prices[token]
-
-                if len(chain_prices) < 2:
-                    continue
-
-                # 寻找价差最大的链对
-                for source_chain, target_chain in combinations(chain_prices.keys(), 2):
-                    source_price = chain_prices[source_chain]
-                    target_price = chain_prices[target_chain]
-
-                    # 计算价差
-                    price_diff = abs(target_price - source_price) / source_price
-
-                    if price_diff > self.min_profit_threshold:
-                        # 获取跨链费用
-                        bridge_fee = self.bridge_fees.get((source_chain, target_chain), 0.002)
-
-                        # 计算净利润
-                        if target_price > source_price:
-                            net_profit_rate = (target_price - source_price) / source_price - bridge_fee
-                            direction = (source_chain, target_chain)
-                        else:
-                            net_profit_rate = (source_price - target_price) / target_price - bridge_fee
-                            direction = (target_chain, source_chain)
-
-                        if net_profit_rate > 0:
-                            opportunity = CrossChainOpportunity(
-                                token=token,
-                                source_chain=direction[0],
-                                target_chain=direction[1],
-                                source_price=chain_prices[direction[0]],
-                                target_price=chain_prices[direction[1]],
-                                price_diff=price_diff,
-                                bridge_fee=bridge_fee,
-                                bridge_time=self._get_bridge_time(direction[0], direction[1]),
-                                net_profit_rate=net_profit_rate,
-                                liquidity_score=0.7  # 默认流动性评分
-                            )
-                            opportunities.append(opportunity)
-
-            # 按净利润率排序
-            opportunities.sort(key=lambda x: x.net_profit_rate, reverse=True)
-            return opportunities[:5]
+            chains = list(token_prices)
+            tokens = list(dict.fromkeys(
+                token for chain_data in token_prices.values() for token in chain_data
+            ))
+            token_id = {token: i for i, token in enumerate(tokens)}
+
+            prices = np.full((len(chains), len(tokens)), np.nan)
+            for c, chain_data in enumerate(token_prices.values()):
+                for token, price in chain_data.items():
+                    prices[c, token_id[token]] = price
+            prices[~(prices > 0)] = np.nan
+
+            # 只考虑至少在两条链上有报价的代币
+            tradable = np.flatnonzero(np.count_nonzero(~np.isnan(prices), axis=0) >= 2)
+            if tradable.size == 0:
+                return []
+            prices = prices[:, tradable]
+
+            best_buy = np.nanargmin(prices, axis=0)
+            best_sell = np.nanargmax(prices, axis=0)
+            columns = np.arange(tradable.size)
+            buy_price = prices[best_buy, columns]
+            sell_price = prices[best_sell, columns]
+
+            # 跨链手续费按链编号取自对称矩阵（未知链的编号 -1 落到默认行/列）
+            chain_ids = np.array([self._chain_id.get(chain, -1) for chain in chains], dtype=np.intp)
+            bridge_fee = self._fee_mtx[chain_ids[best_buy], chain_ids[best_sell]]
+
+            price_diff = (sell_price - buy_price) / buy_price
+            net_profit = price_diff - bridge_fee
+            hits = np.flatnonzero((price_diff > self.min_profit_threshold) & (net_profit > 0))
+            if hits.size > _CROSS_CHAIN_TOP_K:
+                hits = hits[np.argpartition(net_profit[hits], -_CROSS_CHAIN_TOP_K)[-_CROSS_CHAIN_TOP_K:]]
+            hits = hits[np.argsort(-net_profit[hits], kind='stable')]
+
+            # 仅为入选机会构造数据类
+            opportunities = []
+            for k in hits:
+                source_chain = chains[best_buy[k]]
+                target_chain = chains[best_sell[k]]
+                opportunities.append(CrossChainOpportunity(
+                    token=tokens[tradable[k]],
+                    source_chain=source_chain,
+                    target_chain=target_chain,
+                    source_price=float(buy_price[k]),
+                    target_price=float(sell_price[k]),
+                    price_diff=float(price_diff[k]),
+                    bridge_fee=float(bridge_fee[k]),
+                    bridge_time=self._get_bridge_time(source_chain, target_chain),
+                    net_profit_rate=float(net_profit[k]),
+                    liquidity_score=0.7  # 默认流动性评分
+                ))
+            return opportunities
 
         except Exception as e:
             logger.error(f"跨链套利计算失败: {e}")
             return []
 
+    def _build_bridge_matrices(self) -> Tuple[np.ndarray, np.ndarray]:
+        """由 bridge_fees / bridge_times 配置构建对称的跨链费用与时间矩阵"""
+        size = len(self.supported_chains) + 1
+        fee_mtx = np.full((size, size), _DEFAULT_BRIDGE_FEE)
+        time_mtx = np.full((size, size), _DEFAULT_BRIDGE_TIME, dtype=np.int64)
+
+        for matrix, config in ((fee_mtx, self.bridge_fees), (time_mtx, self.bridge_times)):
+            for (source_chain, target_chain), value in config.items():
+                i = self._chain_id.get(source_chain)
+                j = self._chain_id.get(target_chain)
+                if i is not None and j is not None:
+                    matrix[i, j] = matrix[j, i] = value
+
+        return fee_mtx, time_mtx
+
     def _get_bridge_time(self, source_chain: str, target_chain: str) -> int:
         """获取跨链时间(分钟)"""
-        bridge_times = {
-            ('ETH', 'BSC'): 15,
-            ('ETH', 'POLYGON'): 30,
-            ('BSC', 'POLYGON'): 10,
-        }
-        return bridge_times.get((source_chain, target_chain), 20)
+        i = self._chain_id.get(source_chain, -1)
+        j = self._chain_id.get(target_chain, -1)
+        return int(self._time_mtx[i, j])
 
-    async def find_futures_spot_arbitrage(
+    def find_futures_spot_arbitrage(
         self,
         spot_prices: Dict[str, float],
         futures_data: Dict[str, Dict[str, Any]]  # {symbol: {price, funding_rate, expiry}}
     ) -> List[FuturesSpotOpportunity]:
-        """寻找期现套利机会"""
-        opportunities = []
+        """
+        寻找期现套利机会
 
+        按到期天数分桶，每个桶只计算一次年化系数，价差与年化收益率对全部交易对批量计算
+        """
         try:
-            for symbol in spot_prices:
-                if symbol not in futures_data:
+            symbols: List[str] = []
+            rows: List[Tuple[float, float, float, int]] = []
+            for symbol, spot_price in spot_prices.items():
+                futures_info = futures_data.get(symbol)
+                if futures_info is None:
                     continue
 
-                spot_price = spot_prices[symbol]
-                futures_info = futures_data[symbol]
-                futures_price = futures_info.get('price', 0)
-                funding_rate = futures_info.get('funding_rate', 0)
-                expiry_days = futures_info.get('expiry_days', 30)
-
+                get = futures_info.get
+                futures_price = get('price', 0)
                 if not futures_price:
                     continue
 
-                # 计算价差
-                spread = (futures_price - spot_price) / spot_price
+                # 现货价格或到期天数非正时价差与年化系数无意义，直接跳过
+                expiry_days = get('expiry_days', 30)
+                if spot_price <= 0 or expiry_days <= 0:
+                    continue
 
-                # 判断策略类型
-                if spread > 0:
-                    strategy_type = 'contango'  # 期货溢价，做空期货买入现货
-                    annual_return = (spread - funding_rate * expiry_days / 365) * (365 / expiry_days)
-                else:
-                    strategy_type = 'backwardation'  # 期货贴水，买入期货卖出现货
-                    annual_return = (-spread + funding_rate * expiry_days / 365) * (365 / expiry_days)
-
-                # 只考虑年化收益率大于5%的机会
-                if annual_return > 0.05:
-                    opportunity = FuturesSpotOpportunity(
-                        symbol=symbol,
-                        spot_price=spot_price,
-                        futures_price=futures_price,
-                        spread=spread,
-                        funding_rate=funding_rate,
-                        time_to_expiry=expiry_days,
-                        annual_return=annual_return,
-                        strategy_type=strategy_type
-                    )
-                    opportunities.append(opportunity)
-
-            # 按年化收益率排序
-            opportunities.sort(key=lambda x: x.annual_return, reverse=True)
-            return opportunities[:5]
+                symbols.append(symbol)
+                rows.append((spot_price, futures_price, get('funding_rate', 0), expiry_days))
+
+            if not rows:
+                return []
+
+            data = np.array(rows, dtype=np.float64)
+            spot, futures, funding, expiry = data[:, 0], data[:, 1], data[:, 2], data[:, 3]
+
+            # 到期天数分桶：期限占比(天数/365)与年化系数(365/天数)每个桶只算一次
+            buckets, bucket_of = np.unique(expiry, return_inverse=True)
+            term = (buckets / 365)[bucket_of]
+            annualize = (365 / buckets)[bucket_of]
+
+            # 计算价差；期货溢价(contango)做空期货买入现货，贴水(backwardation)买入期货卖出现货
+            spread = (futures - spot) / spot
+            contango = spread > 0
+            annual_return = np.where(
+                contango, spread - funding * term, -spread + funding * term
+            ) * annualize
+
+            # 只考虑年化收益率大于5%的机会
+            hits = np.flatnonzero(annual_return > 0.05)
+            if hits.size > _FUTURES_SPOT_TOP_K:
+                # 只选出前K个，无需对全部候选排序
+                hits = hits[np.argpartition(annual_return[hits], -_FUTURES_SPOT_TOP_K)[-_FUTURES_SPOT_TOP_K:]]
+            hits = hits[np.argsort(-annual_return[hits], kind='stable')]
+
+            return [
+                FuturesSpotOpportunity(
+                    symbol=symbols[i],
+                    spot_price=rows[i][0],
+                    futures_price=rows[i][1],
+                    spread=float(spread[i]),
+                    funding_rate=rows[i][2],
+                    time_to_expiry=rows[i][3],
+                    annual_return=float(annual_return[i]),
+                    strategy_type='contango' if contango[i] else 'backwardation'
+                )
+                for i in hits
+            ]
 
         except Exception as e:
             logger.error(f"期现套利计算失败: {e}")
@@ -330,72 +779,83 @@ class AdvancedArbitrageEngine:
     ) -> float:
         """计算最优仓位大小"""
         try:
-            if isinstance(opportunity, TriangularArbitrageOpportunity):
-                # 三角套利仓位计算
-                max_position = available_capital * 0.1  # 最大10%资金
-                risk_adjusted = max_position * (1 - opportunity.risk_score)
-                return min(risk_adjusted, opportunity.required_capital)
-
-            elif isinstance(opportunity, CrossChainOpportunity):
-                # 跨链套利仓位计算
-                max_position = available_capital * 0.05  # 最大5%资金(风险较高)
-                return max_position * opportunity.liquidity_score
-
-            elif isinstance(opportunity, FuturesSpotOpportunity):
-                # 期现套利仓位计算
-                max_position = available_capital * 0.2  # 最大20%资金
-                volatility_factor = 1 / (1 + abs(opportunity.spread))
-                return max_position * volatility_factor
-
-            return 0
+            sizer = self._sizers.get(type(opportunity))
+            if sizer is None:
+                return 0
+            return sizer(opportunity, available_capital, risk_tolerance)
 
         except Exception as e:
             logger.error(f"仓位计算失败: {e}")
             return 0
 
+    def _size_triangular(self, opportunity: TriangularArbitrageOpportunity,
+                         available_capital: float, risk_tolerance: float) -> float:
+        """三角套利仓位计算"""
+        max_position = available_capital * 0.1  # 最大10%资金
+        risk_adjusted = max_position * (1 - opportunity.risk_score)
+        return min(risk_adjusted, opportunity.required_capital)
+
+    def _size_cross_chain(self, opportunity: CrossChainOpportunity,
+                          available_capital: float, risk_tolerance: float) -> float:
+        """跨链套利仓位计算"""
+        max_position = available_capital * 0.05  # 最大5%资金(风险较高)
+        return max_position * opportunity.liquidity_score
+
+    def _size_futures_spot(self, opportunity: FuturesSpotOpportunity,
+                           available_capital: float, risk_tolerance: float) -> float:
+        """期现套利仓位计算"""
+        max_position = available_capital * 0.2  # 最大20%资金
+        volatility_factor = 1 / (1 + abs(opportunity.spread))
+        return max_position * volatility_factor
+
     def generate_execution_plan(self, opportunity: Any) -> Dict[str, Any]:
         """生成执行计划"""
         try:
-            if isinstance(opportunity, TriangularArbitrageOpportunity):
-                return {
-                    'type': 'triangular',
-                    'steps': [
-                        {'action': 'buy', 'symbol': opportunity.path[0], 'price': opportunity.prices[0]},
-                        {'action': 'sell', 'symbol': opportunity.path[1], 'price': opportunity.prices[1]},
-                        {'action': 'sell', 'symbol': opportunity.path[2], 'price': opportunity.prices[2]}
-                    ],
-                    'estimated_time': opportunity.execution_time,
-                    'risk_level': 'high' if opportunity.risk_score > 0.7 else 'medium' if opportunity.risk_score > 0.3 else 'low'
-                }
-
-            elif isinstance(opportunity, CrossChainOpportunity):
-                return {
-                    'type': 'cross_chain',
-                    'steps': [
-                        {'action': 'buy', 'chain': opportunity.source_chain, 'token': opportunity.token},
-                        {'action': 'bridge', 'from': opportunity.source_chain, 'to': opportunity.target_chain},
-                        {'action': 'sell', 'chain': opportunity.target_chain, 'token': opportunity.token}
-                    ],
-                    'estimated_time': opportunity.bridge_time * 60,  # 转换为秒
-                    'risk_level': 'high'  # 跨链风险较高
-                }
-
-            elif isinstance(opportunity, FuturesSpotOpportunity):
-                return {
-                    'type': 'futures_spot',
-                    'steps': [
-                        {'action': 'buy_spot' if opportunity.strategy_type == 'contango' else 'sell_spot', 'symbol': opportunity.symbol},
-                        {'action': 'sell_futures' if opportunity.strategy_type == 'contango' else 'buy_futures', 'symbol': opportunity.symbol}
-                    ],
-                    'estimated_time': 60,  # 1分钟执行
-                    'risk_level': 'medium'
-                }
-
-            return {}
+            planner = self._planners.get(type(opportunity))
+            if planner is None:
+                return {}
+            return planner(opportunity)
 
         except Exception as e:
             logger.error(f"执行计划生成失败: {e}")
             return {}
 
+    def _plan_triangular(self, opportunity: TriangularArbitrageOpportunity) -> Dict[str, Any]:
+        """三角套利执行计划"""
+        return {
+            'type': 'triangular',
+            'steps': [
+                {'action': 'buy' if i == 0 else 'sell', 'symbol': symbol, 'price': price}
+                for i, (symbol, price) in enumerate(zip(opportunity.path, opportunity.prices))
+            ],
+            'estimated_time': opportunity.execution_time,
+            'risk_level': 'high' if opportunity.risk_score > 0.7 else 'medium' if opportunity.risk_score > 0.3 else 'low'
+        }
+
+    def _plan_cross_chain(self, opportunity: CrossChainOpportunity) -> Dict[str, Any]:
+        """跨链套利执行计划"""
+        return {
+            'type': 'cross_chain',
+            'steps': [
+                {'action': 'buy', 'chain': opportunity.source_chain, 'token': opportunity.token},
+                {'action': 'bridge', 'from': opportunity.source_chain, 'to': opportunity.target_chain},
+                {'action': 'sell', 'chain': opportunity.target_chain, 'token': opportunity.token}
+            ],
+            'estimated_time': opportunity.bridge_time * 60,  # 转换为秒
+            'risk_level': 'high'  # 跨链风险较高
+        }
+
+    def _plan_futures_spot(self, opportunity: FuturesSpotOpportunity) -> Dict[str, Any]:
+        """期现套利执行计划"""
+        return {
+            'type': 'futures_spot',
+            'steps': [
+                {'action': 'buy_spot' if opportunity.strategy_type == 'contango' else 'sell_spot', 'symbol': opportunity.symbol},
+                {'action': 'sell_futures' if opportunity.strategy_type == 'contango' else 'buy_futures', 'symbol': opportunity.symbol}
+            ],
+            'estimated_time': 60,  # 1分钟执行
+            'risk_level': 'medium'
+        }
+
 # 全局实例
 advanced_arbitrage_engine = AdvancedArbitrageEngine()
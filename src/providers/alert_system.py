@@ -5,17 +5,121 @@
 
 import logging
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable, Any
+import inspect
+import itertools
+from collections import Counter, defaultdict, deque
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Callable, Any, Tuple, TYPE_CHECKING
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 import json
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import numpy as np
+
+from src.utils.numba_utils import njit, prange
+
+# smtplib/email/requests/aiohttp 只在实际发送对应渠道的通知时才导入，
+# 模块底部在导入时即创建全局 AlertSystem，避免为未使用的渠道付出导入开销
+if TYPE_CHECKING:
+    import aiohttp
+    import requests
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 无订阅者时复用的空序列
+_EMPTY: tuple = ()
+
+# 规则采样降频：连续未命中每满 _SAMPLING_MISS_STEP 次，评估间隔翻倍，最大为每 _SAMPLING_MAX_INTERVAL 次评估一次
+_SAMPLING_MISS_STEP = 1000
+_SAMPLING_MAX_INTERVAL = 32
+
+# 保留的预警历史条数上限，超出后最早的预警被淘汰
+MAX_ALERT_HISTORY = 10000
+
+# 通知微批处理：窗口内到达的预警合并为一次Webhook请求/一封汇总邮件
+_NOTIFY_BATCH_WINDOW = 0.2
+_NOTIFY_BATCH_MAX = 64
+
+# 邮件正文模板
+_EMAIL_TEMPLATE = """预警时间: {timestamp}
+预警类型: {alert_type}
+严重程度: {severity}
+
+{message}
+
+详细数据:
+{data}
+"""
+
+
+def _json_bytes(obj: Any, indent: bool = False) -> bytes:
+    """序列化为JSON字节串，orjson 可用时优先使用"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+# exchange_filter 为可选参数，不过滤时必须传 None 而不是 False/空数组：numba 会为 None
+# 单独生成一个特化版本并在编译期裁剪分支，内核里也只用 "is not None" 判断，
+# 避免对布尔标志做真值判断时被错误优化为恒成立
+@njit(cache=True, parallel=True)
+def _spread_kernel(spread_pct: np.ndarray, volume_usd: np.ndarray,
+                   min_pct: float, min_vol: float, exchange_filter=None) -> np.ndarray:
+    """批量价差阈值判断，返回命中掩码（NaN 视为未命中）；exchange_filter 为逐行的交易所放行掩码"""
+    out = np.empty(spread_pct.shape[0], np.bool_)
+    for i in prange(spread_pct.shape[0]):
+        hit = spread_pct[i] >= min_pct and volume_usd[i] >= min_vol
+        if exchange_filter is not None:
+            hit = hit and exchange_filter[i]
+        out[i] = hit
+    return out
+
+
+# 触发条件判断函数工厂：按阈值缓存，阈值相同的规则（如按品种批量创建的规则）共享同一个函数。
+# 采用 LRU 淘汰而非按使用频次（LFU/MFU）淘汰：判断函数重建成本很低，被淘汰的阈值组合
+# 再次出现时重新生成即可，不需要为频次统计付出额外开销；规则阈值不会过期，因此无需 TTL
+_PREDICATE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=_PREDICATE_CACHE_SIZE)
+def _make_spread_pred(min_spread: float, min_volume: float) -> Callable[[Dict[str, Any]], bool]:
+    """价差预警判断函数"""
+    def predicate(data: Dict[str, Any]) -> bool:
+        return (data.get('spread_percentage', 0) >= min_spread and
+                data.get('volume_usd', 0) >= min_volume)
+    return predicate
+
+
+@lru_cache(maxsize=_PREDICATE_CACHE_SIZE)
+def _make_arbitrage_pred(min_profit: float, max_execution_time: float,
+                         min_liquidity: float) -> Callable[[Dict[str, Any]], bool]:
+    """套利机会预警判断函数"""
+    def predicate(data: Dict[str, Any]) -> bool:
+        return (data.get('profit_percentage', 0) >= min_profit and
+                data.get('execution_time_seconds', 0) <= max_execution_time and
+                data.get('liquidity_usd', 0) >= min_liquidity)
+    return predicate
+
+
+@lru_cache(maxsize=_PREDICATE_CACHE_SIZE)
+def _make_anomaly_pred(price_change_threshold: float,
+                       volume_spike_threshold: float) -> Callable[[Dict[str, Any]], bool]:
+    """市场异常预警判断函数"""
+    def predicate(data: Dict[str, Any]) -> bool:
+        return (abs(data.get('price_change_percentage', 0)) >= price_change_threshold or
+                data.get('volume_spike_multiplier', 1) >= volume_spike_threshold)
+    return predicate
+
+
 class AlertType(Enum):
     """预警类型"""
     SPREAD_ALERT = "spread_alert"
@@ -39,22 +143,57 @@ class NotificationChannel(Enum):
     DESKTOP = "desktop"
     MOBILE = "mobile"
 
-@dataclass
+@dataclass(init=False)
 class AlertRule:
-    """预警规则"""
+    """
+    预警规则
+
+    手写 __slots__ 以去掉实例 __dict__（dataclass(slots=True) 需要 Python 3.10）；
+    槽位字段不能有类级默认值，默认值放在手写的 __init__ 中
+    """
+    __slots__ = ('id', 'name', 'alert_type', 'conditions', 'severity', 'enabled', 'cooldown_minutes',
+                 'channels', 'last_triggered', '_predicate', '_last_triggered_mono', '_cooldown_seconds',
+                 '_channel_funcs', '_sampling')
+
     id: str
     name: str
     alert_type: AlertType
     conditions: Dict[str, Any]
     severity: AlertSeverity
-    enabled: bool = True
-    cooldown_minutes: int = 5
-    channels: List[NotificationChannel] = field(default_factory=list)
-    last_triggered: Optional[datetime] = None
-
-@dataclass
+    enabled: bool
+    cooldown_minutes: int
+    channels: List[NotificationChannel]
+    last_triggered: Optional[datetime]
+
+    def __init__(self, id: str, name: str, alert_type: AlertType, conditions: Dict[str, Any],
+                 severity: AlertSeverity, enabled: bool = True, cooldown_minutes: int = 5,
+                 channels: Optional[List[NotificationChannel]] = None,
+                 last_triggered: Optional[datetime] = None):
+        self.id = id
+        self.name = name
+        self.alert_type = alert_type
+        self.conditions = conditions
+        self.severity = severity
+        self.enabled = enabled
+        self.cooldown_minutes = cooldown_minutes
+        self.channels = [] if channels is None else channels
+        self.last_triggered = last_triggered
+        # 由 conditions 预编译得到的触发条件判断函数
+        self._predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+        # 冷却判断使用的单调时钟时间戳与冷却秒数（last_triggered 仅用于展示）
+        self._last_triggered_mono: Optional[float] = None
+        self._cooldown_seconds: float = cooldown_minutes * 60
+        # 由 channels 预先解析的 (渠道, 发送方法) 列表，同步发送通知时直接依次调用
+        self._channel_funcs: List[tuple] = []
+        # 采样降频状态，按交易对分别记录：交易对 -> [累计检查次数, 连续未命中次数, 当前评估间隔]
+        self._sampling: Dict[Any, List[int]] = {}
+
+@dataclass(init=False)
 class Alert:
-    """预警信息"""
+    """预警信息（手写 __slots__，默认值放在 __init__ 中）"""
+    __slots__ = ('id', 'rule_id', 'alert_type', 'severity', 'title', 'message', 'data', 'timestamp',
+                 'acknowledged', 'resolved', '_severity_str', '_severity_upper', '_type_str')
+
     id: str
     rule_id: str
     alert_type: AlertType
@@ -63,8 +202,26 @@ class Alert:
     message: str
     data: Dict[str, Any]
     timestamp: datetime
-    acknowledged: bool = False
-    resolved: bool = False
+    acknowledged: bool
+    resolved: bool
+
+    def __init__(self, id: str, rule_id: str, alert_type: AlertType, severity: AlertSeverity, title: str,
+                 message: str, data: Dict[str, Any], timestamp: datetime,
+                 acknowledged: bool = False, resolved: bool = False):
+        self.id = id
+        self.rule_id = rule_id
+        self.alert_type = alert_type
+        self.severity = severity
+        self.title = title
+        self.message = message
+        self.data = data
+        self.timestamp = timestamp
+        self.acknowledged = acknowledged
+        self.resolved = resolved
+        # 构造时缓存的枚举字符串，供通知格式化直接使用
+        self._severity_str = severity.value
+        self._severity_upper = self._severity_str.upper()
+        self._type_str = alert_type.value
 
 @dataclass
 class NotificationConfig:
@@ -79,13 +236,46 @@ class NotificationConfig:
 class AlertSystem:
     """智能预警系统"""
 
+    # 通知渠道到同步发送方法名的映射，MOBILE 渠道尚未实现
+    _CHANNEL_DISPATCH = {
+        NotificationChannel.EMAIL: '_send_email_notification',
+        NotificationChannel.WEBHOOK: '_send_webhook_notification',
+        NotificationChannel.DESKTOP: '_send_desktop_notification',
+    }
+    # 支持合并发送的渠道 -> 批量发送方法名（协程方法）
+    _CHANNEL_BATCH_DISPATCH = {
+        NotificationChannel.EMAIL: '_send_email_digest_async',
+        NotificationChannel.WEBHOOK: '_send_webhook_batch',
+    }
+
     def __init__(self, config: NotificationConfig = None):
         self.config = config or NotificationConfig()
         self.rules: Dict[str, AlertRule] = {}
-        self.alerts: List[Alert] = []
-        self.subscribers: Dict[AlertType, List[Callable]] = {}
+        # 按预警类型分组的规则索引（组内顺序与 self.rules 一致），供 check_* 只遍历对应类型的规则
+        self._rules_by_type: Dict[AlertType, List[AlertRule]] = defaultdict(list)
+        self.alerts: deque = deque(maxlen=MAX_ALERT_HISTORY)
+        self._alerts_by_id: Dict[str, Alert] = {}
+        # 预警ID序号，突发时也保证唯一
+        self._alert_seq = itertools.count(1)
+        # 预警统计计数器，随触发/解决增量维护
+        self._severity_counts: Counter = Counter()
+        self._type_counts: Counter = Counter()
+        self._active_count = 0
+        # 订阅者以 (回调, 是否为协程函数) 保存，订阅时判定一次，分发时不再重复检查
+        self.subscribers: Dict[AlertType, List[Tuple[Callable, bool]]] = {}
         self.running = False
 
+        # 同步Webhook通知复用的HTTP会话（首次发送时创建），保持与Webhook主机的长连接
+        self._session: Optional['requests.Session'] = None
+
+        # 异步通知：复用的HTTP会话（绑定创建它的事件循环）及尚未完成的通知任务
+        self._http_session: Optional['aiohttp.ClientSession'] = None
+        self._http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending_notifications: set = set()
+        # 通知微批处理队列及其后台刷新任务（由 start() 在调用方的事件循环中创建）
+        self._alert_queue: Optional[asyncio.Queue] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
         # 初始化默认规则
         self._init_default_rules()
 
@@ -137,201 +327,501 @@ class AlertSystem:
         self.rules[spread_rule.id] = spread_rule
         self.rules[arbitrage_rule.id] = arbitrage_rule
         self.rules[anomaly_rule.id] = anomaly_rule
+        for rule in self.rules.values():
+            self._compile_predicate(rule)
+            self._bind_channels(rule)
+        self._rebuild_rule_index()
+
+    @staticmethod
+    def _compile_predicate(rule: AlertRule):
+        """
+        将规则的 conditions 预编译为触发条件判断函数，阈值在编译时解析并校验
+
+        阈值不是数值时抛出 ValueError；没有对应 check_* 的预警类型不生成判断函数
+        """
+        conditions = rule.conditions
+
+        def threshold(key: str, default: float) -> float:
+            value = conditions.get(key, default)
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"规则 {rule.id} 的条件 {key} 必须是数值: {value!r}") from None
+
+        if rule.alert_type == AlertType.SPREAD_ALERT:
+            predicate = _make_spread_pred(
+                threshold('min_spread_percentage', 0),
+                threshold('min_volume_usd', 0),
+            )
+        elif rule.alert_type == AlertType.ARBITRAGE_OPPORTUNITY:
+            predicate = _make_arbitrage_pred(
+                threshold('min_profit_percentage', 0),
+                threshold('max_execution_time_seconds', 999),
+                threshold('min_liquidity_usd', 0),
+            )
+        elif rule.alert_type == AlertType.MARKET_ANOMALY:
+            predicate = _make_anomaly_pred(
+                threshold('price_change_threshold', 0),
+                threshold('volume_spike_multiplier', 1),
+            )
+        else:
+            predicate = None
+
+        rule._predicate = predicate
+
+    def _bind_channels(self, rule: AlertRule):
+        """将规则的通知渠道解析为绑定方法，规则渠道变化后需重新调用"""
+        dispatch = self._CHANNEL_DISPATCH
+        rule._channel_funcs = [
+            (channel, getattr(self, dispatch[channel]))
+            for channel in rule.channels if channel in dispatch
+        ]
+
+    def _rebuild_rule_index(self):
+        """按 self.rules 的顺序重建预警类型索引"""
+        self._rules_by_type.clear()
+        for rule in self.rules.values():
+            self._rules_by_type[rule.alert_type].append(rule)
+
+    def _index_rule(self, rule: AlertRule, replaced: bool):
+        """将规则加入类型索引；替换已有规则时重建索引以保持顺序"""
+        if replaced:
+            self._rebuild_rule_index()
+        else:
+            self._rules_by_type[rule.alert_type].append(rule)
 
     def add_rule(self, rule: AlertRule) -> bool:
         """添加预警规则"""
         try:
-            self.rules[rule.id] = rule
-            logger.info(f"Added alert rule: {rule.name}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to add alert rule: {e}")
+            self._compile_predicate(rule)
+        except ValueError as e:
+            logger.error("Failed to add alert rule: %s", e)
             return False
 
+        self._bind_channels(rule)
+        replaced = rule.id in self.rules
+        self.rules[rule.id] = rule
+        self._index_rule(rule, replaced)
+        logger.info("Added alert rule: %s", rule.name)
+        return True
+
     def remove_rule(self, rule_id: str) -> bool:
         """删除预警规则"""
-        try:
-            if rule_id in self.rules:
-                del self.rules[rule_id]
-                logger.info(f"Removed alert rule: {rule_id}")
-                return True
-            return False
-        except Exception as e:
-            logger.error(f"Failed to remove alert rule: {e}")
+        rule = self.rules.pop(rule_id, None)
+        if rule is None:
             return False
 
+        self._rules_by_type[rule.alert_type].remove(rule)
+        logger.info("Removed alert rule: %s", rule_id)
+        return True
+
     def update_rule(self, rule_id: str, updates: Dict[str, Any]) -> bool:
         """更新预警规则"""
-        try:
-            if rule_id not in self.rules:
-                return False
+        rule = self.rules.get(rule_id)
+        if rule is None:
+            return False
 
-            rule = self.rules[rule_id]
+        previous_type = rule.alert_type
+        # 记录被更新字段的原值，更新失败（如 cooldown_minutes 非数值、条件阈值非法）时整体回滚
+        previous = {key: getattr(rule, key) for key in updates if hasattr(rule, key)}
+        try:
             for key, value in updates.items():
                 if hasattr(rule, key):
                     setattr(rule, key, value)
-
-            logger.info(f"Updated alert rule: {rule_id}")
-            return True
+            cooldown_seconds = float(rule.cooldown_minutes) * 60
+            self._compile_predicate(rule)
+            self._bind_channels(rule)
         except Exception as e:
-            logger.error(f"Failed to update alert rule: {e}")
+            for key, value in previous.items():
+                setattr(rule, key, value)
+            self._compile_predicate(rule)
+            self._bind_channels(rule)
+            logger.error("Failed to update alert rule: %s", e)
             return False
 
+        rule._cooldown_seconds = cooldown_seconds
+        self._reset_sampling(rule)
+        if rule.alert_type != previous_type:
+            self._rebuild_rule_index()
+
+        logger.info("Updated alert rule: %s", rule_id)
+        return True
+
     def check_spread_alert(self, spread_data: Dict[str, Any]) -> Optional[Alert]:
         """检查价差预警"""
-        for rule in self.rules.values():
-            if (rule.alert_type == AlertType.SPREAD_ALERT and
-                rule.enabled and
-                self._can_trigger(rule)):
-
-                conditions = rule.conditions
-                spread_pct = spread_data.get('spread_percentage', 0)
-                volume_usd = spread_data.get('volume_usd', 0)
-
-                if (spread_pct >= conditions.get('min_spread_percentage', 0) and
-                    volume_usd >= conditions.get('min_volume_usd', 0)):
-
-                    alert = Alert(
-                        id=f"alert_{datetime.now().timestamp()}",
-                        rule_id=rule.id,
-                        alert_type=rule.alert_type,
-                        severity=rule.severity,
-                        title=f"高价差机会: {spread_data.get('symbol', 'Unknown')}",
-                        message=f"发现{spread_pct:.2f}%的价差机会，交易量${volume_usd:,.2f}",
-                        data=spread_data,
-                        timestamp=datetime.now()
-                    )
-
-                    self._trigger_alert(rule, alert)
-                    return alert
+        for rule in self._rules_by_type.get(AlertType.SPREAD_ALERT, ()):
+            # 先判断条件再检查冷却：多数数据不满足条件，无需访问时钟
+            if rule.enabled and self._evaluate_rule(rule, spread_data) and self._can_trigger(rule):
+                alert = self._build_spread_alert(rule, spread_data)
+                self._trigger_alert(rule, alert)
+                return alert
 
         return None
 
+    def check_spread_alerts_batch(self, symbols: List[str], spread_pct: np.ndarray,
+                                  volume_usd: np.ndarray,
+                                  exchanges: Optional[List[str]] = None) -> List[Alert]:
+        """
+        批量检查价差预警
+
+        阈值比较由编译内核向量化完成，只有命中的行才构造预警。结果与按顺序逐个调用
+        check_spread_alert 相同：每个品种由第一条可触发且命中的规则触发，每条规则
+        在冷却期内最多触发一次
+
+        传入逐行的 exchanges 时，规则条件中的 "exchanges" 列表作为交易所白名单生效
+        """
+        spread_pct = np.ascontiguousarray(spread_pct, dtype=np.float64)
+        volume_usd = np.ascontiguousarray(volume_usd, dtype=np.float64)
+        exchange_arr = np.asarray(exchanges, dtype=object) if exchanges is not None else None
+
+        rules = []
+        masks = []
+        for rule in self._rules_by_type.get(AlertType.SPREAD_ALERT, ()):
+            if rule.enabled and self._can_trigger(rule):
+                min_pct, min_vol = self._spread_thresholds(rule)
+                allowed = rule.conditions.get('exchanges')
+                exchange_filter = None
+                if exchange_arr is not None and allowed is not None:
+                    exchange_filter = np.isin(exchange_arr, list(allowed))
+                rules.append(rule)
+                masks.append(_spread_kernel(spread_pct, volume_usd, min_pct, min_vol, exchange_filter))
+        if not rules:
+            return []
+
+        masks = np.vstack(masks)
+        available = [True] * len(rules)
+        remaining = len(rules)
+        alerts = []
+        for row in np.flatnonzero(masks.any(axis=0)):
+            for k in np.flatnonzero(masks[:, row]):
+                if available[k]:
+                    break
+            else:
+                continue
+
+            rule = rules[k]
+            spread_data = {
+                'symbol': symbols[row],
+                'spread_percentage': float(spread_pct[row]),
+                'volume_usd': float(volume_usd[row]),
+            }
+            if exchange_arr is not None:
+                spread_data['exchange'] = exchange_arr[row]
+            alert = self._build_spread_alert(rule, spread_data)
+            self._trigger_alert(rule, alert)
+            alerts.append(alert)
+
+            available[k] = False
+            remaining -= 1
+            if not remaining:
+                break
+
+        return alerts
+
+    @staticmethod
+    def _spread_thresholds(rule: AlertRule) -> Tuple[float, float]:
+        """价差规则的 (最小价差百分比, 最小交易量)，添加规则时已校验为数值"""
+        conditions = rule.conditions
+        return (float(conditions.get('min_spread_percentage', 0)),
+                float(conditions.get('min_volume_usd', 0)))
+
+    def _build_spread_alert(self, rule: AlertRule, spread_data: Dict[str, Any]) -> Alert:
+        """构造价差预警"""
+        spread_pct = spread_data.get('spread_percentage', 0)
+        volume_usd = spread_data.get('volume_usd', 0)
+
+        return Alert(
+            id=f"alert_{next(self._alert_seq)}",
+            rule_id=rule.id,
+            alert_type=rule.alert_type,
+            severity=rule.severity,
+            title=f"高价差机会: {spread_data.get('symbol', 'Unknown')}",
+            message=f"发现{spread_pct:.2f}%的价差机会，交易量${volume_usd:,.2f}",
+            data=spread_data,
+            timestamp=datetime.now()
+        )
+
     def check_arbitrage_opportunity(self, opportunity_data: Dict[str, Any]) -> Optional[Alert]:
         """检查套利机会预警"""
-        for rule in self.rules.values():
-            if (rule.alert_type == AlertType.ARBITRAGE_OPPORTUNITY and
-                rule.enabled and
-                self._can_trigger(rule)):
-
-                conditions = rule.conditions
+        for rule in self._rules_by_type.get(AlertType.ARBITRAGE_OPPORTUNITY, ()):
+            if rule.enabled and self._evaluate_rule(rule, opportunity_data) and self._can_trigger(rule):
                 profit_pct = opportunity_data.get('profit_percentage', 0)
                 execution_time = opportunity_data.get('execution_time_seconds', 0)
-                liquidity = opportunity_data.get('liquidity_usd', 0)
-
-                if (profit_pct >= conditions.get('min_profit_percentage', 0) and
-                    execution_time <= conditions.get('max_execution_time_seconds', 999) and
-                    liquidity >= conditions.get('min_liquidity_usd', 0)):
-
-                    alert = Alert(
-                        id=f"alert_{datetime.now().timestamp()}",
-                        rule_id=rule.id,
-                        alert_type=rule.alert_type,
-                        severity=rule.severity,
-                        title=f"套利机会: {opportunity_data.get('strategy', 'Unknown')}",
-                        message=f"发现{profit_pct:.2f}%的套利机会，预计执行时间{execution_time}秒",
-                        data=opportunity_data,
-                        timestamp=datetime.now()
-                    )
-
-                    self._trigger_alert(rule, alert)
-                    return alert
+
+                alert = Alert(
+                    id=f"alert_{next(self._alert_seq)}",
+                    rule_id=rule.id,
+                    alert_type=rule.alert_type,
+                    severity=rule.severity,
+                    title=f"套利机会: {opportunity_data.get('strategy', 'Unknown')}",
+                    message=f"发现{profit_pct:.2f}%的套利机会，预计执行时间{execution_time}秒",
+                    data=opportunity_data,
+                    timestamp=datetime.now()
+                )
+
+                self._trigger_alert(rule, alert)
+                return alert
 
         return None
 
     def check_market_anomaly(self, market_data: Dict[str, Any]) -> Optional[Alert]:
         """检查市场异常预警"""
-        for rule in self.rules.values():
-            if (rule.alert_type == AlertType.MARKET_ANOMALY and
-                rule.enabled and
-                self._can_trigger(rule)):
-
-                conditions = rule.conditions
+        for rule in self._rules_by_type.get(AlertType.MARKET_ANOMALY, ()):
+            if rule.enabled and self._evaluate_rule(rule, market_data) and self._can_trigger(rule):
                 price_change = abs(market_data.get('price_change_percentage', 0))
                 volume_spike = market_data.get('volume_spike_multiplier', 1)
 
-                if (price_change >= conditions.get('price_change_threshold', 0) or
-                    volume_spike >= conditions.get('volume_spike_multiplier', 1)):
+                alert = Alert(
+                    id=f"alert_{next(self._alert_seq)}",
+                    rule_id=rule.id,
+                    alert_type=rule.alert_type,
+                    severity=rule.severity,
+                    title=f"市场异常: {market_data.get('symbol', 'Unknown')}",
+                    message=f"价格变动{price_change:.2f}%，交易量激增{volume_spike:.1f}倍",
+                    data=market_data,
+                    timestamp=datetime.now()
+                )
 
-                    alert = Alert(
-                        id=f"alert_{datetime.now().timestamp()}",
-                        rule_id=rule.id,
-                        alert_type=rule.alert_type,
-                        severity=rule.severity,
-                        title=f"市场异常: {market_data.get('symbol', 'Unknown')}",
-                        message=f"价格变动{price_change:.2f}%，交易量激增{volume_spike:.1f}倍",
-                        data=market_data,
-                        timestamp=datetime.now()
-                    )
-
-                    self._trigger_alert(rule, alert)
-                    return alert
+                self._trigger_alert(rule, alert)
+                return alert
 
         return None
 
-    def _can_trigger(self, rule: AlertRule) -> bool:
-        """检查规则是否可以触发（考虑冷却时间）"""
-        if rule.last_triggered is None:
+    @staticmethod
+    def _evaluate_rule(rule: AlertRule, data: Dict[str, Any]) -> bool:
+        """
+        按采样间隔评估规则条件
+
+        长期不命中的规则（行情平静时的绝大多数检查）逐步降低评估频率，只在每
+        评估间隔次检查中评估一次；一旦命中即视为行情变化，立即恢复逐次评估。
+        被跳过的检查视为未命中。采样状态按交易对分别记录，轮询多个交易对时
+        每个交易对至多连续跳过 _SAMPLING_MAX_INTERVAL - 1 次自身的检查
+        """
+        state = rule._sampling.get(data.get('symbol'))
+        if state is None:
+            state = rule._sampling[data.get('symbol')] = [0, 0, 1]
+
+        state[0] += 1
+        if state[0] % state[2]:
+            return False
+
+        if rule._predicate(data):
+            state[1] = 0
+            state[2] = 1
             return True
 
-        cooldown_delta = timedelta(minutes=rule.cooldown_minutes)
-        return datetime.now() - rule.last_triggered > cooldown_delta
+        state[1] += 1
+        if state[1] % _SAMPLING_MISS_STEP == 0 and state[2] < _SAMPLING_MAX_INTERVAL:
+            state[2] *= 2
+        return False
+
+    @staticmethod
+    def _reset_sampling(rule: AlertRule):
+        """恢复规则的逐次评估"""
+        rule._sampling.clear()
+
+    def reset_rule_sampling(self, rule_id: Optional[str] = None):
+        """行情状态变化时调用，恢复指定规则（默认全部规则）的逐次评估"""
+        if rule_id is None:
+            rules = list(self.rules.values())
+        else:
+            rules = [self.rules[rule_id]] if rule_id in self.rules else []
+        for rule in rules:
+            self._reset_sampling(rule)
+
+    def _can_trigger(self, rule: AlertRule) -> bool:
+        """检查规则是否可以触发（考虑冷却时间）"""
+        last = rule._last_triggered_mono
+        return last is None or time.monotonic() - last > rule._cooldown_seconds
 
     def _trigger_alert(self, rule: AlertRule, alert: Alert):
         """触发预警"""
         try:
             # 更新规则触发时间
-            rule.last_triggered = datetime.now()
+            rule._last_triggered_mono = time.monotonic()
+            rule.last_triggered = alert.timestamp
 
             # 添加到预警列表
-            self.alerts.append(alert)
+            self._append_alert(alert)
 
-            # 发送通知
-            self._send_notifications(rule, alert)
+            # 发送通知：已在当前事件循环中 start() 时入队由后台任务批量发送，否则同步发送
+            if self._batching_active():
+                self._alert_queue.put_nowait((rule, alert))
+            else:
+                self._send_notifications(rule, alert)
 
             # 通知订阅者
             self._notify_subscribers(alert)
 
-            logger.info(f"Alert triggered: {alert.title}")
+            logger.info("Alert triggered: %s", alert.title)
 
         except Exception as e:
-            logger.error(f"Failed to trigger alert: {e}")
+            logger.error("Failed to trigger alert: %s", e)
+
+    def _append_alert(self, alert: Alert):
+        """追加预警并维护ID索引与统计计数；历史已满时同步移除被淘汰的最早预警"""
+        if len(self.alerts) == self.alerts.maxlen:
+            evicted = self.alerts[0]
+            self._alerts_by_id.pop(evicted.id, None)
+            self._severity_counts[evicted.severity] -= 1
+            self._type_counts[evicted.alert_type] -= 1
+            if not evicted.resolved:
+                self._active_count -= 1
+
+        self.alerts.append(alert)
+        self._alerts_by_id[alert.id] = alert
+        self._severity_counts[alert.severity] += 1
+        self._type_counts[alert.alert_type] += 1
+        if not alert.resolved:
+            self._active_count += 1
 
     def _send_notifications(self, rule: AlertRule, alert: Alert):
         """发送通知"""
-        for channel in rule.channels:
+        for channel, send in rule._channel_funcs:
             try:
-                if channel == NotificationChannel.EMAIL:
-                    self._send_email_notification(alert)
-                elif channel == NotificationChannel.WEBHOOK:
-                    self._send_webhook_notification(alert)
-                elif channel == NotificationChannel.DESKTOP:
-                    self._send_desktop_notification(alert)
-
+                send(alert)
             except Exception as e:
-                logger.error(f"Failed to send {channel.value} notification: {e}")
+                logger.error("Failed to send %s notification: %s", channel.value, e)
+
+    async def start(self):
+        """
+        在当前事件循环中启动通知微批处理
+
+        启动后触发的预警入队，由后台任务按窗口合并发送；调用方负责在事件循环结束前
+        调用 stop()（或 close()）发送剩余预警。未启动时通知始终同步发送
+        """
+        loop = asyncio.get_running_loop()
+        if self._batching_active():
+            return
+        await self.stop()
+        self._alert_queue = asyncio.Queue()
+        self._flush_task = loop.create_task(self._flush_loop(self._alert_queue))
+
+    def _batching_active(self) -> bool:
+        """后台刷新任务是否在当前运行的事件循环中运行"""
+        task = self._flush_task
+        if task is None or task.done():
+            return False
+        try:
+            return task.get_loop() is asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+    async def _flush_loop(self, queue: asyncio.Queue):
+        """后台刷新任务：收集一个窗口内（或达到上限）的预警后批量发送，收到 None 时发送剩余预警并退出"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = loop.time() + _NOTIFY_BATCH_WINDOW
+            while len(batch) < _NOTIFY_BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._send_notification_batch(batch)
+
+    async def _send_notification_batch(self, batch: List[Tuple[AlertRule, Alert]]):
+        """
+        按渠道合并发送一批预警：一次Webhook请求、一封汇总邮件，各渠道并发进行
+
+        渠道取自规则绑定的 _channel_funcs；_CHANNEL_BATCH_DISPATCH 中没有的渠道逐条调用其发送方法
+        """
+        grouped: Dict[NotificationChannel, List[Alert]] = {}
+        for rule, alert in batch:
+            for channel, send in rule._channel_funcs:
+                if channel in self._CHANNEL_BATCH_DISPATCH:
+                    grouped.setdefault(channel, []).append(alert)
+                    continue
+                try:
+                    send(alert)
+                except Exception as e:
+                    logger.error("Failed to send %s notification: %s", channel.value, e)
+
+        channels = list(grouped)
+        results = await asyncio.gather(
+            *(getattr(self, self._CHANNEL_BATCH_DISPATCH[channel])(grouped[channel]) for channel in channels),
+            return_exceptions=True
+        )
+        for channel, result in zip(channels, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to send %s notification: %s", channel.value, result)
+
+    async def stop(self):
+        """发送队列中剩余的预警并停止后台刷新任务"""
+        task = self._flush_task
+        if task is not None and not task.done():
+            if task.get_loop() is asyncio.get_running_loop():
+                self._alert_queue.put_nowait(None)
+                await task
+            else:
+                task.cancel()
+        self._flush_task = None
+        self._alert_queue = None
 
     def _send_email_notification(self, alert: Alert):
         """发送邮件通知"""
-        if not self.config.email_username or not self.config.email_password:
+        if not self._email_configured():
             return
+        self._send_email(
+            f"[{alert._severity_upper}] {alert.title}",
+            self._email_body(alert),
+            [alert],
+        )
+
+    async def _send_email_digest_async(self, alerts: List[Alert]):
+        """在线程池中发送汇总邮件（smtplib 为阻塞I/O）"""
+        await asyncio.to_thread(self._send_email_digest, alerts)
+
+    def _send_email_digest(self, alerts: List[Alert]):
+        """发送汇总邮件，单条预警时与普通预警邮件相同"""
+        if len(alerts) == 1:
+            self._send_email_notification(alerts[0])
+            return
+        if not self._email_configured():
+            return
+
+        body = "\n\n".join(self._email_body(alert) for alert in alerts)
+        self._send_email(f"[DIGEST] {len(alerts)} 条预警", body, alerts)
+
+    def _email_configured(self) -> bool:
+        """是否配置了邮件账号，未配置时跳过正文生成"""
+        return bool(self.config.email_username and self.config.email_password)
+
+    @staticmethod
+    def _email_body(alert: Alert) -> str:
+        """生成单条预警的邮件正文"""
+        return _EMAIL_TEMPLATE.format_map({
+            'timestamp': alert.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            'alert_type': alert._type_str,
+            'severity': alert._severity_str,
+            'message': alert.message,
+            'data': _json_bytes(alert.data, indent=True).decode('utf-8'),
+        })
+
+    def _send_email(self, subject: str, body: str, alerts: List[Alert]):
+        """通过SMTP发送邮件（发送给自己）"""
+        import smtplib
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
 
         try:
             msg = MIMEMultipart()
             msg['From'] = self.config.email_username
             msg['To'] = self.config.email_username  # 发送给自己
-            msg['Subject'] = f"[{alert.severity.value.upper()}] {alert.title}"
-
-            body = f"""
-            预警时间: {alert.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
-            预警类型: {alert.alert_type.value}
-            严重程度: {alert.severity.value}
-
-            {alert.message}
-
-            详细数据:
-            {json.dumps(alert.data, indent=2, ensure_ascii=False)}
-            """
+            msg['Subject'] = subject
 
             msg.attach(MIMEText(body, 'plain', 'utf-8'))
 
@@ -341,10 +831,11 @@ class AlertSystem:
             server.send_message(msg)
             server.quit()
 
-            logger.info(f"Email notification sent for alert: {alert.id}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Email notification sent for alert: %s", ", ".join(a.id for a in alerts))
 
         except Exception as e:
-            logger.error(f"Failed to send email notification: {e}")
+            logger.error("Failed to send email notification: %s", e)
 
     def _send_webhook_notification(self, alert: Alert):
         """发送Webhook通知"""
@@ -352,82 +843,186 @@ class AlertSystem:
             return
 
         try:
-            import requests
-
-            payload = {
-                "alert_id": alert.id,
-                "title": alert.title,
-                "message": alert.message,
-                "severity": alert.severity.value,
-                "type": alert.alert_type.value,
-                "timestamp": alert.timestamp.isoformat(),
-                "data": alert.data
-            }
-
-            response = requests.post(
+            response = self._get_session().post(
                 self.config.webhook_url,
-                json=payload,
-                headers=self.config.webhook_headers,
+                data=_json_bytes(self._webhook_payload(alert)),
+                headers=self._webhook_headers(),
                 timeout=10
             )
 
             if response.status_code == 200:
-                logger.info(f"Webhook notification sent for alert: {alert.id}")
+                logger.info("Webhook notification sent for alert: %s", alert.id)
             else:
-                logger.error(f"Webhook notification failed: {response.status_code}")
+                logger.error("Webhook notification failed: %s", response.status_code)
+
+        except Exception as e:
+            logger.error("Failed to send webhook notification: %s", e)
+
+    async def _send_webhook_batch(self, alerts: List[Alert]):
+        """异步发送一批预警的Webhook通知，复用HTTP会话
+
+        单条预警沿用原有请求体，多条预警合并为 {"alerts": [...]} 一次发送
+        """
+        if not self.config.webhook_url:
+            return
+
+        if len(alerts) == 1:
+            payload = self._webhook_payload(alerts[0])
+        else:
+            payload = {"alerts": [self._webhook_payload(alert) for alert in alerts]}
+
+        import aiohttp
+
+        try:
+            session = self._get_http_session()
+            async with session.post(
+                self.config.webhook_url,
+                data=_json_bytes(payload),
+                headers=self._webhook_headers(),
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                if response.status == 200:
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("Webhook notification sent for alert: %s",
+                                    ", ".join(a.id for a in alerts))
+                else:
+                    logger.error("Webhook notification failed: %s", response.status)
 
         except Exception as e:
-            logger.error(f"Failed to send webhook notification: {e}")
+            logger.error("Failed to send webhook notification: %s", e)
+
+    @staticmethod
+    def _webhook_payload(alert: Alert) -> Dict[str, Any]:
+        """构建Webhook请求体"""
+        return {
+            "alert_id": alert.id,
+            "title": alert.title,
+            "message": alert.message,
+            "severity": alert._severity_str,
+            "type": alert._type_str,
+            "timestamp": alert.timestamp.isoformat(),
+            "data": alert.data
+        }
+
+    def _webhook_headers(self) -> Dict[str, str]:
+        """Webhook请求头：请求体已序列化为JSON，用户配置的请求头优先"""
+        return {'Content-Type': 'application/json', **self.config.webhook_headers}
+
+    def _get_session(self) -> 'requests.Session':
+        """获取同步Webhook通知复用的HTTP会话"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._session = session
+        return self._session
+
+    def _get_http_session(self) -> 'aiohttp.ClientSession':
+        """获取当前事件循环下复用的HTTP会话"""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        session = self._http_session
+        if session is None or session.closed or self._http_session_loop is not loop:
+            session = aiohttp.ClientSession()
+            self._http_session = session
+            self._http_session_loop = loop
+        return session
+
+    async def close(self):
+        """发送剩余通知、等待未完成的订阅任务并关闭同步与异步HTTP会话"""
+        await self.stop()
+        if self._pending_notifications:
+            await asyncio.gather(*self._pending_notifications, return_exceptions=True)
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
+        self._http_session_loop = None
 
     def _send_desktop_notification(self, alert: Alert):
         """发送桌面通知"""
         try:
             # 这里可以集成桌面通知库，如plyer
-            logger.info(f"Desktop notification: {alert.title}")
+            logger.info("Desktop notification: %s", alert.title)
 
         except Exception as e:
-            logger.error(f"Failed to send desktop notification: {e}")
+            logger.error("Failed to send desktop notification: %s", e)
 
     def _notify_subscribers(self, alert: Alert):
-        """通知订阅者"""
-        subscribers = self.subscribers.get(alert.alert_type, [])
-        for callback in subscribers:
+        """通知订阅者；协程回调在事件循环中以任务方式调度，不阻塞预警触发路径"""
+        subscribers = self.subscribers.get(alert.alert_type, _EMPTY)
+        if not subscribers:
+            return
+
+        pending = self._pending_notifications
+        for callback, is_async in subscribers:
             try:
-                callback(alert)
+                if not is_async:
+                    callback(alert)
+                    continue
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    asyncio.run(self._notify_async_subscriber(callback, alert))
+                    continue
+                task = loop.create_task(self._notify_async_subscriber(callback, alert))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
             except Exception as e:
-                logger.error(f"Subscriber callback failed: {e}")
+                logger.error("Subscriber callback failed: %s", e)
 
-    def subscribe(self, alert_type: AlertType, callback: Callable[[Alert], None]):
-        """订阅预警类型"""
-        if alert_type not in self.subscribers:
-            self.subscribers[alert_type] = []
-        self.subscribers[alert_type].append(callback)
+    @staticmethod
+    async def _notify_async_subscriber(callback: Callable, alert: Alert):
+        """执行协程订阅回调，异常只记录日志"""
+        try:
+            await callback(alert)
+        except Exception as e:
+            logger.error("Subscriber callback failed: %s", e)
+
+    def subscribe(self, alert_type: AlertType, callback: Callable[[Alert], Any]):
+        """订阅预警类型，回调可以是普通函数或协程函数"""
+        self.subscribers.setdefault(alert_type, []).append(
+            (callback, inspect.iscoroutinefunction(callback))
+        )
 
-    def unsubscribe(self, alert_type: AlertType, callback: Callable[[Alert], None]):
+    def unsubscribe(self, alert_type: AlertType, callback: Callable[[Alert], Any]):
         """取消订阅"""
-        if alert_type in self.subscribers:
-            try:
-                self.subscribers[alert_type].remove(callback)
-            except ValueError:
-                pass
+        subscribers = self.subscribers.get(alert_type)
+        if not subscribers:
+            return
+        for i, (cb, _) in enumerate(subscribers):
+            if cb == callback:
+                del subscribers[i]
+                break
 
     def acknowledge_alert(self, alert_id: str) -> bool:
         """确认预警"""
-        for alert in self.alerts:
-            if alert.id == alert_id:
-                alert.acknowledged = True
-                logger.info(f"Alert acknowledged: {alert_id}")
-                return True
-        return False
+        alert = self._alerts_by_id.get(alert_id)
+        if alert is None:
+            return False
+
+        alert.acknowledged = True
+        logger.info("Alert acknowledged: %s", alert_id)
+        return True
 
     def resolve_alert(self, alert_id: str) -> bool:
         """解决预警"""
-        for alert in self.alerts:
-            if alert.id == alert_id:
-                alert.resolved = True
-                logger.info(f"Alert resolved: {alert_id}")
-                return True
-        return False
+        alert = self._alerts_by_id.get(alert_id)
+        if alert is None:
+            return False
+
+        if not alert.resolved:
+            self._active_count -= 1
+        alert.resolved = True
+        logger.info("Alert resolved: %s", alert_id)
+        return True
 
     def get_active_alerts(self) -> List[Alert]:
         """获取活跃预警"""
@@ -438,27 +1033,20 @@ class AlertSystem:
         return [alert for alert in self.alerts if alert.severity == severity]
 
     def get_alert_statistics(self) -> Dict[str, Any]:
-        """获取预警统计"""
+        """获取预警统计（基于增量维护的计数器，不扫描预警列表）"""
         total_alerts = len(self.alerts)
-        active_alerts = len(self.get_active_alerts())
-
-        severity_counts = {}
-        for severity in AlertSeverity:
-            severity_counts[severity.value] = len(self.get_alerts_by_severity(severity))
-
-        type_counts = {}
-        for alert_type in AlertType:
-            type_counts[alert_type.value] = len([
-                alert for alert in self.alerts
-                if alert.alert_type == alert_type
-            ])
+        active_alerts = self._active_count
 
         return {
             "total_alerts": total_alerts,
             "active_alerts": active_alerts,
             "resolved_alerts": total_alerts - active_alerts,
-            "severity_distribution": severity_counts,
-            "type_distribution": type_counts,
+            "severity_distribution": {
+                severity.value: self._severity_counts[severity] for severity in AlertSeverity
+            },
+            "type_distribution": {
+                alert_type.value: self._type_counts[alert_type] for alert_type in AlertType
+            },
             "rules_count": len(self.rules),
             "enabled_rules": len([rule for rule in self.rules.values() if rule.enabled])
         }
@@ -4,20 +4,230 @@
 """
 
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-from scipy import stats
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error, r2_score
+from typing import Callable, Dict, List, Optional, Any, Tuple, TYPE_CHECKING
+from dataclasses import dataclass
+from datetime import datetime
+
+# plotly 只在生成仪表盘时导入
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+from src.utils.numba_utils import NUMBA_AVAILABLE, njit
 
 logger = logging.getLogger(__name__)
 
+
+def _asset_returns(prices: np.ndarray) -> np.ndarray:
+    """逐期收益率（等价于 pct_change().fillna(0)），首行及缺失价格处记为0"""
+    returns = np.zeros_like(prices)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(prices[1:], prices[:-1], out=returns[1:])
+    returns[1:] -= 1
+    returns[np.isnan(returns)] = 0
+    return returns
+
+
+def _strategy_returns(positions: np.ndarray, returns: np.ndarray, commission: float) -> np.ndarray:
+    """
+    由持仓与资产收益率计算扣除手续费后的策略日收益
+
+    positions 形状为 (..., T, 资产数)，returns 为 (T, 资产数) 并按前导维度广播；
+    首期之前视为空仓，手续费按每期持仓变动的绝对值之和收取
+    """
+    start = np.zeros_like(positions[..., :1, :])
+    position_changes = np.abs(np.diff(positions, axis=-2, prepend=start)).sum(axis=-1)
+    return (positions * returns).sum(axis=-1) - position_changes * commission
+
+
+def _run_backtest_batch(returns: np.ndarray, signals_batch: np.ndarray, commission: float) -> np.ndarray:
+    """
+    批量回测：一次计算多组信号的策略日收益
+
+    returns 为 (T, 资产数) 的资产日收益率（首行为0），signals_batch 为 (参数组数, T, 资产数)
+    的信号张量，返回 (参数组数, T) 的策略日收益。与 run_backtest 一致：信号延迟一期执行，
+    按持仓变动扣除手续费
+    """
+    positions = np.zeros_like(signals_batch)
+    positions[:, 1:] = signals_batch[:, :-1]
+    return _strategy_returns(positions, returns, commission)
+
+
+# 交易记录忽略的最小持仓变动
+_TRADE_THRESHOLD = 1e-3
+
+# 蒙特卡洛模拟按该路径数分块生成随机收益，控制单块的工作集大小
+_MONTE_CARLO_CHUNK = 1024
+
+
+@njit(cache=True, nogil=True)
+def _trade_log_kernel(positions: np.ndarray, prices: np.ndarray, commission: float,
+                      thresh: float = _TRADE_THRESHOLD):
+    """
+    逐品种扫描持仓变动，生成交易记录的列数组
+
+    positions/prices 为 (T, 品种数) 且列对齐，返回 (日期行号, 品种列号, 持仓变动, 价格, 成交额, 手续费)，
+    按品种、日期排序；持仓变动为带符号的数量，正数为买入
+    """
+    n_days, n_symbols = positions.shape
+    capacity = max(n_days - 1, 0) * n_symbols
+    date_idx = np.empty(capacity, np.int64)
+    symbol_idx = np.empty(capacity, np.int64)
+    change = np.empty(capacity, np.float64)
+    price = np.empty(capacity, np.float64)
+    value = np.empty(capacity, np.float64)
+    fee = np.empty(capacity, np.float64)
+
+    count = 0
+    for j in range(n_symbols):
+        for i in range(1, n_days):
+            d = positions[i, j] - positions[i - 1, j]
+            if abs(d) > thresh:
+                date_idx[count] = i
+                symbol_idx[count] = j
+                change[count] = d
+                price[count] = prices[i, j]
+                value[count] = abs(d) * prices[i, j]
+                fee[count] = value[count] * commission
+                count += 1
+
+    return (date_idx[:count], symbol_idx[:count], change[:count],
+            price[:count], value[:count], fee[:count])
+
+
+@njit(cache=True, nogil=True)
+def _metrics_kernel(r: np.ndarray):
+    """
+    单次遍历收益率序列，累计计算性能指标所需的统计量
+
+    返回 (累计净值, 均值, 离差平方和, 最大回撤, 盈利笔数, 盈利合计, 亏损笔数, 亏损均值, 亏损离差平方和)；
+    均值与离差平方和用 Welford 算法累计，回撤以首期净值为起点
+    """
+    mean = 0.0
+    m2 = 0.0
+    cum = 1.0
+    run_max = 0.0
+    max_dd = 0.0
+    pos_n = 0
+    pos_sum = 0.0
+    neg_n = 0
+    neg_mean = 0.0
+    neg_m2 = 0.0
+
+    for i in range(r.shape[0]):
+        x = r[i]
+        delta = x - mean
+        mean += delta / (i + 1)
+        m2 += delta * (x - mean)
+
+        cum *= 1.0 + x
+        if i == 0 or cum > run_max:
+            run_max = cum
+        dd = (cum - run_max) / run_max
+        if dd < max_dd:
+            max_dd = dd
+
+        if x > 0:
+            pos_n += 1
+            pos_sum += x
+        elif x < 0:
+            neg_n += 1
+            delta = x - neg_mean
+            neg_mean += delta / neg_n
+            neg_m2 += delta * (x - neg_mean)
+
+    return cum, mean, m2, max_dd, pos_n, pos_sum, neg_n, neg_mean, neg_m2
+
+
+# 参数扫描工作进程的状态：策略函数与价格数据在进程初始化时传入一次，避免随每个任务重复序列化
+_sweep_worker_state: Dict[str, Any] = {}
+
+
+def _init_sweep_worker(strategy_func: Callable, price_data: pd.DataFrame):
+    """参数扫描工作进程初始化"""
+    _sweep_worker_state['strategy_func'] = strategy_func
+    _sweep_worker_state['price_data'] = price_data
+
+
+def _sweep_signals(param_name: str, value: Any) -> pd.DataFrame:
+    """在工作进程中为单个参数取值生成信号"""
+    return _sweep_worker_state['strategy_func'](_sweep_worker_state['price_data'], **{param_name: value})
+
+
+def _monte_carlo_block(rng: np.random.Generator, days: int, mean_return: float, std_return: float,
+                       initial_capital: float, final_values: np.ndarray,
+                       equity_curves: Optional[np.ndarray]) -> None:
+    """模拟 len(final_values) 条路径，结果原地写入 final_values 与（可选的）equity_curves"""
+    simulations = final_values.shape[0]
+    if simulations == 0:
+        return
+
+    # 随机收益缓冲区在各分块间复用，末块使用其前若干行
+    buffer = np.empty((min(_MONTE_CARLO_CHUNK, simulations), days), dtype=np.float32)
+    for start in range(0, simulations, _MONTE_CARLO_CHUNK):
+        stop = min(start + _MONTE_CARLO_CHUNK, simulations)
+        log_returns = buffer[:stop - start]
+
+        # 生成随机收益率并转为对数收益
+        rng.standard_normal(dtype=np.float32, out=log_returns)
+        log_returns *= std_return
+        log_returns += mean_return
+        np.log1p(log_returns, out=log_returns)
+
+        if equity_curves is not None:
+            np.cumsum(log_returns, axis=1, out=log_returns)
+            equity_curves[start:stop] = initial_capital * np.exp(log_returns)
+            final_values[start:stop] = equity_curves[start:stop, -1]
+        else:
+            final_values[start:stop] = initial_capital * np.exp(
+                log_returns.sum(axis=1, dtype=np.float32)
+            )
+
+
+def _rolling_sharpe(returns: np.ndarray, window: int, periods_per_year: int) -> np.ndarray:
+    """
+    滚动夏普比率（样本标准差），返回长度为 len(returns) - window + 1 的数组
+
+    利用前缀和在 O(1) 内得到每个窗口的和与平方和；先减去整体均值再累加以减小相消误差，
+    方差相对二阶矩可忽略（窗口内收益近似恒定）时比率记为0
+    """
+    center = returns.mean()
+    shifted = returns - center
+    c1 = np.concatenate(([0.0], np.cumsum(shifted)))
+    c2 = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+    sum_w = c1[window:] - c1[:-window]
+    sumsq_w = c2[window:] - c2[:-window]
+
+    mean = sum_w / window
+    var = (sumsq_w - sum_w * mean) / (window - 1)
+    valid = var > np.finfo(np.float64).eps * (sumsq_w / window)
+    std = np.sqrt(np.where(valid, var, 1.0))
+    return np.where(valid, (mean + center) / std * np.sqrt(periods_per_year), 0.0)
+
+
+def _trade_log_columns(positions: np.ndarray, prices: np.ndarray, commission: float,
+                       thresh: float = _TRADE_THRESHOLD):
+    """
+    交易记录的列数组，返回值与 _trade_log_kernel 相同
+
+    numba 不可用时 _trade_log_kernel 会退化为逐元素的 Python 循环，此时改用 np.nonzero 一次
+    取出全部超过阈值的持仓变动；在转置后的数组上取下标，保持按品种、日期的顺序
+    """
+    if NUMBA_AVAILABLE:
+        return _trade_log_kernel(positions, prices, commission, thresh)
+
+    changes = np.diff(positions, axis=0)
+    symbol_idx, row_idx = np.nonzero(np.abs(changes.T) > thresh)
+    date_idx = row_idx + 1
+    change = changes[row_idx, symbol_idx]
+    price = prices[date_idx, symbol_idx]
+    value = np.abs(change) * price
+    return date_idx, symbol_idx, change, price, value, value * commission
+
+
 @dataclass
 class PerformanceMetrics:
     """性能指标"""
@@ -58,9 +268,36 @@ class StrategyOptimization:
 class AnalyticsEngine:
     """数据分析引擎"""
 
-    def __init__(self):
+    def __init__(self, precision: str = 'float64', seed: Optional[int] = None):
         self.risk_free_rate = 0.02  # 无风险利率 2%
         self.trading_days_per_year = 365
+        # 蒙特卡洛模拟使用的随机数生成器（PCG64），传入 seed 可复现模拟结果
+        self._rng = np.random.default_rng(seed)
+        # 回测数值计算精度：float32 内存带宽减半，适合资产数量很多的回测
+        if precision not in ('float32', 'float64'):
+            raise ValueError(f"不支持的计算精度: {precision}")
+        self.dtype = np.dtype(precision)
+        # 最近一次预处理的价格数据：(缓存键, 价格索引对象, (收益率数组, 索引, 列))
+        self._prepared: Optional[Tuple[pd.DataFrame, tuple, Tuple[np.ndarray, pd.Index, pd.Index]]] = None
+
+    def _prepare(self, price_data: pd.DataFrame) -> Tuple[np.ndarray, pd.Index, pd.Index]:
+        """
+        计算并缓存价格数据的收益率数组，返回 (收益率, 索引, 列)
+
+        缓存持有上次的 DataFrame 本身，只有传入同一个对象且其形状、索引与列对象未被替换、
+        计算精度不变时才复用结果；原地修改价格数值不会使缓存失效，需传入新的 DataFrame
+        """
+        key = (price_data.shape, self.dtype)
+        cached = self._prepared
+        if (cached is not None and cached[0] is price_data and cached[1] == key
+                and cached[2][1] is price_data.index and cached[2][2] is price_data.columns):
+            return cached[2]
+
+        returns = _asset_returns(price_data.to_numpy(dtype=self.dtype))
+        returns.flags.writeable = False
+        prepared = (returns, price_data.index, price_data.columns)
+        self._prepared = (price_data, key, prepared)
+        return prepared
 
     def calculate_performance_metrics(
         self,
@@ -72,42 +309,52 @@ class AnalyticsEngine:
             if len(returns) == 0:
                 return PerformanceMetrics()
 
-            # 基础指标
-            total_return = (1 + returns).prod() - 1
-            annualized_return = (1 + total_return) ** (self.trading_days_per_year / len(returns)) - 1
-            volatility = returns.std() * np.sqrt(self.trading_days_per_year)
+            # 与 pandas 的统计一致，跳过缺失的收益率
+            r = returns.to_numpy(dtype=np.float64)
+            r = r[~np.isnan(r)]
+            if r.shape[0] == 0:
+                return PerformanceMetrics()
 
-            # 夏普比率
-            excess_returns = returns - self.risk_free_rate / self.trading_days_per_year
-            sharpe_ratio = excess_returns.mean() / returns.std() * np.sqrt(self.trading_days_per_year) if returns.std() > 0 else 0
+            n = r.shape[0]
+            periods = self.trading_days_per_year
+            cum, mean, m2, max_drawdown, pos_n, pos_sum, neg_n, neg_mean, neg_m2 = _metrics_kernel(r)
 
-            # 最大回撤
-            cumulative_returns = (1 + returns).cumprod()
-            running_max = cumulative_returns.expanding().max()
-            drawdown = (cumulative_returns - running_max) / running_max
-            max_drawdown = drawdown.min()
+            # 基础指标
+            total_return = cum - 1
+            # 内核返回 Python float，负数的分数次幂会得到复数；转为 float64 使累计亏损超过 100% 时年化收益为 NaN
+            with np.errstate(invalid='ignore'):
+                annualized_return = np.float64(cum) ** (periods / n) - 1
+            std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+            volatility = std * np.sqrt(periods)
 
             # 胜率
-            win_rate = (returns > 0).mean()
-
-            # 盈亏比
-            winning_returns = returns[returns > 0]
-            losing_returns = returns[returns < 0]
-            avg_win = winning_returns.mean() if len(winning_returns) > 0 else 0
-            avg_loss = abs(losing_returns.mean()) if len(losing_returns) > 0 else 1
-            profit_factor = avg_win / avg_loss if avg_loss > 0 else 0
-
-            # 卡尔玛比率
-            calmar_ratio = annualized_return / abs(max_drawdown) if max_drawdown != 0 else 0
-
-            # 索提诺比率
-            downside_returns = returns[returns < 0]
-            downside_deviation = downside_returns.std() * np.sqrt(self.trading_days_per_year) if len(downside_returns) > 0 else 0
-            sortino_ratio = (annualized_return - self.risk_free_rate) / downside_deviation if downside_deviation > 0 else 0
+            win_rate = pos_n / n
+
+            # 盈亏比：无盈利/无亏损时内核累计量为 0，用 max 与布尔加法代替分支
+            avg_win = pos_sum / max(pos_n, 1)
+            avg_loss = abs(neg_mean) + (neg_n == 0)
+
+            # 索提诺比率的下行标准差至少需要两笔亏损，否则 neg_m2 为 0
+            downside_deviation = np.sqrt(neg_m2 / max(neg_n - 1, 1) * periods)
+
+            # 夏普/盈亏比/卡尔玛/索提诺一次性向量化相除，分母非正（或为 NaN）时记为 0
+            numerators = np.array([
+                (mean - self.risk_free_rate / periods) * np.sqrt(periods),
+                avg_win,
+                annualized_return,
+                annualized_return - self.risk_free_rate,
+            ])
+            denominators = np.array([std, avg_loss, abs(max_drawdown), downside_deviation])
+            sharpe_ratio, profit_factor, calmar_ratio, sortino_ratio = np.divide(
+                numerators, denominators, out=np.zeros(4), where=denominators > 0
+            )
 
-            # VaR和CVaR (95%置信度)
-            var_95 = np.percentile(returns, 5)
-            cvar_95 = returns[returns <= var_95].mean() if len(returns[returns <= var_95]) > 0 else var_95
+            # VaR和CVaR (95%置信度)：VaR 取第 k 小的收益（经验分位数），CVaR 为最小 k 个收益的均值，
+            # 部分选择 O(N) 即可同时得到两者
+            k = max(1, int(0.05 * n))
+            tail = np.partition(r, k - 1)[:k]
+            var_95 = tail[k - 1]
+            cvar_95 = tail.mean()
 
             return PerformanceMetrics(
                 total_return=total_return,
@@ -140,33 +387,43 @@ class AnalyticsEngine:
             if price_data.empty or signals.empty:
                 raise ValueError("价格数据或信号数据为空")
 
-            # 确保数据对齐
-            common_index = price_data.index.intersection(signals.index)
-            price_data = price_data.loc[common_index]
-            signals = signals.loc[common_index]
-
-            # 计算收益率
-            returns = price_data.pct_change().fillna(0)
-
-            # 生成交易信号
-            positions = signals.shift(1).fillna(0)  # 信号延迟一期执行
-
-            # 计算策略收益
-            strategy_returns = (returns * positions).sum(axis=1)
-
-            # 扣除交易成本
-            position_changes = positions.diff().abs().sum(axis=1)
-            transaction_costs = position_changes * commission_rate
-            strategy_returns -= transaction_costs
-
-            # 计算权益曲线
-            equity_curve = initial_capital * (1 + strategy_returns).cumprod()
+            if signals.index.equals(price_data.index) and signals.columns.equals(price_data.columns):
+                # 已对齐：直接复用缓存的收益率
+                common_index = price_data.index
+                ret_arr = self._prepare(price_data)[0]
+            else:
+                # 确保数据对齐
+                common_index = price_data.index.intersection(signals.index)
+                price_data = price_data.loc[common_index]
+                signals = signals.loc[common_index]
+
+                # 计算收益率（按信号的列对齐，缺少价格的品种收益为0）
+                price_arr = price_data.reindex(columns=signals.columns).to_numpy(dtype=self.dtype)
+                ret_arr = _asset_returns(price_arr)
+
+            # 生成交易信号：信号延迟一期执行
+            sig_arr = signals.to_numpy(dtype=self.dtype)
+            pos_arr = np.zeros_like(sig_arr)
+            pos_arr[1:] = sig_arr[:-1]
+            pos_arr[np.isnan(pos_arr)] = 0
+
+            # 计算扣除交易成本后的策略收益
+            strat_ret = _strategy_returns(pos_arr, ret_arr, commission_rate)
+            strategy_returns = pd.Series(strat_ret, index=common_index)
+
+            # 计算权益曲线：对数空间累加，单期亏损超过100%（对数无定义）时退回连乘
+            if (strat_ret > -1).all():
+                equity_np = initial_capital * np.exp(np.cumsum(np.log1p(strat_ret)))
+            else:
+                equity_np = initial_capital * np.cumprod(1 + strat_ret)
+            equity_curve = pd.Series(equity_np, index=common_index)
 
             # 计算回撤
-            running_max = equity_curve.expanding().max()
-            drawdown_series = (equity_curve - running_max) / running_max
+            running_max = np.maximum.accumulate(equity_np)
+            drawdown_series = pd.Series(equity_np / running_max - 1.0, index=common_index)
 
             # 生成交易记录
+            positions = pd.DataFrame(pos_arr, index=common_index, columns=signals.columns)
             trade_log = self._generate_trade_log(positions, price_data, commission_rate)
 
             # 计算性能指标
@@ -208,27 +465,35 @@ class AnalyticsEngine:
     ) -> pd.DataFrame:
         """生成交易记录"""
         try:
-            trades = []
-
-            for symbol in positions.columns:
-                position_changes = positions[symbol].diff()
-
-                for date, change in position_changes.items():
-                    if abs(change) > 0.001:  # 忽略微小变化
-                        price = price_data.loc[date, symbol] if symbol in price_data.columns else 0
-                        commission = abs(change) * price * commission_rate
-
-                        trades.append({
-                            'date': date,
-                            'symbol': symbol,
-                            'action': 'BUY' if change > 0 else 'SELL',
-                            'quantity': abs(change),
-                            'price': price,
-                            'value': abs(change) * price,
-                            'commission': commission
-                        })
+            # 价格按持仓列对齐，缺少价格的品种按0计；已对齐时直接取底层数组，省去一次 reindex 拷贝
+            if price_data.index.equals(positions.index) and price_data.columns.equals(positions.columns):
+                prices = price_data
+            else:
+                prices = price_data.reindex(index=positions.index, columns=positions.columns, fill_value=0)
+            date_idx, symbol_idx, change, price, value, commission = _trade_log_columns(
+                np.ascontiguousarray(positions.to_numpy(dtype=np.float64)),
+                np.ascontiguousarray(prices.to_numpy(dtype=np.float64)),
+                commission_rate
+            )
 
-            return pd.DataFrame(trades)
+            # 品种与方向用分类列保存，数值列使用引擎的计算精度
+            columns = positions.columns
+            if columns.is_unique:
+                symbols = pd.Categorical.from_codes(symbol_idx, categories=columns)
+            else:
+                symbols = pd.Categorical(columns[symbol_idx])
+            actions = pd.Categorical.from_codes((change <= 0).astype(np.int8), categories=['BUY', 'SELL'])
+            dtype = self.dtype
+
+            return pd.DataFrame({
+                'date': positions.index[date_idx],
+                'symbol': symbols,
+                'action': actions,
+                'quantity': np.abs(change).astype(dtype, copy=False),
+                'price': price.astype(dtype, copy=False),
+                'value': value.astype(dtype, copy=False),
+                'commission': commission.astype(dtype, copy=False)
+            })
 
         except Exception as e:
             logger.error(f"交易记录生成失败: {e}")
@@ -240,51 +505,87 @@ class AnalyticsEngine:
         price_data: pd.DataFrame,
         parameter_ranges: Dict[str, List],
         optimization_metric: str = 'sharpe_ratio',
-        initial_capital: float = 100000
+        initial_capital: float = 100000,
+        commission_rate: float = 0.001,
+        n_jobs: int = 1,
+        backend: str = 'process'
     ) -> List[StrategyOptimization]:
-        """优化策略参数"""
+        """
+        优化策略参数
+
+        同一参数的各取值先生成信号并堆叠为 (取值数, T, 资产数) 的张量，由 _run_backtest_batch
+        一次完成全部回测；信号的索引或列与价格数据不一致的取值退回逐个 run_backtest
+
+        n_jobs 不为1时各取值的策略信号并行生成（-1 表示使用全部CPU）：backend='process' 使用进程池，
+        此时 strategy_func 必须可被 pickle（模块级函数）；backend='thread' 使用线程池，无进程启动与
+        序列化开销，适合释放 GIL 的 NumPy/numba 策略
+        """
         try:
             optimization_results = []
+            returns = self._prepare(price_data)[0]
+            n_days, n_assets = returns.shape
 
             for param_name, param_values in parameter_ranges.items():
-                results = []
-
-                for value in param_values:
-                    try:
-                        # 运行策略
-                        signals = strategy_func(price_data, **{param_name: value})
-
-                        # 运行回测
-                        backtest_result = self.run_backtest(
+                signals_batch = np.empty((len(param_values), n_days, n_assets), dtype=self.dtype)
+                # (参数取值, 批量张量中的行号, 需逐个回测时的信号)
+                entries = []
+                n_batched = 0
+
+                for value, signals in self._generate_sweep_signals(
+                    strategy_func, price_data, param_name, param_values, n_jobs, backend
+                ):
+                    if signals.index.equals(price_data.index) and signals.columns.equals(price_data.columns):
+                        signals_batch[n_batched] = signals.fillna(0).to_numpy()
+                        entries.append((value, n_batched, None))
+                        n_batched += 1
+                    else:
+                        entries.append((value, None, signals))
+
+                strategy_returns = _run_backtest_batch(returns, signals_batch[:n_batched], commission_rate)
+
+                # 结果按取值顺序写入预分配的数组
+                n_values = len(entries)
+                values = [value for value, _, _ in entries]
+                metric_values = np.empty(n_values, dtype=np.float64)
+                total_returns = np.empty(n_values, dtype=np.float64)
+                max_drawdowns = np.empty(n_values, dtype=np.float64)
+                win_rates = np.empty(n_values, dtype=np.float64)
+
+                for i, (value, row, signals) in enumerate(entries):
+                    if row is not None:
+                        metrics = self.calculate_performance_metrics(
+                            pd.Series(strategy_returns[row], index=price_data.index)
+                        )
+                    else:
+                        metrics = self.run_backtest(
                             f"Strategy_{param_name}_{value}",
                             price_data,
                             signals,
-                            initial_capital
-                        )
-
-                        # 获取优化指标
-                        metric_value = getattr(backtest_result.performance_metrics, optimization_metric, 0)
-
-                        results.append({
-                            'parameter_value': value,
-                            'metric_value': metric_value,
-                            'total_return': backtest_result.performance_metrics.total_return,
-                            'max_drawdown': backtest_result.performance_metrics.max_drawdown,
-                            'win_rate': backtest_result.performance_metrics.win_rate
-                        })
-
-                    except Exception as e:
-                        logger.error(f"参数优化失败 {param_name}={value}: {e}")
-                        continue
-
-                if results:
-                    results_df = pd.DataFrame(results)
-                    best_result = results_df.loc[results_df['metric_value'].idxmax()]
+                            initial_capital,
+                            commission_rate
+                        ).performance_metrics
+
+                    # 获取优化指标
+                    metric_values[i] = getattr(metrics, optimization_metric, 0)
+                    total_returns[i] = metrics.total_return
+                    max_drawdowns[i] = metrics.max_drawdown
+                    win_rates[i] = metrics.win_rate
+
+                if n_values:
+                    results_df = pd.DataFrame({
+                        'parameter_value': values,
+                        'metric_value': metric_values,
+                        'total_return': total_returns,
+                        'max_drawdown': max_drawdowns,
+                        'win_rate': win_rates
+                    })
+                    # 与 idxmax 一致跳过 NaN 指标
+                    best = int(np.nanargmax(metric_values))
 
                     optimization_results.append(StrategyOptimization(
                         parameter_name=param_name,
-                        optimal_value=best_result['parameter_value'],
-                        performance_score=best_result['metric_value'],
+                        optimal_value=values[best],
+                        performance_score=metric_values[best],
                         optimization_results=results_df
                     ))
 
@@ -294,6 +595,56 @@ class AnalyticsEngine:
             logger.error(f"策略参数优化失败: {e}")
             return []
 
+    def _generate_sweep_signals(
+        self,
+        strategy_func: Callable,
+        price_data: pd.DataFrame,
+        param_name: str,
+        param_values: List,
+        n_jobs: int,
+        backend: str = 'process'
+    ) -> List[Tuple[Any, pd.DataFrame]]:
+        """按参数取值顺序生成策略信号，返回 (取值, 信号) 列表；生成失败的取值记录日志后跳过"""
+        if backend not in ('process', 'thread'):
+            raise ValueError(f"不支持的并行方式: {backend}")
+
+        if n_jobs == 1 or len(param_values) < 2:
+            futures = None
+        else:
+            max_workers = min(os.cpu_count() if n_jobs == -1 else n_jobs, len(param_values))
+            if backend == 'thread':
+                executor = ThreadPoolExecutor(max_workers=max_workers)
+                futures = [
+                    executor.submit(strategy_func, price_data, **{param_name: value})
+                    for value in param_values
+                ]
+            else:
+                executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_sweep_worker,
+                    initargs=(strategy_func, price_data)
+                )
+                futures = [executor.submit(_sweep_signals, param_name, value) for value in param_values]
+
+        generated = []
+        try:
+            for i, value in enumerate(param_values):
+                try:
+                    # 运行策略
+                    if futures is None:
+                        signals = strategy_func(price_data, **{param_name: value})
+                    else:
+                        signals = futures[i].result()
+                except Exception as e:
+                    logger.error(f"参数优化失败 {param_name}={value}: {e}")
+                    continue
+                generated.append((value, signals))
+        finally:
+            if futures is not None:
+                executor.shutdown(cancel_futures=True)
+
+        return generated
+
     def analyze_correlation_matrix(self, returns_data: pd.DataFrame) -> pd.DataFrame:
         """分析相关性矩阵"""
         try:
@@ -336,21 +687,46 @@ class AnalyticsEngine:
         returns: pd.Series,
         initial_capital: float = 100000,
         days: int = 252,
-        simulations: int = 1000
+        simulations: int = 1000,
+        return_curves: bool = False,
+        n_jobs: int = 1
     ) -> Dict[str, Any]:
-        """蒙特卡洛模拟"""
+        """
+        蒙特卡洛模拟
+
+        随机收益以 float32 分块生成，最终价值由对数收益求和得到，不生成中间的权益曲线；
+        return_curves 为 True 时才返回 (simulations, days) 的权益曲线，否则 equity_curves 为 None
+
+        n_jobs 不为1时模拟路径分段在线程池中并行生成（-1 表示使用全部CPU），各段使用派生的
+        子生成器，因此同一种子下的结果与单线程不同，但在相同 n_jobs 下可复现
+        """
         try:
             mean_return = returns.mean()
             std_return = returns.std()
+            rng = self._rng
 
-            # 生成随机收益率
-            random_returns = np.random.normal(mean_return, std_return, (simulations, days))
-
-            # 计算权益曲线
-            equity_curves = initial_capital * np.cumprod(1 + random_returns, axis=1)
+            final_values = np.empty(simulations, dtype=np.float64)
+            equity_curves = np.empty((simulations, days), dtype=np.float32) if return_curves else None
 
-            # 最终价值分布
-            final_values = equity_curves[:, -1]
+            if n_jobs == 1 or simulations < 2 * _MONTE_CARLO_CHUNK:
+                _monte_carlo_block(rng, days, mean_return, std_return, initial_capital,
+                                   final_values, equity_curves)
+            else:
+                # 模拟路径按连续区间分给各线程，每个线程使用由引擎生成器派生的独立子生成器
+                max_workers = os.cpu_count() if n_jobs == -1 else n_jobs
+                n_blocks = min(max_workers, simulations // _MONTE_CARLO_CHUNK)
+                bounds = np.linspace(0, simulations, n_blocks + 1).astype(int)
+                with ThreadPoolExecutor(max_workers=n_blocks) as executor:
+                    futures = [
+                        executor.submit(
+                            _monte_carlo_block, child, days, mean_return, std_return, initial_capital,
+                            final_values[lo:hi],
+                            equity_curves[lo:hi] if return_curves else None
+                        )
+                        for child, lo, hi in zip(rng.spawn(n_blocks), bounds[:-1], bounds[1:])
+                    ]
+                    for future in futures:
+                        future.result()
 
             # 统计结果
             percentiles = np.percentile(final_values, [5, 25, 50, 75, 95])
@@ -373,8 +749,10 @@ class AnalyticsEngine:
             logger.error(f"蒙特卡洛模拟失败: {e}")
             return {}
 
-    def create_performance_dashboard(self, backtest_result: BacktestResult) -> Dict[str, go.Figure]:
+    def create_performance_dashboard(self, backtest_result: BacktestResult) -> Dict[str, 'go.Figure']:
         """创建性能仪表盘"""
+        import plotly.graph_objects as go
+
         try:
             figures = {}
 
@@ -413,11 +791,14 @@ class AnalyticsEngine:
             )
             figures['drawdown'] = fig_drawdown
 
-            # 收益率分布
+            # 收益率分布：在本地分箱，只向图表传递 50 个柱子而非全部样本
+            daily_pct = backtest_result.daily_returns.to_numpy(dtype=np.float64) * 100
+            counts, edges = np.histogram(daily_pct[np.isfinite(daily_pct)], bins=50)
             fig_returns = go.Figure()
-            fig_returns.add_trace(go.Histogram(
-                x=backtest_result.daily_returns * 100,
-                nbinsx=50,
+            fig_returns.add_trace(go.Bar(
+                x=0.5 * (edges[:-1] + edges[1:]),
+                y=counts,
+                width=np.diff(edges),
                 name='日收益率分布',
                 opacity=0.7
             ))
@@ -430,9 +811,12 @@ class AnalyticsEngine:
             figures['returns_distribution'] = fig_returns
 
             # 滚动夏普比率
-            if len(backtest_result.daily_returns) > 30:
-                rolling_sharpe = backtest_result.daily_returns.rolling(30).apply(
-                    lambda x: x.mean() / x.std() * np.sqrt(self.trading_days_per_year) if x.std() > 0 else 0
+            window = 30
+            if len(backtest_result.daily_returns) > window:
+                daily_returns = backtest_result.daily_returns
+                rolling_sharpe = pd.Series(
+                    _rolling_sharpe(daily_returns.to_numpy(dtype=np.float64), window, self.trading_days_per_year),
+                    index=daily_returns.index[window - 1:]
                 )
 
                 fig_sharpe = go.Figure()
@@ -4,14 +4,33 @@
 """
 
 import asyncio
+import json
+import math
+import time
 import aiohttp
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import logging
+from collections import Counter
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 行情响应体的JSON解析函数，orjson 可用时优先使用
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# 行情类型对应的日志名称
+_KIND_LABELS = {'spot': '现货价格', 'futures': '期货价格', 'funding': '资金费率'}
+
+# 风险等级，按 calculate_arbitrage_opportunities_batch 中的风险索引排列
+_RISK_LEVELS = ("低", "中", "高", "极高")
+
 @dataclass
 class ArbitrageOpportunity:
     """套利机会数据结构"""
@@ -52,6 +71,30 @@ class ArbitrageAnalyzer:
             }
         }
 
+        # 各交易所行情接口：类型 -> (API地址键, 路径模板, 成功状态(字段, 值), 数值在响应中的路径)
+        # 路径模板中 {symbol} 为原始交易对，{swap_symbol} 为OKX永续合约格式（BTC-USDT-SWAP）
+        self.endpoints = {
+            'binance': {
+                'spot': ('spot_api', '/ticker/price?symbol={symbol}', None, ('price',)),
+                'futures': ('futures_api', '/ticker/price?symbol={symbol}', None, ('price',)),
+                'funding': ('futures_api', '/premiumIndex?symbol={symbol}', None, ('lastFundingRate',))
+            },
+            'okx': {
+                'spot': ('spot_api', '/market/ticker?instId={symbol}', ('code', '0'), ('data', 0, 'last')),
+                'futures': ('futures_api', '/market/ticker?instId={swap_symbol}', ('code', '0'), ('data', 0, 'last')),
+                'funding': ('futures_api', '/public/funding-rate?instId={swap_symbol}', ('code', '0'),
+                            ('data', 0, 'fundingRate'))
+            },
+            'bybit': {
+                'spot': ('spot_api', '/market/tickers?category=spot&symbol={symbol}', ('retCode', 0),
+                         ('result', 'list', 0, 'lastPrice')),
+                'futures': ('futures_api', '/market/tickers?category=linear&symbol={symbol}', ('retCode', 0),
+                            ('result', 'list', 0, 'lastPrice')),
+                'funding': ('futures_api', '/market/funding/history?category=linear&symbol={symbol}&limit=1',
+                            ('retCode', 0), ('result', 'list', 0, 'fundingRate'))
+            }
+        }
+
         # 主要交易对
         self.major_symbols = [
             'BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'ADAUSDT', 'SOLUSDT',
@@ -66,168 +109,248 @@ class ArbitrageAnalyzer:
             'max_funding_rate': 0.1  # 最大资金费率
         }
 
-    async def get_spot_price(self, exchange: str, symbol: str) -> Optional[float]:
-        """获取现货价格"""
+        # 每个交易所同时进行的扫描数，代替逐个请求之间的固定延迟来控制API频率
+        self.max_concurrent_requests = 5
+
+        # 资金费率每8小时结算一次，成功获取的费率缓存若干秒：(交易所, 交易对) -> (费率, 过期时间)
+        self.funding_rate_ttl = 300
+        self._funding_cache: Dict[Tuple[str, str], Tuple[float, float]] = {}
+
+        # 当前事件循环中正在使用的HTTP会话 [会话, 事件循环, 使用者数]，最后一个使用者结束时关闭
+        self._session_state: Optional[list] = None
+        # 与事件循环绑定的状态：各交易所的并发信号量与进行中的行情请求
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+    def _new_session(self) -> aiohttp.ClientSession:
+        """创建带连接池的HTTP会话"""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=64, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=60
+            ),
+            timeout=aiohttp.ClientTimeout(total=5)
+        )
+
+    @asynccontextmanager
+    async def _session_scope(self):
+        """
+        在作用域内复用同一个HTTP会话，连接池在各交易所请求间共享
+
+        同一事件循环中嵌套或并发的作用域共享会话，最后一个作用域退出时关闭会话；
+        因此每次 asyncio.run 调用结束时不会遗留绑定已关闭事件循环的会话
+        """
+        loop = asyncio.get_running_loop()
+        state = self._session_state
+        if state is None or state[1] is not loop:
+            state = self._session_state = [self._new_session(), loop, 0]
+
+        state[2] += 1
+        try:
+            yield state[0]
+        finally:
+            state[2] -= 1
+            if state[2] == 0:
+                if self._session_state is state:
+                    self._session_state = None
+                await state[0].close()
+
+    def _bind_loop(self):
+        """事件循环切换时重置与旧循环绑定的信号量和进行中请求"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphores = {}
+            self._inflight = {}
+            self._loop = loop
+
+    def _exchange_semaphore(self, exchange: str) -> asyncio.Semaphore:
+        """获取当前事件循环下限制单个交易所并发数的信号量"""
+        self._bind_loop()
+        semaphore = self._semaphores.get(exchange)
+        if semaphore is None:
+            semaphore = self._semaphores[exchange] = asyncio.Semaphore(self.max_concurrent_requests)
+        return semaphore
+
+    async def _get_json(self, url: str) -> Optional[Dict]:
+        """GET 请求并解析JSON响应体，非200响应返回 None"""
+        async with self._session_scope() as session:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    return None
+                return _json_loads(await response.read())
+
+    async def close(self):
+        """关闭当前的HTTP会话（会话通常随扫描结束自动关闭）"""
+        state = self._session_state
+        self._session_state = None
+        if state is not None and not state[0].closed:
+            await state[0].close()
+
+    async def _fetch(self, exchange: str, kind: str, symbol: str) -> Optional[float]:
+        """
+        获取行情数值，并发的相同 (交易所, 类型, 交易对) 请求共享同一个进行中的任务
+
+        任务完成后即从进行中表移除，之后的调用重新请求；单个调用方被取消不会取消共享任务
+        """
+        self._bind_loop()
+        key = (exchange, kind, symbol)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._do_fetch(exchange, kind, symbol))
+            self._inflight[key] = task
+
+            def forget(done: asyncio.Future):
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+
+            task.add_done_callback(forget)
+        return await asyncio.shield(task)
+
+    async def _do_fetch(self, exchange: str, kind: str, symbol: str) -> Optional[float]:
+        """按行情接口表获取数值；不支持的交易所、非200响应、状态码错误或列表为空时返回 None"""
         try:
-            if exchange == 'binance':
-                url = f"{self.exchanges[exchange]['spot_api']}/ticker/price?symbol={symbol}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            return float(data['price'])
-
-            elif exchange == 'okx':
-                url = f"{self.exchanges[exchange]['spot_api']}/market/ticker?instId={symbol}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if data['code'] == '0' and data['data']:
-                                return float(data['data'][0]['last'])
-
-            elif exchange == 'bybit':
-                url = f"{self.exchanges[exchange]['spot_api']}/market/tickers?category=spot&symbol={symbol}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if data['retCode'] == 0 and data['result']['list']:
-                                return float(data['result']['list'][0]['lastPrice'])
+            endpoint = self.endpoints.get(exchange, {}).get(kind)
+            if endpoint is None:
+                return None
 
-            return None
+            api, path, status, value_path = endpoint
+            url = self.exchanges[exchange][api] + path.format(
+                symbol=symbol, swap_symbol=symbol.replace('USDT', '-USDT-SWAP')
+            )
+            data = await self._get_json(url)
+            if data is None or (status is not None and data[status[0]] != status[1]):
+                return None
+
+            value = data
+            for key in value_path:
+                if isinstance(key, int) and len(value) <= key:
+                    return None
+                value = value[key]
+            return float(value)
 
         except Exception as e:
-            self.logger.error(f"获取{exchange}现货价格失败: {e}")
+            self.logger.error(f"获取{exchange}{_KIND_LABELS[kind]}失败: {e}")
             return None
 
+    async def get_spot_price(self, exchange: str, symbol: str) -> Optional[float]:
+        """获取现货价格"""
+        return await self._fetch(exchange, 'spot', symbol)
+
     async def get_futures_price(self, exchange: str, symbol: str) -> Optional[float]:
         """获取期货价格"""
-        try:
-            if exchange == 'binance':
-                url = f"{self.exchanges[exchange]['futures_api']}/ticker/price?symbol={symbol}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            return float(data['price'])
-
-            elif exchange == 'okx':
-                # OKX期货合约格式不同
-                futures_symbol = symbol.replace('USDT', '-USDT-SWAP')
-                url = f"{self.exchanges[exchange]['futures_api']}/market/ticker?instId={futures_symbol}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if data['code'] == '0' and data['data']:
-                                return float(data['data'][0]['last'])
-
-            elif exchange == 'bybit':
-                url = f"{self.exchanges[exchange]['futures_api']}/market/tickers?category=linear&symbol={symbol}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if data['retCode'] == 0 and data['result']['list']:
-                                return float(data['result']['list'][0]['lastPrice'])
-
-            return None
-
-        except Exception as e:
-            self.logger.error(f"获取{exchange}期货价格失败: {e}")
-            return None
+        return await self._fetch(exchange, 'futures', symbol)
 
     async def get_funding_rate(self, exchange: str, symbol: str) -> Optional[float]:
-        """获取资金费率"""
-        try:
-            if exchange == 'binance':
-                url = f"{self.exchanges[exchange]['futures_api']}/premiumIndex?symbol={symbol}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            return float(data['lastFundingRate'])
-
-            elif exchange == 'okx':
-                futures_symbol = symbol.replace('USDT', '-USDT-SWAP')
-                url = f"{self.exchanges[exchange]['futures_api']}/public/funding-rate?instId={futures_symbol}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if data['code'] == '0' and data['data']:
-                                return float(data['data'][0]['fundingRate'])
-
-            elif exchange == 'bybit':
-                url = f"{self.exchanges[exchange]['futures_api']}/market/funding/history?category=linear&symbol={symbol}&limit=1"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if data['retCode'] == 0 and data['result']['list']:
-                                return float(data['result']['list'][0]['fundingRate'])
-
+        """获取资金费率，获取失败时按0计；成功结果在 funding_rate_ttl 秒内直接复用"""
+        key = (exchange, symbol)
+        cached = self._funding_cache.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
+        funding_rate = await self._fetch(exchange, 'funding', symbol)
+        if funding_rate is None:
             return 0.0
 
-        except Exception as e:
-            self.logger.error(f"获取{exchange}资金费率失败: {e}")
-            return 0.0
+        self._funding_cache[key] = (funding_rate, time.monotonic() + self.funding_rate_ttl)
+        return funding_rate
 
     def calculate_arbitrage_opportunity(self, spot_price: float, futures_price: float,
                                       funding_rate: float, symbol: str,
                                       exchange_spot: str, exchange_futures: str) -> Optional[ArbitrageOpportunity]:
         """计算套利机会"""
+        opportunities = self.calculate_arbitrage_opportunities_batch(
+            np.array([spot_price], dtype=np.float64),
+            np.array([futures_price], dtype=np.float64),
+            np.array([funding_rate], dtype=np.float64),
+            [symbol], [exchange_spot], [exchange_futures]
+        )
+        return opportunities[0] if opportunities else None
+
+    def calculate_arbitrage_opportunities_batch(self, spot_prices: np.ndarray, futures_prices: np.ndarray,
+                                                funding_rates: np.ndarray, symbols: Sequence[str],
+                                                exchanges_spot: Sequence[str],
+                                                exchanges_futures: Sequence[str]) -> List[ArbitrageOpportunity]:
+        """
+        批量计算套利机会
+
+        价差、预期收益与风险等级按列向量化计算，只为满足最小价差阈值的行构建 ArbitrageOpportunity；
+        现货价格为0或结果非有限值的行视为无效
+        """
         try:
             # 计算价差
-            spread = futures_price - spot_price
-            spread_percentage = (spread / spot_price) * 100
-
-            # 计算预期收益（考虑资金费率）
-            # 正向套利：买现货，卖期货
-            # 反向套利：卖现货，买期货
-            if spread > 0:
-                # 正向套利机会
-                expected_return = spread_percentage - (funding_rate * 100 * 8)  # 8小时资金费率
-                risk_level = self._assess_risk_level(spread_percentage, funding_rate)
-            else:
-                # 反向套利机会
-                expected_return = abs(spread_percentage) + (funding_rate * 100 * 8)
-                risk_level = self._assess_risk_level(abs(spread_percentage), funding_rate)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                spread = futures_prices - spot_prices
+                spread_percentage = (spread / spot_prices) * 100
+            abs_spread_percentage = np.abs(spread_percentage)
+
+            # 计算预期收益（考虑资金费率，8小时资金费率）
+            # 正向套利（价差为正）：买现货，卖期货；反向套利：卖现货，买期货
+            funding_cost = funding_rates * 100 * 8
+            expected_return = np.where(spread > 0, spread_percentage - funding_cost,
+                                       abs_spread_percentage + funding_cost)
+
+            # 风险等级索引：0 低 / 1 中 / 2 高 / 3 极高（超过最大价差阈值）
+            abs_funding_rate = np.abs(funding_rates)
+            risk_index = np.where(
+                (abs_spread_percentage > 5.0) | (abs_funding_rate > 0.05), 2,
+                np.where((abs_spread_percentage > 2.0) | (abs_funding_rate > 0.02), 1, 0)
+            )
+            risk_index[abs_spread_percentage > self.thresholds['max_spread']] = 3
 
             # 检查是否满足套利阈值
-            if abs(spread_percentage) < self.thresholds['min_spread']:
-                return None
-
-            if abs(spread_percentage) > self.thresholds['max_spread']:
-                risk_level = "极高"
-
-            return ArbitrageOpportunity(
-                symbol=symbol,
-                spot_price=spot_price,
-                futures_price=futures_price,
-                spread=spread,
-                spread_percentage=spread_percentage,
-                funding_rate=funding_rate,
-                expected_return=expected_return,
-                risk_level=risk_level,
-                exchange_spot=exchange_spot,
-                exchange_futures=exchange_futures,
-                timestamp=datetime.now()
+            rows = np.flatnonzero(
+                np.isfinite(expected_return) & (abs_spread_percentage >= self.thresholds['min_spread'])
             )
+            if rows.size == 0:
+                return []
+
+            timestamp = datetime.now()
+            return [
+                ArbitrageOpportunity(
+                    symbol=symbols[i],
+                    spot_price=spot,
+                    futures_price=futures,
+                    spread=spread_value,
+                    spread_percentage=percentage,
+                    funding_rate=rate,
+                    expected_return=expected,
+                    risk_level=_RISK_LEVELS[risk],
+                    exchange_spot=exchanges_spot[i],
+                    exchange_futures=exchanges_futures[i],
+                    timestamp=timestamp
+                )
+                for i, spot, futures, spread_value, percentage, rate, expected, risk in zip(
+                    rows.tolist(), spot_prices[rows].tolist(), futures_prices[rows].tolist(),
+                    spread[rows].tolist(), spread_percentage[rows].tolist(), funding_rates[rows].tolist(),
+                    expected_return[rows].tolist(), risk_index[rows].tolist()
+                )
+            ]
 
         except Exception as e:
             self.logger.error(f"计算套利机会失败: {e}")
-            return None
-
-    def _assess_risk_level(self, spread_percentage: float, funding_rate: float) -> str:
-        """评估风险等级"""
-        if abs(spread_percentage) > 5.0 or abs(funding_rate) > 0.05:
-            return "高"
-        elif abs(spread_percentage) > 2.0 or abs(funding_rate) > 0.02:
-            return "中"
-        else:
-            return "低"
+            return []
+
+    def _opportunities_from_rows(self, rows: List[Tuple]) -> List[ArbitrageOpportunity]:
+        """将 (现货价格, 期货价格, 资金费率, 交易对, 现货交易所, 期货交易所) 行批量转换为套利机会"""
+        if not rows:
+            return []
+        spot_prices, futures_prices, funding_rates, symbols, exchanges_spot, exchanges_futures = zip(*rows)
+        return self.calculate_arbitrage_opportunities_batch(
+            np.array(spot_prices, dtype=np.float64),
+            np.array(futures_prices, dtype=np.float64),
+            np.array(funding_rates, dtype=np.float64),
+            symbols, exchanges_spot, exchanges_futures
+        )
+
+    async def _fetch_quotes(self, exchange: str, symbol: str) -> List:
+        """在交易所信号量内并发获取 [现货价格, 期货价格, 资金费率]，失败项为异常对象"""
+        async with self._exchange_semaphore(exchange):
+            return await asyncio.gather(
+                self.get_spot_price(exchange, symbol),
+                self.get_futures_price(exchange, symbol),
+                self.get_funding_rate(exchange, symbol),
+                return_exceptions=True
+            )
 
     async def scan_arbitrage_opportunities(self, symbols: Optional[List[str]] = None,
                                          exchanges: Optional[List[str]] = None) -> List[ArbitrageOpportunity]:
@@ -238,88 +361,75 @@ class ArbitrageAnalyzer:
         if exchanges is None:
             exchanges = list(self.exchanges.keys())
 
-        opportunities = []
-
-        for symbol in symbols:
-            for exchange in exchanges:
-                try:
-                    # 获取现货和期货价格
-                    spot_price, futures_price, funding_rate = await asyncio.gather(
-                        self.get_spot_price(exchange, symbol),
-                        self.get_futures_price(exchange, symbol),
-                        self.get_funding_rate(exchange, symbol),
-                        return_exceptions=True
-                    )
-
-                    # 检查数据有效性
-                    if (isinstance(spot_price, float) and isinstance(futures_price, float) and
-                        isinstance(funding_rate, float)):
-
-                        opportunity = self.calculate_arbitrage_opportunity(
-                            spot_price, futures_price, funding_rate, symbol, exchange, exchange
-                        )
+        # 所有 (交易对, 交易所) 并发获取行情，由各交易所的信号量限制同时请求数
+        pairs = [(symbol, exchange) for symbol in symbols for exchange in exchanges]
+        async with self._session_scope():
+            results = await asyncio.gather(
+                *(self._fetch_quotes(exchange, symbol) for symbol, exchange in pairs),
+                return_exceptions=True
+            )
 
-                        if opportunity:
-                            opportunities.append(opportunity)
+        rows = []
+        for (symbol, exchange), result in zip(pairs, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"扫描{exchange}-{symbol}套利机会失败: {result}")
+                continue
 
-                    # 添加延迟避免API限制
-                    await asyncio.sleep(0.1)
+            # 检查数据有效性
+            spot_price, futures_price, funding_rate = result
+            if (isinstance(spot_price, float) and isinstance(futures_price, float) and
+                isinstance(funding_rate, float)):
+                rows.append((spot_price, futures_price, funding_rate, symbol, exchange, exchange))
 
-                except Exception as e:
-                    self.logger.error(f"扫描{exchange}-{symbol}套利机会失败: {e}")
-                    continue
+        opportunities = self._opportunities_from_rows(rows)
 
         # 按预期收益排序
         opportunities.sort(key=lambda x: abs(x.expected_return), reverse=True)
 
         return opportunities
 
+    async def _cross_exchange_rows(self, symbol: str, exchanges: List[str]) -> List[Tuple]:
+        """获取单个交易对在各交易所之间的 (现货价格, 期货价格, 资金费率, 交易对, 现货交易所, 期货交易所) 组合"""
+        # 所有交易所的行情并发获取
+        quotes = await asyncio.gather(*(self._fetch_quotes(exchange, symbol) for exchange in exchanges))
+
+        spot_prices = {}
+        futures_prices = {}
+        funding_rates = {}
+        for exchange, (spot_price, futures_price, funding_rate) in zip(exchanges, quotes):
+            if isinstance(spot_price, float):
+                spot_prices[exchange] = spot_price
+            if isinstance(futures_price, float):
+                futures_prices[exchange] = futures_price
+            if isinstance(funding_rate, float):
+                funding_rates[exchange] = funding_rate
+            for result in (spot_price, futures_price, funding_rate):
+                if isinstance(result, BaseException):
+                    self.logger.error(f"获取{exchange}-{symbol}价格失败: {result}")
+
+        # 现货与其他交易所的期货两两组合
+        return [
+            (spot_price, futures_price, funding_rates.get(futures_exchange, 0.0), symbol,
+             spot_exchange, futures_exchange)
+            for spot_exchange, spot_price in spot_prices.items()
+            for futures_exchange, futures_price in futures_prices.items()
+            if spot_exchange != futures_exchange
+        ]
+
     async def get_cross_exchange_opportunities(self, symbols: Optional[List[str]] = None) -> List[ArbitrageOpportunity]:
         """获取跨交易所套利机会"""
         if symbols is None:
             symbols = self.major_symbols
 
-        opportunities = []
+        # 各交易对并发处理，请求数由各交易所的信号量统一限制
         exchanges = list(self.exchanges.keys())
+        async with self._session_scope():
+            results = await asyncio.gather(
+                *(self._cross_exchange_rows(symbol, exchanges) for symbol in symbols)
+            )
 
-        for symbol in symbols:
-            # 获取所有交易所的现货价格
-            spot_prices = {}
-            futures_prices = {}
-            funding_rates = {}
-
-            for exchange in exchanges:
-                try:
-                    spot_price = await self.get_spot_price(exchange, symbol)
-                    futures_price = await self.get_futures_price(exchange, symbol)
-                    funding_rate = await self.get_funding_rate(exchange, symbol)
-
-                    if spot_price is not None:
-                        spot_prices[exchange] = spot_price
-                    if futures_price is not None:
-                        futures_prices[exchange] = futures_price
-                    if funding_rate is not None:
-                        funding_rates[exchange] = funding_rate
-
-                    await asyncio.sleep(0.1)
-
-                except Exception as e:
-                    self.logger.error(f"获取{exchange}-{symbol}价格失败: {e}")
-                    continue
-
-            # 寻找跨交易所套利机会
-            for spot_exchange, spot_price in spot_prices.items():
-                for futures_exchange, futures_price in futures_prices.items():
-                    if spot_exchange != futures_exchange:
-                        funding_rate = funding_rates.get(futures_exchange, 0.0)
-
-                        opportunity = self.calculate_arbitrage_opportunity(
-                            spot_price, futures_price, funding_rate, symbol,
-                            spot_exchange, futures_exchange
-                        )
-
-                        if opportunity:
-                            opportunities.append(opportunity)
+        # 寻找跨交易所套利机会
+        opportunities = self._opportunities_from_rows([row for symbol_rows in results for row in symbol_rows])
 
         # 按预期收益排序
         opportunities.sort(key=lambda x: abs(x.expected_return), reverse=True)
@@ -337,26 +447,25 @@ class ArbitrageAnalyzer:
                 'summary': '未发现套利机会'
             }
 
-        # 统计分析
+        # 统计分析：一次遍历同时累计收益、风险分布与交易对计数
         total_opportunities = len(opportunities)
-        avg_expected_return = np.mean([abs(op.expected_return) for op in opportunities])
-
-        # 风险分布
-        risk_distribution = {}
+        abs_returns = []
+        risk_distribution = Counter()
+        symbol_counts = Counter()
         for op in opportunities:
-            risk_distribution[op.risk_level] = risk_distribution.get(op.risk_level, 0) + 1
+            abs_returns.append(abs(op.expected_return))
+            risk_distribution[op.risk_level] += 1
+            symbol_counts[op.symbol] += 1
 
-        # 热门交易对
-        symbol_counts = {}
-        for op in opportunities:
-            symbol_counts[op.symbol] = symbol_counts.get(op.symbol, 0) + 1
+        avg_expected_return = math.fsum(abs_returns) / total_opportunities
 
-        top_symbols = sorted(symbol_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        # 热门交易对（计数相同时按首次出现顺序）
+        top_symbols = symbol_counts.most_common(5)
 
         return {
             'total_opportunities': total_opportunities,
             'avg_expected_return': avg_expected_return,
-            'risk_distribution': risk_distribution,
+            'risk_distribution': dict(risk_distribution),
             'top_symbols': top_symbols,
             'summary': f'发现{total_opportunities}个套利机会，平均预期收益{avg_expected_return:.2f}%'
         }
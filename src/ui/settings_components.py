@@ -11,7 +11,8 @@ from datetime import datetime
 from typing import Dict, List, Any
 
 from ..providers.alert_system import alert_system, AlertRule, AlertType, AlertSeverity, NotificationChannel
-from ..providers.account_manager import account_manager, AccountInfo, AccountType, AccountStatus
+from ..providers.account_manager import get_account_manager, AccountInfo, AccountType, AccountStatus
+from .components import safe_run_async
 
 
 def render_system_settings(config: Dict):
@@ -431,9 +432,10 @@ def _render_account_management():
 
 def _display_portfolio_summary():
     """显示投资组合概览"""
+    account_manager = get_account_manager()
     st.write("### 📊 投资组合概览")
 
-    portfolio_summary = account_manager.get_portfolio_summary()
+    portfolio_summary = safe_run_async(account_manager.get_portfolio_summary())
 
     if portfolio_summary:
         summary_col1, summary_col2, summary_col3, summary_col4 = st.columns(4)
@@ -472,6 +474,7 @@ def _display_portfolio_summary():
 
 def _render_account_list():
     """渲染账户列表"""
+    account_manager = get_account_manager()
     st.write("### 📋 账户列表")
 
     if account_manager.accounts:
@@ -485,6 +488,7 @@ def _render_account_list():
 
 def _display_account_details(account_id: str, account: AccountInfo):
     """显示账户详情"""
+    account_manager = get_account_manager()
     account_col1, account_col2 = st.columns(2)
 
     with account_col1:
@@ -495,14 +499,14 @@ def _display_account_details(account_id: str, account: AccountInfo):
 
     with account_col2:
         # 获取账户余额
-        balances = account_manager.get_account_balances(account_id)
+        balances = safe_run_async(account_manager.get_account_balances(account_id))
         if balances:
             st.write("**余额信息**:")
             for currency, balance in balances.items():
                 st.write(f"- {currency}: {balance.total:.4f} (可用: {balance.available:.4f})")
 
         # 获取账户指标
-        metrics = account_manager.get_account_metrics(account_id)
+        metrics = safe_run_async(account_manager.get_account_metrics(account_id))
         if metrics:
             st.write("**表现指标**:")
             st.write(f"- 总价值: ${metrics.total_value_usd:,.2f}")
@@ -513,6 +517,7 @@ def _display_account_details(account_id: str, account: AccountInfo):
 
 def _render_account_actions(account_id: str, account: AccountInfo):
     """渲染账户操作按钮"""
+    account_manager = get_account_manager()
     action_col1, action_col2, action_col3 = st.columns(3)
 
     with action_col1:
@@ -529,7 +534,7 @@ def _render_account_actions(account_id: str, account: AccountInfo):
 
     with action_col2:
         if st.button(f"🔄 刷新余额", key=f"refresh_{account_id}"):
-            account_manager.get_account_balances(account_id)
+            safe_run_async(account_manager.get_account_balances(account_id))
             st.success("余额已刷新")
             st.rerun()
 
@@ -570,6 +575,7 @@ def _render_add_account_form():
 def _add_new_account(account_id: str, exchange: str, account_type: str, api_key: str,
                     api_secret: str, passphrase: str, sandbox: bool):
     """添加新账户"""
+    account_manager = get_account_manager()
     new_account = AccountInfo(
         account_id=account_id,
         exchange=exchange,
@@ -591,6 +597,7 @@ def _add_new_account(account_id: str, exchange: str, account_type: str, api_key:
 
 def _render_fund_allocation():
     """渲染资金分配管理"""
+    account_manager = get_account_manager()
     st.write("### ⚖️ 资金分配管理")
 
     # 分配规则管理
@@ -625,6 +632,7 @@ def _display_allocation_rule_details(rule_id: str, rule):
 
 def _render_allocation_rule_actions(rule_id: str, rule):
     """渲染分配规则操作按钮"""
+    account_manager = get_account_manager()
     rule_action_col1, rule_action_col2, rule_action_col3 = st.columns(3)
 
     with rule_action_col1:
@@ -0,0 +1,27 @@
+"""
+Numba 兼容工具
+numba 为可选依赖：可用时对数值内核进行JIT编译，不可用时退化为普通的 NumPy 实现
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    logger.info("numba 不可用，数值内核将以纯 NumPy 方式运行")
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba 不可用时的空装饰器，支持 @njit 与 @njit(...) 两种写法"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+    prange = range
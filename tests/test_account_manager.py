@@ -0,0 +1,175 @@
+import asyncio
+import pytest
+import sys
+import os
+from decimal import Decimal
+
+# Add the parent directory to Python path so 'src' module can be found
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.providers.account_manager import (
+    AccountManager,
+    AccountInfo,
+    AccountType,
+    AccountStatus,
+    AllocationRule,
+    AllocationStrategy,
+)
+
+
+def _make_account(account_id: str, exchange: str = "binance") -> AccountInfo:
+    return AccountInfo(
+        account_id=account_id,
+        exchange=exchange,
+        account_type=AccountType.SPOT,
+        status=AccountStatus.ACTIVE,
+        balances={},
+        api_key="key",
+        api_secret="secret",
+    )
+
+
+@pytest.fixture
+def manager():
+    """Fixture to create an AccountManager with two active accounts."""
+    manager = AccountManager()
+    manager.add_account(_make_account("acc1", "binance"))
+    manager.add_account(_make_account("acc2", "okx"))
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_account_metrics_are_served_from_cache(manager):
+    """A second lookup within the TTL must return the cached metrics object."""
+    first = await manager.get_account_metrics("acc1")
+    second = await manager.get_account_metrics("acc1")
+
+    assert first is not None
+    assert second is first
+
+
+@pytest.mark.asyncio
+async def test_account_metrics_cache_expires(manager, monkeypatch):
+    """Metrics older than the TTL are recomputed."""
+    first = await manager.get_account_metrics("acc1")
+
+    cached_at, cached_metrics = manager.metrics_cache["acc1"]
+    manager.metrics_cache["acc1"] = (cached_at - 10_000, cached_metrics)
+
+    second = await manager.get_account_metrics("acc1")
+    assert second is not first
+
+
+@pytest.mark.asyncio
+async def test_equal_allocation_splits_evenly(manager):
+    """EQUAL strategy splits the amount evenly within the rule's bounds."""
+    allocation = await manager.allocate_funds("equal_allocation", Decimal("10000"))
+
+    assert set(allocation) == {"acc1", "acc2"}
+    assert all(amount == Decimal("5000") for amount in allocation.values())
+
+
+@pytest.mark.asyncio
+async def test_portfolio_summary_counts_accounts(manager):
+    """The summary reports account counts and a positive portfolio value."""
+    manager.update_account_status("acc2", AccountStatus.INACTIVE)
+
+    summary = await manager.get_portfolio_summary()
+
+    assert summary["total_accounts"] == 2
+    assert summary["active_accounts"] == 1
+    assert summary["total_value_usd"] > 0
+
+
+@pytest.mark.asyncio
+async def test_rebalancing_check_reuses_cached_deviation(manager, monkeypatch):
+    """Without new balances the second check must not refetch anything."""
+    first = await manager.check_rebalancing_needed("equal_allocation")
+
+    async def fail_fetch(account):
+        raise AssertionError("balances should not be refetched")
+
+    monkeypatch.setattr(manager, "_fetch_account_balances", fail_fetch)
+
+    assert await manager.check_rebalancing_needed("equal_allocation") == first
+
+
+@pytest.mark.asyncio
+async def test_weighted_allocation_follows_rule_updates(manager):
+    """Changing a rule's weights, in place or by replacing the rule, changes the split."""
+    manager.allocation_rules["weighted"] = AllocationRule(
+        id="weighted",
+        name="weighted",
+        strategy=AllocationStrategy.WEIGHTED,
+        target_accounts=["acc1", "acc2"],
+        weights={"acc1": 1.0, "acc2": 1.0},
+    )
+    first = await manager.allocate_funds("weighted", Decimal("1000"))
+
+    manager.allocation_rules["weighted"].weights["acc1"] = 3.0
+    reweighted = await manager.allocate_funds("weighted", Decimal("1000"))
+
+    manager.allocation_rules["weighted"] = AllocationRule(
+        id="weighted",
+        name="weighted",
+        strategy=AllocationStrategy.WEIGHTED,
+        target_accounts=["acc1", "acc2"],
+        weights={"acc1": 1.0, "acc2": 4.0},
+    )
+    replaced = await manager.allocate_funds("weighted", Decimal("1000"))
+
+    assert first == {"acc1": Decimal("500"), "acc2": Decimal("500")}
+    assert reweighted == {"acc1": Decimal("750"), "acc2": Decimal("250")}
+    assert replaced == {"acc1": Decimal("200"), "acc2": Decimal("800")}
+
+
+@pytest.mark.asyncio
+async def test_rebalancing_check_recomputes_after_rule_change(manager, monkeypatch):
+    """A cached deviation is not reused once the rule's parameters change."""
+    await manager.check_rebalancing_needed("equal_allocation")
+    fetched = []
+    original_fetch = manager._fetch_account_balances
+
+    async def counting_fetch(account):
+        fetched.append(account)
+        return await original_fetch(account)
+
+    monkeypatch.setattr(manager, "_fetch_account_balances", counting_fetch)
+    manager.allocation_rules["equal_allocation"].max_allocation = Decimal("1")
+
+    await manager.check_rebalancing_needed("equal_allocation")
+
+    assert fetched
+
+
+def test_exchange_semaphore_survives_new_event_loops(manager):
+    """Contended exchange semaphores work across separate asyncio.run calls."""
+    async def contend():
+        async def hold():
+            async with manager._get_exchange_semaphore("binance"):
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(hold() for _ in range(20)))
+
+    asyncio.run(contend())
+    asyncio.run(contend())
+
+
+async def test_performance_scores_fetch_metrics_under_exchange_semaphores(manager, monkeypatch):
+    """Scoring computes missing metrics per exchange, inside that exchange's semaphore."""
+    batches = []
+    batch = manager._calculate_account_metrics_batch
+
+    async def recording_batch(account_ids):
+        exchange = manager.accounts[account_ids[0]].exchange
+        batches.append((sorted(account_ids), manager._get_exchange_semaphore(exchange).locked()))
+        return await batch(account_ids)
+
+    monkeypatch.setattr("src.providers.account_manager.MAX_CONCURRENT_REQUESTS_PER_EXCHANGE", 1)
+    monkeypatch.setattr(manager, "_calculate_account_metrics_batch", recording_batch)
+    manager.add_account(_make_account("acc3", "binance"))
+
+    scores = await manager._calculate_performance_scores(["acc1", "acc2", "acc3"])
+
+    assert set(scores) == {"acc1", "acc2", "acc3"}
+    assert sorted(batches) == [(["acc1", "acc3"], True), (["acc2"], True)]
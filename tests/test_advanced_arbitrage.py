@@ -0,0 +1,167 @@
+import copy
+import pickle
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to Python path so 'src' module can be found
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.providers.advanced_arbitrage import AdvancedArbitrageEngine
+
+
+@pytest.fixture
+def market_data():
+    """Two closed triangles through USDT plus a pair that closes nothing."""
+    return {
+        "AAA/USDT": {"price": 2.0},
+        "BBB/AAA": {"price": 1.0},
+        "BBB/USDT": {"price": 2.1},
+        "CCC/AAA": {"price": 1.0},
+        "CCC/USDT": {"price": 2.02},
+        "DDD/AAA": {"price": 3.0},
+    }
+
+
+def test_triangular_scan_ranks_closed_paths(market_data):
+    """Only closed triangles above min_profit are returned, best first."""
+    engine = AdvancedArbitrageEngine()
+
+    opportunities = engine.find_triangular_arbitrage(market_data, min_profit=0.005)
+
+    assert [o.path for o in opportunities] == [
+        ("AAA/USDT", "BBB/AAA", "BBB/USDT"),
+        ("AAA/USDT", "CCC/AAA", "CCC/USDT"),
+    ]
+    assert opportunities[0].profit_rate == pytest.approx(0.05)
+    assert opportunities[0].expected_profit == pytest.approx(50.0)
+    assert opportunities[1].profit_rate == pytest.approx(0.01)
+
+
+def test_triangular_scan_skips_zero_prices(market_data):
+    """A leg without a price can never produce an opportunity."""
+    market_data["BBB/USDT"]["price"] = 0
+
+    engine = AdvancedArbitrageEngine()
+
+    opportunities = engine.find_triangular_arbitrage(market_data, min_profit=0.005)
+
+    assert [o.path[1] for o in opportunities] == ["CCC/AAA"]
+
+
+def test_triangular_scan_picks_up_price_changes(market_data):
+    """A repeated scan re-evaluates triangles whose legs moved."""
+    engine = AdvancedArbitrageEngine()
+    engine.find_triangular_arbitrage(market_data, min_profit=0.005)
+
+    market_data["CCC/USDT"] = {"price": 2.2}
+    opportunities = engine.find_triangular_arbitrage(market_data, min_profit=0.005)
+
+    assert opportunities[0].path[1] == "CCC/AAA"
+    assert opportunities[0].profit_rate == pytest.approx(0.1)
+
+
+def test_opportunities_are_slotted_hashable_and_copyable(market_data):
+    """Opportunities carry no __dict__, hash by value and survive copy and pickle."""
+    opportunity = AdvancedArbitrageEngine().find_triangular_arbitrage(market_data, min_profit=0.005)[0]
+
+    assert not hasattr(opportunity, "__dict__")
+    assert hash(opportunity) == hash(copy.copy(opportunity))
+    assert copy.deepcopy(opportunity) == opportunity
+    assert pickle.loads(pickle.dumps(opportunity)) == opportunity
+
+
+def test_cyclic_scan_finds_four_hop_cycle():
+    """Bellman-Ford detection finds cycles longer than a triangle."""
+    market_data = {
+        "BTC/USDT": {"price": 40000.0},
+        "ETH/BTC": {"price": 0.05},
+        "SOL/ETH": {"price": 0.05},
+        "SOL/USDT": {"price": 105.0},
+    }
+    engine = AdvancedArbitrageEngine()
+
+    opportunities = engine.find_cyclic_arbitrage(market_data, max_len=5)
+
+    assert [o.path for o in opportunities] == [("BTC/USDT", "ETH/BTC", "SOL/ETH", "SOL/USDT")]
+    assert opportunities[0].profit_rate == pytest.approx(0.05)
+    assert engine.find_cyclic_arbitrage(market_data, max_len=3) == []
+
+
+def test_cross_chain_scan_nets_out_bridge_fee():
+    """The cheaper chain is the source and the bridge fee is deducted."""
+    token_prices = {
+        "ETH": {"USDC": 1.00, "DAI": 1.0},
+        "BSC": {"USDC": 1.02},
+        "POLYGON": {"DAI": 1.001},
+    }
+    engine = AdvancedArbitrageEngine()
+
+    opportunities = engine.find_cross_chain_arbitrage(token_prices)
+
+    assert len(opportunities) == 1
+    opportunity = opportunities[0]
+    assert (opportunity.source_chain, opportunity.target_chain) == ("ETH", "BSC")
+    assert opportunity.net_profit_rate == pytest.approx(0.02 - 0.001)
+
+
+def test_triangular_scan_reuses_result_for_same_version(market_data):
+    """Within the TTL a repeated snapshot version is served from cache."""
+    engine = AdvancedArbitrageEngine()
+    first = engine.find_triangular_arbitrage(market_data, min_profit=0.005, version=1)
+
+    market_data["CCC/USDT"] = {"price": 2.2}
+
+    assert engine.find_triangular_arbitrage(market_data, min_profit=0.005, version=1) == first
+    assert engine.find_triangular_arbitrage(market_data, min_profit=0.005, version=2) != first
+
+
+def test_futures_spot_scan_skips_expired_and_unpriced_rows():
+    """Rows with no time to expiry or no spot price never produce an opportunity."""
+    engine = AdvancedArbitrageEngine()
+    spot_prices = {"AAA": 100.0, "BBB": 100.0, "CCC": 0.0}
+    futures_data = {
+        "AAA": {"price": 102.0, "expiry_days": 30},
+        "BBB": {"price": 102.0, "expiry_days": 0},
+        "CCC": {"price": 1.0, "expiry_days": 30},
+    }
+
+    opportunities = engine.find_futures_spot_arbitrage(spot_prices, futures_data)
+
+    assert [o.symbol for o in opportunities] == ["AAA"]
+    assert opportunities[0].annual_return == pytest.approx(0.02 * 365 / 30)
+
+
+def _market_frame(pl, market_data):
+    symbols = list(market_data)
+    return pl.LazyFrame({
+        "symbol": symbols,
+        "base": [symbol.split("/")[0] for symbol in symbols],
+        "quote": [symbol.split("/")[1] for symbol in symbols],
+        "price": [market_data[symbol]["price"] for symbol in symbols],
+    })
+
+
+def test_polars_triangular_scan_matches_dict_scan(market_data):
+    """The LazyFrame entry point finds the same triangles as the dict-based scan."""
+    pl = pytest.importorskip("polars")
+    rng = np.random.default_rng(11)
+    coins = [f"C{i}" for i in range(30)]
+    market = dict(market_data)
+    for coin in coins:
+        market[f"{coin}/USDT"] = {"price": float(rng.uniform(1, 100))}
+    for _ in range(200):
+        base, quote = rng.choice(coins, 2, replace=False)
+        market[f"{base}/{quote}"] = {
+            "price": market[f"{base}/USDT"]["price"] / market[f"{quote}/USDT"]["price"] * rng.uniform(0.97, 1.03)
+        }
+
+    expected = AdvancedArbitrageEngine().find_triangular_arbitrage(market, min_profit=0.005)
+    actual = AdvancedArbitrageEngine().find_triangular_arbitrage_polars(_market_frame(pl, market), min_profit=0.005)
+
+    assert len(expected) > 2
+    assert [o.path for o in actual] == [o.path for o in expected]
+    assert [o.profit_rate for o in actual] == pytest.approx([o.profit_rate for o in expected])
+    assert [o.confidence for o in actual] == pytest.approx([o.confidence for o in expected])
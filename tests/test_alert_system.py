@@ -0,0 +1,253 @@
+import pytest
+import sys
+import os
+from collections import deque
+
+import numpy as np
+
+# Add the parent directory to Python path so 'src' module can be found
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.providers.alert_system import (
+    AlertSystem,
+    AlertRule,
+    AlertType,
+    AlertSeverity,
+    NotificationChannel,
+)
+
+
+@pytest.fixture
+def system():
+    """Fixture to create an AlertSystem with only desktop notifications configured."""
+    return AlertSystem()
+
+
+def _spread_data(spread: float = 1.0, volume: float = 20000, symbol: str = "BTC/USDT") -> dict:
+    return {"symbol": symbol, "spread_percentage": spread, "volume_usd": volume}
+
+
+def test_spread_alert_triggers_once_per_cooldown(system):
+    """A matching tick fires the default spread rule, then the cooldown blocks it."""
+    alert = system.check_spread_alert(_spread_data())
+
+    assert alert is not None
+    assert alert.rule_id == "spread_alert_1"
+    assert system.check_spread_alert(_spread_data()) is None
+
+
+def test_spread_alert_respects_thresholds(system):
+    """Ticks below the spread or volume threshold do not fire."""
+    assert system.check_spread_alert(_spread_data(spread=0.1)) is None
+    assert system.check_spread_alert(_spread_data(volume=100)) is None
+
+
+def test_rule_type_change_moves_rule_between_checks(system):
+    """Changing a rule's alert_type makes it visible to the matching check only."""
+    system.remove_rule("spread_alert_1")
+    system.add_rule(AlertRule(
+        id="custom",
+        name="custom",
+        alert_type=AlertType.MARKET_ANOMALY,
+        conditions={"min_spread_percentage": 0.5, "min_volume_usd": 10000},
+        severity=AlertSeverity.LOW,
+        channels=[NotificationChannel.DESKTOP],
+    ))
+    assert system.check_spread_alert(_spread_data()) is None
+
+    system.update_rule("custom", {"alert_type": AlertType.SPREAD_ALERT})
+
+    alert = system.check_spread_alert(_spread_data())
+    assert alert is not None
+    assert alert.rule_id == "custom"
+
+
+def test_add_rule_rejects_non_numeric_conditions(system):
+    """Conditions are compiled when the rule is added, so bad thresholds fail early."""
+    rule = AlertRule(
+        id="broken",
+        name="broken",
+        alert_type=AlertType.SPREAD_ALERT,
+        conditions={"min_spread_percentage": "high"},
+        severity=AlertSeverity.LOW,
+    )
+
+    assert system.add_rule(rule) is False
+    assert "broken" not in system.rules
+
+
+def test_failed_update_leaves_rule_unchanged(system):
+    """An update with an invalid threshold is rejected and rolled back as a whole."""
+    rule = system.rules["spread_alert_1"]
+    conditions = rule.conditions
+
+    assert system.update_rule("spread_alert_1", {
+        "alert_type": AlertType.ARBITRAGE_OPPORTUNITY,
+        "conditions": {"min_profit_percentage": "high"},
+    }) is False
+
+    assert rule.alert_type == AlertType.SPREAD_ALERT
+    assert rule.conditions is conditions
+    assert system.check_spread_alert(_spread_data()) is not None
+
+    assert system.update_rule("spread_alert_1", {"cooldown_minutes": "soon"}) is False
+    assert rule.cooldown_minutes == 5
+
+
+def test_rules_and_alerts_use_slots(system):
+    """Rules and alerts carry no __dict__; cached internals stay out of repr and equality."""
+    alert = system.check_spread_alert(_spread_data())
+    rule = system.rules[alert.rule_id]
+
+    assert not hasattr(rule, "__dict__")
+    assert not hasattr(alert, "__dict__")
+    assert alert.acknowledged is False and alert._severity_upper == alert.severity.value.upper()
+    assert "_predicate" not in repr(rule)
+    assert rule == AlertRule(rule.id, rule.name, rule.alert_type, rule.conditions, rule.severity,
+                             channels=rule.channels, last_triggered=rule.last_triggered)
+
+
+def test_cooldown_expires(system):
+    """Once the cooldown has elapsed the rule can fire again."""
+    assert system.check_spread_alert(_spread_data()) is not None
+
+    rule = system.rules["spread_alert_1"]
+    rule._last_triggered_mono -= rule.cooldown_minutes * 60 + 1
+
+    assert system.check_spread_alert(_spread_data()) is not None
+
+
+def test_statistics_track_triggers_and_resolution(system):
+    """Counters follow triggered and resolved alerts."""
+    alert = system.check_spread_alert(_spread_data())
+    system.check_market_anomaly({"symbol": "ETH/USDT", "price_change_percentage": -8})
+    system.resolve_alert(alert.id)
+    system.resolve_alert(alert.id)
+
+    stats = system.get_alert_statistics()
+
+    assert stats["total_alerts"] == 2
+    assert stats["active_alerts"] == 1
+    assert stats["resolved_alerts"] == 1
+    assert stats["severity_distribution"]["medium"] == 1
+    assert stats["severity_distribution"]["high"] == 1
+    assert stats["type_distribution"]["spread_alert"] == 1
+    assert stats["type_distribution"]["market_anomaly"] == 1
+
+
+def test_alert_history_is_bounded(system):
+    """Evicted alerts drop out of the id index and the statistics."""
+    system.alerts = deque(maxlen=2)
+    for rule in system.rules.values():
+        rule.cooldown_minutes = 0
+        rule._cooldown_seconds = -1
+
+    first = system.check_spread_alert(_spread_data())
+    system.check_spread_alert(_spread_data())
+    system.check_spread_alert(_spread_data())
+
+    assert len(system.alerts) == 2
+    assert system.acknowledge_alert(first.id) is False
+    assert system.get_alert_statistics()["active_alerts"] == 2
+
+
+async def test_async_subscriber_runs_as_task(system):
+    """Coroutine subscribers are scheduled as tasks; plain ones run inline."""
+    received = []
+
+    async def on_alert_async(alert):
+        received.append(("async", alert.id))
+
+    system.subscribe(AlertType.SPREAD_ALERT, on_alert_async)
+    system.subscribe(AlertType.SPREAD_ALERT, lambda alert: received.append(("sync", alert.id)))
+
+    alert = system.check_spread_alert(_spread_data())
+
+    assert received == [("sync", alert.id)]
+    await system.close()
+    assert received == [("sync", alert.id), ("async", alert.id)]
+
+
+async def test_burst_of_alerts_is_sent_as_one_webhook_batch(system, monkeypatch):
+    """Alerts triggered inside one batching window share a single webhook call."""
+    batches = []
+
+    async def record_batch(alerts):
+        batches.append([alert.id for alert in alerts])
+
+    monkeypatch.setattr(system, "_send_webhook_batch", record_batch)
+    rule = system.rules["arbitrage_alert_1"]
+    rule._cooldown_seconds = -1
+    opportunity = {"profit_percentage": 2, "execution_time_seconds": 10, "liquidity_usd": 1e6}
+
+    await system.start()
+    alerts = [system.check_arbitrage_opportunity(opportunity) for _ in range(3)]
+    await system.stop()
+
+    assert batches == [[alert.id for alert in alerts]]
+
+
+async def test_alerts_are_sent_immediately_without_start(system, monkeypatch):
+    """Inside a loop that never called start(), notifications are not queued."""
+    sent = []
+    monkeypatch.setattr(system, "_send_notifications", lambda rule, alert: sent.append(alert.id))
+
+    alert = system.check_spread_alert(_spread_data())
+
+    assert sent == [alert.id]
+    assert system._alert_queue is None
+
+
+def test_spread_batch_matches_sequential_checks(system):
+    """The batch checker fires the same rule on the first matching symbol."""
+    alerts = system.check_spread_alerts_batch(
+        ["AAA/USDT", "BBB/USDT", "CCC/USDT"],
+        np.array([0.1, 1.0, 2.0]),
+        np.array([50000.0, 20000.0, 20000.0]),
+    )
+
+    assert [a.data["symbol"] for a in alerts] == ["BBB/USDT"]
+    assert alerts[0].rule_id == "spread_alert_1"
+    assert system.check_spread_alerts_batch(["CCC/USDT"], np.array([2.0]), np.array([20000.0])) == []
+
+
+def test_spread_batch_applies_exchange_whitelist(system):
+    """Rows from exchanges outside the rule's list are skipped when exchanges are given."""
+    symbols = ["AAA/USDT", "BBB/USDT"]
+    spread = np.array([1.0, 1.0])
+    volume = np.array([20000.0, 20000.0])
+
+    alerts = system.check_spread_alerts_batch(symbols, spread, volume, exchanges=["kraken", "okx"])
+
+    assert [a.data["symbol"] for a in alerts] == ["BBB/USDT"]
+    assert alerts[0].data["exchange"] == "okx"
+
+
+def test_quiet_rule_is_sampled_until_it_matches(system):
+    """Long miss streaks lower the evaluation rate; a match restores it."""
+    rule = system.rules["spread_alert_1"]
+    for _ in range(1000):
+        system.check_spread_alert(_spread_data(spread=0.1))
+
+    assert rule._sampling["BTC/USDT"][2] == 2
+
+    assert system.check_spread_alert(_spread_data()) is None
+    assert system.check_spread_alert(_spread_data()) is not None
+    assert rule._sampling["BTC/USDT"][2] == 1
+
+
+def test_sampling_is_tracked_per_symbol(system):
+    """Round-robin checks over many symbols still evaluate every symbol."""
+    rule = system.rules["spread_alert_1"]
+    symbols = [f"S{i}/USDT" for i in range(10)]
+    # every symbol has already backed off to the maximum interval
+    rule._sampling.update({symbol: [0, 0, 32] for symbol in symbols})
+
+    fired = None
+    for _ in range(32):
+        for symbol in symbols:
+            data = _spread_data(symbol=symbol, spread=5.0 if symbol == "S2/USDT" else 0.1)
+            fired = fired or system.check_spread_alert(data)
+
+    assert fired is not None
+    assert fired.data["symbol"] == "S2/USDT"
@@ -0,0 +1,160 @@
+import pytest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to Python path so 'src' module can be found
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.providers.analytics_engine import AnalyticsEngine
+
+
+@pytest.fixture
+def engine():
+    """Fixture to create an AnalyticsEngine with default settings."""
+    return AnalyticsEngine()
+
+
+@pytest.fixture
+def price_data():
+    """Random-walk prices for four assets over 300 days."""
+    rng = np.random.default_rng(7)
+    index = pd.date_range("2024-01-01", periods=300, freq="D")
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (300, 4)), axis=0))
+    return pd.DataFrame(prices, index=index, columns=["A", "B", "C", "D"])
+
+
+def moving_average_strategy(price_data, window=10):
+    moving_average = price_data.rolling(window).mean()
+    return (price_data > moving_average).astype(float) - (price_data < moving_average).astype(float)
+
+
+def test_backtest_matches_pandas_reference(engine, price_data):
+    """Delayed signals, commission and compounding follow the pandas formulation."""
+    signals = moving_average_strategy(price_data)
+
+    result = engine.run_backtest("ma", price_data, signals, initial_capital=1000, commission_rate=0.001)
+
+    positions = signals.shift(1).fillna(0)
+    expected = (price_data.pct_change().fillna(0) * positions).sum(axis=1)
+    expected -= positions.diff().abs().sum(axis=1) * 0.001
+    np.testing.assert_allclose(result.daily_returns.values, expected.values)
+    assert result.final_capital == pytest.approx(1000 * (1 + expected).prod())
+    assert result.drawdown_series.max() == 0
+
+
+def test_trade_log_lists_position_changes_by_symbol(engine, price_data):
+    """Every position change above the threshold becomes one trade row."""
+    signals = moving_average_strategy(price_data)
+
+    trade_log = engine.run_backtest("ma", price_data, signals).trade_log
+
+    changes = signals.shift(1).fillna(0).diff()
+    assert len(trade_log) == int((changes.abs() > 1e-3).sum().sum())
+    assert list(trade_log["symbol"].drop_duplicates()) == ["A", "B", "C", "D"]
+    assert set(trade_log["action"]) == {"BUY", "SELL"}
+
+
+def test_metrics_from_known_returns(engine):
+    """Drawdown, win rate and tail risk on a hand-checked return series."""
+    returns = pd.Series([0.10, -0.20, 0.05, 0.0] * 10)
+
+    metrics = engine.calculate_performance_metrics(returns)
+
+    assert metrics.win_rate == pytest.approx(0.5)
+    assert metrics.var_95 == pytest.approx(-0.20)
+    assert metrics.cvar_95 == pytest.approx(-0.20)
+    assert metrics.profit_factor == pytest.approx(0.075 / 0.20)
+    cumulative = np.cumprod(1 + returns.values)
+    expected_drawdown = (cumulative / np.maximum.accumulate(cumulative) - 1).min()
+    assert metrics.max_drawdown == pytest.approx(expected_drawdown)
+
+
+def test_metrics_survive_losses_beyond_total_capital(engine):
+    """A cumulative loss below -100% only leaves the annualised figures undefined."""
+    metrics = engine.calculate_performance_metrics(pd.Series([0.1, -1.5, 0.2, 0.1]))
+
+    assert metrics.total_return == pytest.approx(-1.726)
+    assert metrics.max_drawdown == pytest.approx(-1.66)
+    assert metrics.sharpe_ratio == pytest.approx(-6.4238960136)
+    assert metrics.win_rate == pytest.approx(0.75)
+    assert metrics.cvar_95 == pytest.approx(-1.5)
+    assert np.isnan(metrics.annualized_return)
+    assert np.isnan(metrics.calmar_ratio)
+
+
+def test_metrics_skip_missing_returns(engine):
+    """Missing returns are skipped, as pandas reductions would."""
+    returns = pd.Series([0.1, np.nan, -0.05, 0.02, -0.03, 0.01])
+
+    metrics = engine.calculate_performance_metrics(returns)
+    expected = engine.calculate_performance_metrics(returns.dropna())
+
+    assert metrics == expected
+    assert metrics.total_return == pytest.approx(np.prod(1 + returns.dropna()) - 1)
+
+
+def test_parameter_sweep_agrees_with_single_backtests(engine, price_data):
+    """The batched sweep scores each value exactly like run_backtest does."""
+    windows = [5, 20, 40]
+
+    optimization = engine.optimize_strategy_parameters(
+        moving_average_strategy, price_data, {"window": windows}
+    )[0]
+
+    sharpe = [
+        engine.run_backtest("ma", price_data, moving_average_strategy(price_data, w)).performance_metrics.sharpe_ratio
+        for w in windows
+    ]
+    np.testing.assert_allclose(optimization.optimization_results["metric_value"], sharpe)
+    assert optimization.optimal_value == windows[int(np.argmax(sharpe))]
+
+
+def test_monte_carlo_skips_curves_unless_requested(engine):
+    """Only final values are kept by default; curves are opt-in."""
+    returns = pd.Series(np.random.default_rng(1).normal(0.001, 0.01, 200))
+
+    summary = engine.monte_carlo_simulation(returns, days=30, simulations=50)
+    detailed = engine.monte_carlo_simulation(returns, days=30, simulations=50, return_curves=True)
+
+    assert summary["equity_curves"] is None
+    assert summary["final_values"].shape == (50,)
+    assert detailed["equity_curves"].shape == (50, 30)
+    np.testing.assert_allclose(detailed["final_values"], detailed["equity_curves"][:, -1])
+
+
+def test_threaded_sweep_matches_serial_sweep(engine, price_data):
+    """The thread backend accepts closures and scores values like the serial sweep."""
+    windows = [5, 20, 40]
+
+    serial = engine.optimize_strategy_parameters(moving_average_strategy, price_data, {"window": windows})[0]
+    threaded = engine.optimize_strategy_parameters(
+        lambda data, window: moving_average_strategy(data, window),
+        price_data,
+        {"window": windows},
+        n_jobs=2,
+        backend="thread",
+    )[0]
+
+    np.testing.assert_allclose(threaded.optimization_results["metric_value"], serial.optimization_results["metric_value"])
+    assert threaded.optimal_value == serial.optimal_value
+
+
+def test_backtest_on_new_frame_with_shared_index_uses_new_prices(engine):
+    """Returns are never reused across distinct frames, even when they share an index."""
+    index = pd.date_range("2024-01-01", periods=300, freq="D")
+    signals = pd.DataFrame(1.0, index=index, columns=list("ABCD"))
+    rng = np.random.default_rng(3)
+
+    for _ in range(200):
+        values = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (300, 4)), axis=0))
+        expected = 1000 * np.prod(1 + (values[1:] / values[:-1] - 1).sum(axis=1))
+
+        prices = pd.DataFrame(values, index=index, columns=list("ABCD"))
+        result = engine.run_backtest("hold", prices, signals, initial_capital=1000, commission_rate=0)
+        # freeing the frame lets the next one reuse its id()
+        del prices
+
+        assert result.final_capital == pytest.approx(expected)
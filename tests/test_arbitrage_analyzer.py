@@ -0,0 +1,206 @@
+import asyncio
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to Python path so 'src' module can be found
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.providers.arbitrage_analyzer import ArbitrageAnalyzer
+
+
+# (spot, futures, funding rate) per (exchange, symbol)
+QUOTES = {
+    ("binance", "BTCUSDT"): (100.0, 101.0, 0.0001),
+    ("okx", "BTCUSDT"): (100.5, 100.6, 0.0),
+    ("binance", "ETHUSDT"): (50.0, 49.0, -0.0002),
+    ("okx", "ETHUSDT"): (50.0, 50.01, 0.0),
+}
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    """Analyzer whose price methods serve QUOTES and track per-exchange concurrency."""
+    analyzer = ArbitrageAnalyzer()
+    analyzer.in_flight = {}
+    analyzer.peak = {}
+
+    def fake(index):
+        async def fetch(exchange, symbol):
+            analyzer.in_flight[exchange] = analyzer.in_flight.get(exchange, 0) + 1
+            analyzer.peak[exchange] = max(analyzer.peak.get(exchange, 0), analyzer.in_flight[exchange])
+            await asyncio.sleep(0.01)
+            analyzer.in_flight[exchange] -= 1
+            quote = QUOTES.get((exchange, symbol))
+            return None if quote is None else quote[index]
+        return fetch
+
+    monkeypatch.setattr(analyzer, "get_spot_price", fake(0))
+    monkeypatch.setattr(analyzer, "get_futures_price", fake(1))
+    monkeypatch.setattr(analyzer, "get_funding_rate", fake(2))
+    return analyzer
+
+
+async def test_scan_ranks_opportunities_by_expected_return(analyzer):
+    """Pairs below min_spread or without quotes are dropped, the rest sorted by |return|."""
+    opportunities = await analyzer.scan_arbitrage_opportunities(
+        ["BTCUSDT", "ETHUSDT", "SOLUSDT"], ["binance", "okx"]
+    )
+
+    assert [(o.symbol, o.exchange_spot) for o in opportunities] == [("ETHUSDT", "binance"), ("BTCUSDT", "binance")]
+    assert opportunities[0].expected_return == pytest.approx(2.0 - 0.0002 * 800)
+    assert opportunities[1].expected_return == pytest.approx(1.0 - 0.0001 * 800)
+
+
+async def test_scan_bounds_concurrency_per_exchange(analyzer):
+    """Pairs are scanned concurrently but never above the per-exchange limit."""
+    analyzer.max_concurrent_requests = 2
+    symbols = [f"S{i}USDT" for i in range(10)]
+
+    await analyzer.scan_arbitrage_opportunities(symbols, ["binance", "okx"])
+
+    # three endpoints are fetched concurrently for every admitted pair
+    assert analyzer.peak == {"binance": 2 * 3, "okx": 2 * 3}
+
+
+async def test_cross_exchange_pairs_spot_and_futures_on_different_exchanges(analyzer, monkeypatch):
+    """Spot on one exchange is matched with futures on every other exchange."""
+    monkeypatch.setattr(analyzer, "exchanges", {"binance": {}, "okx": {}})
+
+    opportunities = await analyzer.get_cross_exchange_opportunities(["BTCUSDT", "ETHUSDT"])
+
+    assert [(o.symbol, o.exchange_spot, o.exchange_futures) for o in opportunities] == [
+        ("ETHUSDT", "okx", "binance"),
+        ("BTCUSDT", "binance", "okx"),
+        ("BTCUSDT", "okx", "binance"),
+    ]
+    assert opportunities[0].expected_return == pytest.approx(2.0 - 0.0002 * 800)
+
+
+async def test_endpoint_table_extracts_nested_values(monkeypatch):
+    """URLs come from the endpoint table; bad status codes and empty lists count as missing."""
+    responses = {
+        "https://www.okx.com/api/v5/market/ticker?instId=BTC-USDT-SWAP": {"code": "0", "data": [{"last": "101.5"}]},
+        "https://www.okx.com/api/v5/market/ticker?instId=BTCUSDT": {"code": "51001", "data": []},
+        "https://api.bybit.com/v5/market/funding/history?category=linear&symbol=BTCUSDT&limit=1": {
+            "retCode": 0, "result": {"list": []}
+        },
+    }
+    analyzer = ArbitrageAnalyzer()
+
+    async def fake_get_json(url):
+        return responses[url]
+
+    monkeypatch.setattr(analyzer, "_get_json", fake_get_json)
+
+    assert await analyzer.get_futures_price("okx", "BTCUSDT") == 101.5
+    assert await analyzer.get_spot_price("okx", "BTCUSDT") is None
+    assert await analyzer.get_funding_rate("bybit", "BTCUSDT") == 0.0
+    assert await analyzer.get_spot_price("kraken", "BTCUSDT") is None
+
+
+def test_batch_calculation_filters_and_grades_rows():
+    """Rows below min_spread or with a zero spot price are dropped; risk follows spread and funding."""
+    analyzer = ArbitrageAnalyzer()
+
+    opportunities = analyzer.calculate_arbitrage_opportunities_batch(
+        np.array([100.0, 100.0, 100.0, 100.0, 0.0]),
+        np.array([100.05, 103.0, 94.0, 115.0, 1.0]),
+        np.array([0.0, 0.0, 0.03, 0.0, 0.0]),
+        ["A", "B", "C", "D", "E"], ["x"] * 5, ["y"] * 5,
+    )
+
+    assert [(o.symbol, o.risk_level) for o in opportunities] == [("B", "中"), ("C", "高"), ("D", "极高")]
+    assert opportunities[1].expected_return == pytest.approx(6.0 + 0.03 * 800)
+
+
+async def test_funding_rate_is_cached_until_ttl_expires(monkeypatch):
+    """Successful funding rates are reused within the TTL; failures are never cached."""
+    analyzer = ArbitrageAnalyzer()
+    calls = []
+    rates = [None, 0.0003, 0.0005, 0.0007]
+
+    async def fake_fetch(exchange, kind, symbol):
+        calls.append((exchange, kind, symbol))
+        return rates[len(calls) - 1]
+
+    monkeypatch.setattr(analyzer, "_fetch", fake_fetch)
+
+    assert await analyzer.get_funding_rate("binance", "BTCUSDT") == 0.0
+    assert await analyzer.get_funding_rate("binance", "BTCUSDT") == 0.0003
+    assert await analyzer.get_funding_rate("binance", "BTCUSDT") == 0.0003
+    assert len(calls) == 2
+
+    analyzer.funding_rate_ttl = 0
+    analyzer._funding_cache.clear()
+    assert await analyzer.get_funding_rate("binance", "BTCUSDT") == 0.0005
+    assert await analyzer.get_funding_rate("binance", "BTCUSDT") == 0.0007
+
+
+async def test_concurrent_identical_fetches_share_one_request(monkeypatch):
+    """Overlapping callers await the same in-flight request; later calls fetch again."""
+    analyzer = ArbitrageAnalyzer()
+    urls = []
+
+    async def fake_get_json(url):
+        urls.append(url)
+        await asyncio.sleep(0.01)
+        return {"price": "100.0"}
+
+    monkeypatch.setattr(analyzer, "_get_json", fake_get_json)
+
+    prices = await asyncio.gather(*(analyzer.get_spot_price("binance", "BTCUSDT") for _ in range(5)))
+    assert prices == [100.0] * 5
+    assert len(urls) == 1
+
+    await analyzer.get_spot_price("binance", "BTCUSDT")
+    assert len(urls) == 2
+
+
+async def test_scan_shares_one_session_and_closes_it(monkeypatch):
+    """All requests of a scan reuse one pooled session, which is closed when the scan ends."""
+    analyzer = ArbitrageAnalyzer()
+    sessions = []
+
+    class FakeResponse:
+        status = 200
+
+        async def read(self):
+            return b'{"price": "100.0"}'
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    class FakeSession:
+        def __init__(self):
+            self.closed = False
+            self.requests = 0
+
+        def get(self, url):
+            self.requests += 1
+            return FakeResponse()
+
+        async def close(self):
+            self.closed = True
+
+    def new_session():
+        sessions.append(FakeSession())
+        return sessions[-1]
+
+    monkeypatch.setattr(analyzer, "_new_session", new_session)
+
+    await analyzer.scan_arbitrage_opportunities(["BTCUSDT", "ETHUSDT"], ["binance", "okx"])
+
+    assert len(sessions) == 1
+    assert sessions[0].requests > 1
+    assert sessions[0].closed
+    assert analyzer._session_state is None
+
+    # a standalone request opens and closes its own session
+    await analyzer.get_spot_price("binance", "SOLUSDT")
+    assert len(sessions) == 2 and sessions[1].closed